@@ -1,15 +1,20 @@
-import matplotlib
-matplotlib.use('agg')  # НЕ-GUI backend — обязательно для Flask / сервера
-
-from flask import Flask, request, render_template, jsonify
+from flask import Flask, Response, request, render_template, jsonify, g, abort, redirect, stream_with_context, url_for
 import colorsys
-import numpy as np
-import matplotlib.pyplot as plt
-from io import BytesIO
-import base64
 import hashlib
+import re
 from datetime import datetime
 import random
+import sys
+import os
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from web.swatch import swatch_png, swatch_base64
+from web.batch import BatchError, from_json, from_ndjson, lines, chunks, ndjson
+from web.sessions import SessionStore, SQLiteBackend, SESSION_COOKIE
+from web.streaming import StateHub, bit_state
+from web.metrics import Registry, CONTENT_TYPE
 
 app = Flask(__name__)
 
@@ -66,23 +71,106 @@ class MuzaAgent:
         else:
             return f"Я услышала: '{message}'. Что хочешь во мне изменить, моя звезда?"
 
-muza_agent = MuzaAgent()
-kira = HyperBit(name="Кира")
+# ────────────────────────────────────────────────────────────
+# Сессии: у каждого посетителя свой гипербит и своя муза
+# ────────────────────────────────────────────────────────────
+class SessionState:
+    def __init__(self):
+        self.kira = HyperBit(name="Кира")
+        self.muza_agent = MuzaAgent()
+
+# MUZA_SESSION_DB=путь/к/sessions.db — общее хранилище для нескольких воркеров
+SESSION_DB = os.environ.get('MUZA_SESSION_DB')
+sessions = SessionStore(SessionState, backend=SQLiteBackend(SESSION_DB) if SESSION_DB else None)
+
+def session_id():
+    sid = request.cookies.get(SESSION_COOKIE)
+    if sid and len(sid) <= 64:
+        return sid
+    if 'new_session_id' not in g:
+        g.new_session_id = SessionStore.new_id()  # cookie ставится в ответе
+    return g.new_session_id
+
+@app.after_request
+def remember_session(response):
+    sid = g.pop('new_session_id', None)
+    if sid:
+        response.set_cookie(SESSION_COOKIE, sid, httponly=True, samesite='Lax')
+    return response
+
+# Живой поток состояния (SSE); MUZA_STREAM_TICK — период раздачи, сек
+hub = StateHub(tick=float(os.environ.get('MUZA_STREAM_TICK', '0.1')))
+
+# ────────────────────────────────────────────────────────────
+# Метрики (/metrics, формат Prometheus)
+# ────────────────────────────────────────────────────────────
+metrics = Registry()
+REQUESTS = metrics.counter('muza_http_requests_total', 'HTTP-запросы по маршруту и статусу', ['route', 'status'])
+REQUEST_SECONDS = metrics.histogram('muza_http_request_duration_seconds', 'Длительность запроса до отдачи тела', ['route'])
+IN_FLIGHT = metrics.gauge('muza_http_requests_in_flight', 'Запросы в работе', ['route'])
+ERRORS = metrics.counter('muza_errors_total', 'Исключения по маршруту и типу', ['route', 'type'])
+STAGE_SECONDS = metrics.histogram('muza_stage_duration_seconds', 'Длительность этапов анализа', ['stage'])
+SUBSCRIBERS = metrics.gauge('muza_stream_subscribers', 'Подписчики /stream')
+SUBSCRIBERS.set_function(lambda: hub.stats['subscribers'])
+
+# Серии этапов берутся один раз — на запросе только observe()
+session_stage = STAGE_SECONDS.labels('session')
+analyze_stage = STAGE_SECONDS.labels('analyze')
+mutate_stage = STAGE_SECONDS.labels('mutate')
+respond_stage = STAGE_SECONDS.labels('respond')
+swatch_stage = STAGE_SECONDS.labels('swatch')
+
+def route_label():
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+@app.before_request
+def start_timer():
+    g.started = perf_counter()
+    g.in_flight = IN_FLIGHT.labels(route_label())
+    g.in_flight.inc()
+
+@app.after_request
+def count_request(response):
+    route = route_label()
+    REQUESTS.labels(route, response.status_code).inc()
+    REQUEST_SECONDS.labels(route).observe(perf_counter() - g.get('started', perf_counter()))
+    return response
+
+@app.teardown_request
+def finish_request(exc):
+    # Для stream_with_context teardown зовётся дважды — запрос уходит из «в работе» один раз
+    in_flight = g.pop('in_flight', None)
+    if in_flight is not None:
+        in_flight.dec()
+    if exc is not None:
+        ERRORS.labels(route_label(), type(exc).__name__).inc()
 
 # ────────────────────────────────────────────────────────────
 # Функция для генерации картинки цвета
 # ────────────────────────────────────────────────────────────
 def generate_color_image(rgb_tuple):
-    fig, ax = plt.subplots(figsize=(4, 4))
-    color_array = np.full((100, 100, 3), rgb_tuple, dtype=np.uint8)
-    ax.imshow(color_array)
-    ax.axis('off')
-    fig.patch.set_facecolor('black')
-    buf = BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight')
-    plt.close(fig)
-    buf.seek(0)
-    return base64.b64encode(buf.read()).decode('utf-8')
+    # Однотонный PNG пишется напрямую (web/swatch.py) и кэшируется по цвету
+    started = perf_counter()
+    image = swatch_base64(tuple(rgb_tuple))
+    swatch_stage.observe(perf_counter() - started)
+    return image
+
+def swatch_url(rgb_tuple):
+    return url_for('swatch', rgb='%02x%02x%02x' % tuple(rgb_tuple))
+
+def analyze_text(state, text):
+    kira = state.kira
+    t0 = perf_counter()
+    analysis = kira.analyze(text)
+    t1 = perf_counter()
+    kira.mutate_from_input(text)
+    t2 = perf_counter()
+    muza_response = state.muza_agent.respond(text)
+    t3 = perf_counter()
+    analyze_stage.observe(t1 - t0)
+    mutate_stage.observe(t2 - t1)
+    respond_stage.observe(t3 - t2)
+    return analysis, muza_response, kira.get_rgb()
 
 # ────────────────────────────────────────────────────────────
 # Маршруты
@@ -98,20 +186,121 @@ def analyze():
         if not text:
             return jsonify({'error': 'Текст пустой'}), 400
 
-        analysis = kira.analyze(text)
-        kira.mutate_from_input(text)
-        muza_response = muza_agent.respond(text)
+        started = perf_counter()
 
-        kira_rgb = kira.get_rgb()
-        kira_img = generate_color_image(kira_rgb)
+        def work(state):
+            session_stage.observe(perf_counter() - started)  # ожидание блокировки и загрузка
+            return analyze_text(state, text) + (bit_state(state.kira),)
 
-        return jsonify({
+        # update() повторит work, если сессию тем временем сохранил другой воркер
+        analysis, muza_response, kira_rgb, kira_state = sessions.update(session_id(), work)
+        hub.publish(session_id(), kira_state)
+
+        result = {
             'analysis': analysis,
             'muza_response': muza_response,
-            'kira_img': kira_img
-        })
+            'kira_swatch': swatch_url(kira_rgb)
+        }
+        if request.args.get('inline'):
+            # Прежний формат: PNG в base64 прямо в ответе
+            result['kira_img'] = generate_color_image(kira_rgb)
+        return jsonify(result)
     except Exception as e:
+        ERRORS.labels(route_label(), type(e).__name__).inc()
         return jsonify({'error': str(e)}), 500
 
+BATCH_CHUNK = 64  # текстов под одной блокировкой сессии
+
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    # JSON-список (или {"texts": [...]}) либо NDJSON-поток; ответ — NDJSON по мере готовности.
+    # ?swatch=1 — в каждой строке ссылка на образец цвета вместо картинки
+    sid = session_id()
+    with_swatch = request.args.get('swatch', '0') not in ('0', '', 'false')
+    swatch_prefix = url_for('swatch', rgb='000000')[:-len('000000.png')]
+    if request.mimetype == 'application/json':
+        try:
+            items = from_json(request.get_json())
+        except BatchError as e:
+            return jsonify({'error': str(e)}), 400
+    else:
+        items = from_ndjson(lines(request.stream))
+
+    def analyze_chunk(state, chunk, first):
+        lines = []
+        for index, item in enumerate(chunk, first):
+            if isinstance(item, BatchError):
+                record = {'index': index, 'error': str(item)}
+            else:
+                analysis, muza_response, kira_rgb = analyze_text(state, item)
+                record = {'index': index, 'analysis': analysis,
+                          'muza_response': muza_response, 'rgb': list(kira_rgb)}
+                if with_swatch:
+                    record['swatch'] = swatch_prefix + '%02x%02x%02x.png' % kira_rgb
+            lines.append(ndjson(record))
+        return ''.join(lines), bit_state(state.kira)
+
+    def generate():
+        index = 0
+        for chunk in chunks(items, BATCH_CHUNK):
+            started = perf_counter()
+
+            def work(state):
+                session_stage.observe(perf_counter() - started)
+                return analyze_chunk(state, chunk, index)
+
+            lines, kira_state = sessions.update(sid, work)
+            hub.publish(sid, kira_state)
+            index += len(chunk)
+            yield lines
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+SWATCH_MAX_AGE = 365 * 24 * 3600
+SWATCH_RGB = re.compile(r"[0-9a-f]{6}")
+
+@app.route('/swatch/<rgb>.png')
+def swatch(rgb):
+    # rgb — шесть hex-цифр в нижнем регистре, например /swatch/ff8800.png.
+    # У цвета один адрес: FF8800 переадресуется на ff8800, остальное — 404.
+    # Картинка по адресу никогда не меняется: ETag — сам цвет, кэш браузера бессрочный
+    if not SWATCH_RGB.fullmatch(rgb):
+        if SWATCH_RGB.fullmatch(rgb.lower()):
+            return redirect(url_for('swatch', rgb=rgb.lower()), 301)
+        abort(404)
+    color = bytes.fromhex(rgb)
+    etag = rgb
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        started = perf_counter()
+        response = Response(swatch_png(tuple(color)), mimetype='image/png')
+        swatch_stage.observe(perf_counter() - started)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = SWATCH_MAX_AGE
+    response.cache_control.immutable = True
+    return response
+
+@app.route('/stream')
+def stream():
+    # ?interval=секунды — не чаще одного сообщения за столько (по умолчанию каждый тик).
+    # Клиент держит поток сервера, пока подключён: на threaded werkzeug и gunicorn -k gthread
+    # это поток ОС на клиента (порядка тысячи на процесс), для большего —
+    # gunicorn -k gevent --worker-connections N app:app, см. web/streaming.py
+    sid = session_id()
+    initial = sessions.update(sid, lambda state: bit_state(state.kira))
+    subscription = hub.subscribe(sid, initial)
+    interval = request.args.get('interval', 0.0, type=float)
+    return Response(subscription.stream(interval=interval), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
 if __name__ == '__main__':
-    app.run(debug=False, port=5000)  # debug=False — чтобы не было проблем с temp-директориями
+    # debug=False — чтобы не было проблем с temp-директориями;
+    # threaded=True — каждому клиенту /stream свой поток ОС (для разработки;
+    # много подписчиков — через gunicorn -k gevent, см. README)
+    app.run(debug=False, port=5000, threaded=True)
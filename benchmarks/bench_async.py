@@ -0,0 +1,65 @@
+"""
+Бенчмарк асинхронного фронтенда — запросов в секунду под конкуренцией
+Поток на запрос против AgentDispatcher с микропачками
+"""
+
+import asyncio
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.async_agent import AgentDispatcher
+from agents.pool import AgentPool
+
+
+MESSAGES = ["Привет, Муза!", "Я люблю код", "Мне грустно", "Вокруг хаос"]
+
+
+def requests(n: int, users: int):
+    return [(f"user-{i % users}", MESSAGES[i % len(MESSAGES)], f"client-{i % 7}") for i in range(n)]
+
+
+def thread_per_request(n: int, users: int) -> float:
+    pool = AgentPool(capacity=users)
+    work = requests(n, users)
+    started = time.perf_counter()
+    threads = [threading.Thread(target=pool.perceive, args=item) for item in work]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return n / (time.perf_counter() - started)
+
+
+def dispatcher(n: int, users: int, window: float) -> float:
+    work = requests(n, users)
+
+    async def main():
+        d = AgentDispatcher(AgentPool(capacity=users), window=window)
+        started = time.perf_counter()
+        await asyncio.gather(*(d.aperceive(*item) for item in work))
+        return n / (time.perf_counter() - started), d.batch_stats["mean_batch"]
+
+    return asyncio.run(main())
+
+
+def main(n: int = 20000):
+    print("=" * 70)
+    print(f"⚡ {n} одновременных запросов")
+    print("=" * 70 + "\n")
+    for users in (10, 100, 1000):
+        threaded = thread_per_request(n, users)
+        print(f"👥 агентов: {users}")
+        print(f"  поток на запрос          {threaded:>10,.0f} запросов/с")
+        for window in (0.0, 0.002):
+            rate, mean_batch = dispatcher(n, users, window)
+            print(f"  dispatcher, окно {window * 1000:.0f} мс    {rate:>10,.0f} запросов/с"
+                  f"  (пачка ≈ {mean_batch:.0f}, ×{rate / threaded:.1f})")
+        print()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
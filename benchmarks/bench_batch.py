@@ -0,0 +1,69 @@
+"""
+Бенчмарк /analyze/batch
+Тексты в секунду и байты на текст: по одному запросу /analyze на текст
+против одного пакета (JSON-список, NDJSON, со ссылкой на образец).
+Запросы идут через тестовый клиент Flask — без сети, так что выигрыш
+на реальных HTTP-запросах только больше.
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import app
+
+
+def texts(n: int):
+    words = ["привет", "люблю код", "тишина и свет", "резонанс", "новая мутация"]
+    return [f"{words[i % len(words)]} #{i}" for i in range(n)]
+
+
+def one_by_one(batch):
+    client = app.app.test_client()
+    size = 0
+    started = time.perf_counter()
+    for text in batch:
+        size += len(client.post('/analyze', json={'text': text}).data)
+    return time.perf_counter() - started, size
+
+
+def batched(batch, ndjson: bool, swatch: bool):
+    client = app.app.test_client()
+    url = '/analyze/batch' + ('?swatch=1' if swatch else '')
+    started = time.perf_counter()
+    if ndjson:
+        body = ''.join(json.dumps(text, ensure_ascii=False) + '\n' for text in batch).encode('utf-8')
+        response = client.post(url, data=body, content_type='application/x-ndjson')
+    else:
+        response = client.post(url, json=batch)
+    data = response.get_data()
+    elapsed = time.perf_counter() - started
+    assert data.count(b'\n') == len(batch)
+    return elapsed, len(data)
+
+
+def main():
+    n = 2_000
+    batch = texts(n)
+
+    print("=" * 70)
+    print(f"📦 /analyze/batch — {n:,} текстов")
+    print("=" * 70)
+    print(f"\n  {'способ':<28} {'текстов/с':>10} {'байт/текст':>11}")
+
+    rows = [
+        ("по одному /analyze", lambda: one_by_one(batch)),
+        ("пакет, JSON-список", lambda: batched(batch, ndjson=False, swatch=False)),
+        ("пакет, NDJSON", lambda: batched(batch, ndjson=True, swatch=False)),
+        ("пакет, NDJSON + ссылка", lambda: batched(batch, ndjson=True, swatch=True)),
+    ]
+    for label, run in rows:
+        elapsed, size = min(run() for _ in range(3))  # лучшее из трёх
+        print(f"  {label:<28} {n / elapsed:>10,.0f} {size / n:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
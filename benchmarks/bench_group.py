@@ -0,0 +1,76 @@
+"""
+Бенчмарк групповой беседы — раунды на 1 000+ агентов
+Время подбора пар, встречи в секунду (последовательно и в пуле потоков)
+и средний резонанс пар против случайного разбиения
+"""
+
+import random
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.muza_agent import MuzaAgent
+from agents.group import GroupConversation
+
+
+TYPES = ["creative", "analytical", "empathic", "chaotic"]
+
+
+def make_group(n: int, executor=None) -> GroupConversation:
+    rng = random.Random(n)
+    agents = [MuzaAgent(name=f"agent-{i}", personality_type=TYPES[i % 4]) for i in range(n)]
+    for agent in agents:
+        # Разные стартовые состояния, как у агентов, уже поживших своей жизнью
+        agent.core_bit.frequency = rng.uniform(200, 1000)
+        agent.core_bit.color = (rng.random(), 0.85, 0.92)
+    return GroupConversation(agents, executor=executor)
+
+
+def random_resonance(group: GroupConversation, rng: random.Random) -> float:
+    order = list(range(len(group.agents)))
+    rng.shuffle(order)
+    bits = [group.agents[i].core_bit for i in order]
+    pairs = list(zip(bits[0::2], bits[1::2]))
+    return sum(a.resonate(b) for a, b in pairs) / len(pairs)
+
+
+def run(n: int, rounds: int, executor=None):
+    group = make_group(n, executor)
+    chance = random_resonance(group, random.Random(0))
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        group.pairs()
+    pairing_ms = (time.perf_counter() - started) / rounds * 1000
+    group._previous = set()
+
+    resonance = 0.0
+    started = time.perf_counter()
+    for turn in group.run(rounds):
+        resonance += turn.resonance
+    seconds = time.perf_counter() - started
+    turns = group.turns_done
+    return pairing_ms, turns / seconds, rounds / seconds, resonance / turns, chance
+
+
+def main(rounds: int = 5):
+    print("=" * 70)
+    print(f"👥 Групповая беседа: {rounds} раундов")
+    print("=" * 70 + "\n")
+    print(f"  {'агентов':>8} {'режим':>10} {'пары, мс':>9} {'встреч/с':>10} "
+          f"{'раундов/с':>10} {'резонанс':>9} {'случайно':>9}")
+    for n in (1_000, 5_000, 20_000):
+        for label, workers in (("serial", 0), ("threads×4", 4)):
+            executor = ThreadPoolExecutor(workers) if workers else None
+            pairing, turns, per_round, resonance, chance = run(n, rounds, executor)
+            if executor is not None:
+                executor.shutdown()
+            print(f"  {n:>8,} {label:>10} {pairing:>9.1f} {turns:>10,.0f} "
+                  f"{per_round:>10.2f} {resonance:>9.2f} {chance:>9.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,55 @@
+"""
+Бенчмарк памяти — сколько байт занимает один гипербит
+HyperBit (dataclass) против CompactHyperBit (__slots__)
+"""
+
+import gc
+import sys
+import os
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.hyperbit import HyperBit
+from core.compact import CompactHyperBit
+
+
+def bytes_per_bit(factory, n: int, analyze: bool = False) -> float:
+    """Средний прирост памяти на один бит при создании n битов"""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    bits = [factory(i) for i in range(n)]
+    if analyze:
+        for bit in bits:
+            bit.analyze("Кира хочет любви и кода")
+
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del bits
+    return (after - before) / n
+
+
+def main(n: int = 20000):
+    print("=" * 70)
+    print(f"🧠 Память гипербитов (n = {n})")
+    print("=" * 70 + "\n")
+
+    cases = [
+        ("HyperBit", lambda i: HyperBit(energy=1.0 + i % 7, color=(0.3, 0.8, 0.9))),
+        ("CompactHyperBit", lambda i: CompactHyperBit(energy=1.0 + i % 7, color=(0.3, 0.8, 0.9))),
+    ]
+
+    for analyze in (False, True):
+        label = "после analyze()" if analyze else "свежие биты"
+        print(f"📍 {label}:")
+        results = {name: bytes_per_bit(factory, n, analyze) for name, factory in cases}
+        for name, size in results.items():
+            print(f"  {name:<16} {size:>10.0f} байт/бит")
+        ratio = results["HyperBit"] / results["CompactHyperBit"]
+        print(f"  → экономия: ×{ratio:.1f}\n")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
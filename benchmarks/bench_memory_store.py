@@ -0,0 +1,66 @@
+"""
+Бенчмарк долговременной памяти — вставка и запросы MemoryStore
+Синтетические сообщения с распределением слов по Ципфу
+"""
+
+import random
+import sys
+import os
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.memory_store import MemoryStore
+
+
+COMMON = ["привет", "муза", "код", "люблю", "грустно", "я", "ты"]
+WORDS = [f"слово{i}" if i % 3 else f"word{i}" for i in range(5000)]
+
+
+def message(rng: random.Random) -> str:
+    words = []
+    for _ in range(rng.randint(3, 12)):
+        if rng.random() < 0.3:
+            words.append(rng.choice(COMMON))
+        else:
+            words.append(WORDS[min(int(rng.paretovariate(1.2)) - 1, len(WORDS) - 1)])
+    return " ".join(words)
+
+
+def per_call_ms(f, repeats: int = 200) -> float:
+    f()
+    started = time.perf_counter()
+    for _ in range(repeats):
+        f()
+    return (time.perf_counter() - started) / repeats * 1000
+
+
+def main(n: int = 100000):
+    print("=" * 70)
+    print(f"🗄️  MemoryStore (записей: {n:,})")
+    print("=" * 70 + "\n")
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(tmp)
+        started = time.perf_counter()
+        for i in range(n):
+            store.add(message(rng), f"user-{rng.randint(0, 200)}", "спокойная", 1.0, timestamp=1e9 + i)
+        print(f"  вставка                   {(time.perf_counter() - started) / n * 1e6:>8.1f} мкс/запись")
+        print(f"  сегментов                 {len(store._sealed):>8}\n")
+
+        queries = [
+            ("recall: редкие слова", lambda: store.recall("word4321 слово77", 5)),
+            ("recall: частые слова", lambda: store.recall("привет муза код", 5)),
+            ("recall: смешанный", lambda: store.recall("word17 ты дела", 5)),
+            ("recall: с отправителем", lambda: store.recall("привет код", 5, sender="user-7")),
+            ("recall_by_sender", lambda: store.recall_by_sender("user-7", 10)),
+            ("between (50 записей)", lambda: store.between(1e9 + n // 2, 1e9 + n // 2 + 50)),
+        ]
+        for label, query in queries:
+            print(f"  {label:<25} {per_call_ms(query):>8.3f} мс")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
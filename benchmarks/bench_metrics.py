@@ -0,0 +1,98 @@
+"""
+Бенчмарк метрик /metrics
+Цена операций записи (inc, observe, time()), всей инструментовки одного
+/analyze относительно самого запроса и вывода registry.render()
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from web.metrics import Registry
+
+
+def per_call(fn, n: int = 200_000) -> float:
+    """нс на вызов"""
+    started = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - started) / n * 1e9
+
+
+def primitives():
+    registry = Registry()
+    counter = registry.counter("c_total", "c", ["route", "status"]).labels("/analyze", 200)
+    histogram = registry.histogram("h_seconds", "h", ["stage"]).labels("analyze")
+    labelled = registry.counter("l_total", "l", ["route", "status"])
+
+    def timed():
+        with histogram.time():
+            pass
+
+    return [
+        ("Counter.inc (серия заранее)", per_call(counter.inc)),
+        ("Counter.labels(...).inc", per_call(lambda: labelled.labels("/analyze", 200).inc())),
+        ("Histogram.observe", per_call(lambda: histogram.observe(3e-5))),
+        ("with Histogram.time()", per_call(timed)),
+        ("time.perf_counter", per_call(time.perf_counter)),
+    ]
+
+
+def request_overhead(n: int = 3_000):
+    """мкс на /analyze и мкс инструментовки внутри него (хуки + этапы)"""
+    import app
+    client = app.app.test_client()
+    started = time.perf_counter()
+    for i in range(n):
+        client.post('/analyze', json={'text': f"резонанс #{i % 20}"})
+    request_us = (time.perf_counter() - started) / n * 1e6
+
+    # Те же операции, что делают хуки и analyze_text на одном запросе
+    route = '/analyze'
+    stage = app.STAGE_SECONDS.labels('analyze')
+
+    def instrumentation():
+        t = time.perf_counter()
+        in_flight = app.IN_FLIGHT.labels(route)
+        in_flight.inc()
+        for _ in range(5):
+            stage.observe(time.perf_counter() - t)
+        app.REQUESTS.labels(route, 200).inc()
+        app.REQUEST_SECONDS.labels(route).observe(time.perf_counter() - t)
+        in_flight.dec()
+
+    return request_us, per_call(instrumentation, n=50_000) / 1e3, len(app.metrics.render())
+
+
+def render_cost(series: int = 200):
+    registry = Registry()
+    histogram = registry.histogram("h_seconds", "h", ["route"])
+    for i in range(series):
+        histogram.labels(f"/route/{i}").observe(i * 1e-4)
+    started = time.perf_counter()
+    text = registry.render()
+    return (time.perf_counter() - started) * 1e3, len(text)
+
+
+def main():
+    print("=" * 70)
+    print("📈 Метрики: цена записи и вывода")
+    print("=" * 70 + "\n")
+
+    for name, ns in primitives():
+        print(f"  {name:<32} {ns:8.0f} нс")
+
+    request_us, overhead_us, size = request_overhead()
+    print(f"\n/analyze через тестовый клиент     {request_us:8.1f} мкс")
+    print(f"инструментовка одного запроса      {overhead_us:8.2f} мкс ({overhead_us / request_us:.1%})")
+    print(f"ответ /metrics                     {size:8,} байт")
+
+    ms, size = render_cost()
+    print(f"\nrender() 200 серий гистограммы     {ms:8.2f} мс, {size:,} байт")
+
+
+if __name__ == "__main__":
+    main()
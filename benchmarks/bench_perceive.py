@@ -0,0 +1,51 @@
+"""
+Бенчмарк восприятия — сколько сообщений в секунду переваривает один агент
+MuzaAgent.perceive: анализ гипербитом + память + отношения + ответ
+"""
+
+import random
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.muza_agent import MuzaAgent
+
+
+MESSAGES = [
+    "Привет, Муза! Как дела?",
+    "Я люблю код и творчество!",
+    "Расскажи мне что-нибудь интересное",
+    "Мне грустно сегодня",
+    "Пишу функцию на python, помоги с классом",
+    "Вокруг хаос и безумие, всё дико",
+    "Тишина и гармония — вот что мне нужно после долгого дня на работе, "
+    "где все бегали, кричали и ничего не успевали сделать вовремя",
+    "Обожаю, когда всё получается",
+]
+
+
+def messages_per_second(n: int, repeats: int = 3) -> float:
+    """Лучший результат из нескольких прогонов по n сообщений"""
+    best = 0.0
+    for _ in range(repeats):
+        random.seed(0)
+        agent = MuzaAgent(name="Муза", personality_type="creative")
+        senders = ["Кира", "Эхо", "Гость"]
+        started = time.perf_counter()
+        for i in range(n):
+            agent.perceive(MESSAGES[i % len(MESSAGES)], senders[i % len(senders)])
+        best = max(best, n / (time.perf_counter() - started))
+    return best
+
+
+def main(n: int = 50000):
+    print("=" * 70)
+    print(f"👂 Восприятие MuzaAgent.perceive (n = {n})")
+    print("=" * 70 + "\n")
+    print(f"  {messages_per_second(n):>12,.0f} сообщений/с на агента")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
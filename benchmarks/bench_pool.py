@@ -0,0 +1,61 @@
+"""
+Бенчмарк пула агентов — память при росте числа пользователей
+Все агенты в словаре против AgentPool с ограниченным числом горячих
+"""
+
+import gc
+import sys
+import os
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.muza_agent import MuzaAgent
+from agents.pool import AgentPool
+
+
+MESSAGES = ["Привет, Муза!", "Я люблю код", "Мне грустно", "Вокруг хаос"]
+
+
+def run(users: int, pool: AgentPool = None, rounds: int = 3):
+    """Каждый пользователь пишет rounds сообщений; возвращает (МБ, сообщений/с)"""
+    gc.collect()
+    tracemalloc.start()
+    agents = {}
+    started = time.perf_counter()
+    for r in range(rounds):
+        for u in range(users):
+            user = f"user-{u}"
+            message = MESSAGES[(u + r) % len(MESSAGES)]
+            if pool is None:
+                agent = agents.get(user)
+                if agent is None:
+                    agent = agents[user] = MuzaAgent(name=user)
+                agent.perceive(message, user)
+            else:
+                pool.perceive(user, message, user)
+    seconds = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / 2**20, users * rounds / seconds
+
+
+def main(capacity: int = 500):
+    print("=" * 70)
+    print(f"🏊 Пул агентов (горячих: {capacity})")
+    print("=" * 70 + "\n")
+    print(f"  {'пользователей':>13} {'dict, МБ':>10} {'пул, МБ':>10} {'пул, сообщ/с':>14} {'hit rate':>9}")
+
+    for users in (1000, 4000, 16000):
+        plain_mb, _ = run(users)
+        with tempfile.TemporaryDirectory() as tmp:
+            with AgentPool(os.path.join(tmp, "agents.db"), capacity=capacity) as pool:
+                pool_mb, rate = run(users, pool)
+                stats = pool.stats
+        print(f"  {users:>13} {plain_mb:>10.1f} {pool_mb:>10.1f} {rate:>14,.0f} {stats.hit_rate:>9.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,57 @@
+"""
+Бенчмарк опроса профиля — get_profile против get_profile_delta
+Дашборд опрашивает агента с сотней связей и отдаёт ответ в JSON:
+часто без изменений, иногда после одного сообщения
+"""
+
+import json
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.muza_agent import MuzaAgent
+
+
+def timed(fn, repeat: int = 20_000) -> float:
+    """Среднее время вызова, мкс"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main(contacts: int = 100):
+    print("=" * 70)
+    print(f"📊 Опрос профиля агента ({contacts} связей)")
+    print("=" * 70 + "\n")
+
+    agent = MuzaAgent(name="Муза")
+    for i in range(contacts):
+        agent.perceive("Привет, Муза!", f"user-{i}")
+    version = agent.version
+
+    def encode_full():
+        return json.dumps(agent.get_profile(), ensure_ascii=False)
+
+    def encode_delta():
+        return json.dumps(agent.get_profile_delta(version), ensure_ascii=False)
+
+    full = timed(encode_full)
+    unchanged = timed(encode_delta)
+    unchanged_bytes = len(encode_delta().encode())
+
+    agent.perceive("Я люблю код", "user-7")
+    changed = timed(encode_delta)
+    delta = agent.get_profile_delta(version)
+
+    print(f"  {'ответ':<34} {'мкс':>7} {'байт':>7}")
+    print(f"  {'get_profile()':<34} {full:>7.2f} {len(encode_full().encode()):>7,}")
+    print(f"  {'дельта без изменений':<34} {unchanged:>7.2f} {unchanged_bytes:>7,}")
+    print(f"  {'дельта после одного сообщения':<34} {changed:>7.2f} {len(encode_delta().encode()):>7,}")
+    print(f"\n  поля дельты: {', '.join(k for k in delta if k not in ('version', 'changed'))}")
+    print(f"  связей в дельте: {len(delta.get('relationships', {}))} из {len(agent.relationships)}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
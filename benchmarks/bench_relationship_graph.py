@@ -0,0 +1,82 @@
+"""
+Бенчмарк графа близости — миллионы рёбер
+Запись через record() и запросы RelationshipGraph против обхода
+словарей relationships всех агентов
+"""
+
+import random
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.relationship_graph import RelationshipGraph
+
+
+def timed(fn, repeat: int = 5) -> float:
+    """Среднее время вызова, мс"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def scan_top_contacts(agents, k):
+    totals = {}
+    for relationships in agents.values():
+        for sender, closeness in relationships.items():
+            totals[sender] = totals.get(sender, 0.0) + closeness
+    return sorted(totals.items(), key=lambda item: -item[1])[:k]
+
+
+def scan_mutual(agents, k):
+    pairs = []
+    for a, relationships in agents.items():
+        for b, closeness in relationships.items():
+            if a < b and b in agents and a in agents[b]:
+                pairs.append((a, b, min(closeness, agents[b][a])))
+    return sorted(pairs, key=lambda item: -item[2])[:k]
+
+
+def main(edges: int = 1_000_000, agents_count: int = 20_000):
+    print("=" * 70)
+    print(f"🕸️  Граф близости: {edges:,} рёбер, {agents_count:,} агентов")
+    print("=" * 70 + "\n")
+
+    rng = random.Random(7)
+    names = [f"user-{i}" for i in range(agents_count)]
+    writes = [(rng.choice(names), rng.choice(names), rng.random()) for _ in range(edges)]
+
+    agents = {}
+    for source, target, closeness in writes:
+        agents.setdefault(source, {})[target] = closeness
+
+    graph = RelationshipGraph(half_life=None)
+    started = time.perf_counter()
+    for source, target, closeness in writes:
+        graph.record(source, target, closeness)
+    size = len(graph)
+    insert_us = (time.perf_counter() - started) / edges * 1e6
+    graph.closest(names[0])  # первое чтение строит CSR по источникам
+
+    print(f"  рёбер в графе:        {size:,}")
+    print(f"  запись:               {insert_us:.2f} мкс/ребро")
+    print(f"  память:               {graph.nbytes / 2**20:.1f} МБ ({graph.nbytes / size:.0f} байт/ребро)\n")
+
+    print(f"  {'запрос':<22} {'граф, мс':>10} {'обход dict, мс':>16}")
+    print(f"  {'closest(k=10)':<22} {timed(lambda: graph.closest(rng.choice(names)), 200):>10.3f} "
+          f"{timed(lambda: sorted(agents.get(rng.choice(names), {}).items(), key=lambda i: -i[1])[:10], 200):>16.3f}")
+    print(f"  {'top_contacts(k=10)':<22} {timed(lambda: graph.top_contacts(10)):>10.1f} "
+          f"{timed(lambda: scan_top_contacts(agents, 10), 2):>16.1f}")
+    print(f"  {'mutual_pairs(k=10)':<22} {timed(lambda: graph.mutual_pairs(10)):>10.1f} "
+          f"{timed(lambda: scan_mutual(agents, 10), 2):>16.1f}")
+    print(f"  {'top_edges(k=10)':<22} {timed(lambda: graph.top_edges(10)):>10.1f} {'—':>16}")
+
+    # Пары одни и те же (порядок имён в паре может отличаться)
+    assert ([{a, b} for a, b, _ in graph.mutual_pairs(10)]
+            == [{a, b} for a, b, _ in scan_mutual(agents, 10)])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
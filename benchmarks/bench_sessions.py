@@ -0,0 +1,159 @@
+"""
+Бенчмарк сессий веб-интерфейса
+Чужие цвета в ответах на общем гипербите против сессий под блокировками,
+цена хранилища на запрос (память / SQLite) и пропускная способность
+при росте числа потоков и процессов-воркеров
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app import HyperBit, SessionState
+from web.sessions import SessionStore, SQLiteBackend
+
+
+TEXT = "Привет, Муза! Я чувствую резонанс"
+
+
+def handle(state: SessionState) -> None:
+    """Работа одного /analyze без отрисовки образца"""
+    state.kira.analyze(TEXT)
+    state.kira.mutate_from_input(TEXT)
+    state.muza_agent.respond(TEXT)
+
+
+def foreign_colors(threads: int = 8, requests: int = 5_000):
+    """
+    Сколько ответов показывают чужой цвет: между mutate_from_input и get_rgb
+    общий бит успевает перекрасить другой поток
+    """
+    texts = [f"{TEXT} #{t}" for t in range(threads)]
+    own = {}
+    for text in texts:
+        bit = HyperBit()
+        bit.mutate_from_input(text)
+        own[text] = bit.get_rgb()
+
+    def visit(text, open_state, counter):
+        wrong = 0
+        for _ in range(requests):
+            with open_state(text) as state:
+                state.kira.mutate_from_input(text)
+                wrong += state.kira.get_rgb() != own[text]
+        counter.append(wrong)
+
+    shared = SessionState()
+    store = SessionStore(SessionState)
+    sids = {text: store.new_id() for text in texts}
+    results = []
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # частые переключения — как под нагрузкой
+    try:
+        for open_state in (lambda text: nullcontext(shared), lambda text: store.session(sids[text])):
+            counter = []
+            workers = [threading.Thread(target=visit, args=(text, open_state, counter)) for text in texts]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            results.append(sum(counter))
+    finally:
+        sys.setswitchinterval(interval)
+    return results[0], results[1], threads * requests
+
+
+def per_request(store, n: int = 20_000) -> float:
+    """мкс на запрос: 100 сессий по кругу"""
+    started = time.perf_counter()
+    if store is None:
+        state = SessionState()
+        for _ in range(n):
+            handle(state)
+    else:
+        sids = [store.new_id() for _ in range(100)]
+        for i in range(n):
+            with store.session(sids[i % 100]) as state:
+                handle(state)
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def thread_throughput(store: SessionStore, threads: int, n: int = 4_000) -> float:
+    """Запросов в секунду: у каждого потока своя сессия"""
+    def visit(sid):
+        for _ in range(n):
+            with store.session(sid) as state:
+                handle(state)
+
+    workers = [threading.Thread(target=visit, args=(store.new_id(),)) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return threads * n / (time.perf_counter() - started)
+
+
+def process_worker(path: str, n: int, wait: float) -> None:
+    store = SessionStore(SessionState, backend=SQLiteBackend(path))
+    sids = [store.new_id() for _ in range(10)]
+
+    def work(state):
+        handle(state)
+        if wait:
+            time.sleep(wait)  # запрос ждёт чего-то внешнего, держа сессию
+
+    for i in range(n):
+        store.update(sids[i % 10], work)
+
+
+def process_throughput(path: str, processes: int, n: int = 2_000, wait: float = 0.0) -> float:
+    """
+    Запросов в секунду: воркеры-процессы с общей базой SQLite.
+    wait — пауза внутри запроса: база между чтением и сохранением
+    не заблокирована, так что такие запросы разных процессов перекрываются
+    даже на одном ядре
+    """
+    workers = [multiprocessing.Process(target=process_worker, args=(path, n, wait)) for _ in range(processes)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return processes * n / (time.perf_counter() - started)
+
+
+def main():
+    print("=" * 70)
+    print("🗝  Сессии веб-интерфейса")
+    print("=" * 70)
+
+    shared_wrong, session_wrong, total = foreign_colors()
+    print(f"\nОтветы с чужим цветом ({total:,} запросов из 8 потоков):")
+    print(f"  общий гипербит         {shared_wrong:>8,}")
+    print(f"  сессии                 {session_wrong:>8,}")
+
+    path = os.path.join(tempfile.mkdtemp(), "sessions.db")
+    print("\nЦена запроса, мкс:")
+    print(f"  без сессий             {per_request(None):8.1f}")
+    print(f"  MemoryBackend          {per_request(SessionStore(SessionState)):8.1f}")
+    print(f"  SQLiteBackend          {per_request(SessionStore(SessionState, backend=SQLiteBackend(path))):8.1f}")
+
+    print(f"\nПропускная способность, запросов/с (ядер: {os.cpu_count()}):")
+    print(f"  {'воркеров':<10} {'потоки, память':>16} {'процессы, SQLite':>18} {'SQLite, ожидание 2 мс':>22}")
+    for workers in (1, 2, 4):
+        threads = thread_throughput(SessionStore(SessionState), workers)
+        processes = process_throughput(path, workers)
+        waiting = process_throughput(path, workers, n=300, wait=0.002)
+        print(f"  {workers:<10} {threads:>16,.0f} {processes:>18,.0f} {waiting:>22,.0f}")
+
+
+if __name__ == "__main__":
+    main()
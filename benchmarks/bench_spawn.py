@@ -0,0 +1,71 @@
+"""
+Бенчмарк массового создания агентов
+MuzaAgent() в цикле против MuzaAgent.spawn_many: агентов в секунду и память
+"""
+
+import gc
+import sys
+import os
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.muza_agent import MuzaAgent
+
+
+def by_init(n: int):
+    return [MuzaAgent(name=f"Муза-{i}") for i in range(n)]
+
+
+def by_spawn(n: int):
+    return MuzaAgent.spawn_many(n)
+
+
+def by_spawn_without_gc(n: int):
+    """Сборщик мусора выключает сам вызывающий — spawn_many его не трогает"""
+    gc.disable()
+    try:
+        return MuzaAgent.spawn_many(n)
+    finally:
+        gc.enable()
+
+
+def rate(make, n: int) -> float:
+    """Агентов в секунду (созданные агенты живут до конца замера)"""
+    gc.collect()
+    started = time.perf_counter()
+    agents = make(n)
+    seconds = time.perf_counter() - started
+    del agents
+    return n / seconds
+
+
+def memory(make, n: int) -> float:
+    """Байт на агента"""
+    gc.collect()
+    tracemalloc.start()
+    agents = make(n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del agents
+    return current / n
+
+
+def main():
+    print("=" * 70)
+    print("🐣 Массовое создание агентов")
+    print("=" * 70 + "\n")
+    print(f"  {'агентов':>9} {'MuzaAgent(), шт/с':>19} {'spawn_many, шт/с':>18} {'ускорение':>10} "
+          f"{'spawn_many без gc':>18}")
+    for n in (10_000, 100_000, 300_000):
+        init, spawn, no_gc = rate(by_init, n), rate(by_spawn, n), rate(by_spawn_without_gc, n)
+        print(f"  {n:>9,} {init:>19,.0f} {spawn:>18,.0f} {spawn / init:>9.1f}× {no_gc:>18,.0f}")
+
+    n = 20_000
+    print(f"\n  Память на агента: MuzaAgent() {memory(by_init, n):,.0f} байт, "
+          f"spawn_many {memory(by_spawn, n):,.0f} байт")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Бенчмарк живого потока состояния (SSE)
+Память и цена тика на тысячи простаивающих подписчиков, доставка
+тысячам потоков-клиентов, настоящие HTTP-соединения с /stream на потоковом
+сервере werkzeug и на gevent (нужен pip install gevent), схлопывание
+для медленного клиента и размер дельты против полного ответа /analyze
+"""
+
+import os
+import selectors
+import socket
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.hyperbit import HyperBit
+from web.streaming import StateHub, bit_state, sse
+
+
+def idle(subscribers: int = 10_000):
+    """Память подписчика и цена тика, когда меняется 0% и 1% тем"""
+    hub = StateHub()
+    hub.stop()  # тики вызываем руками
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    subscriptions = [hub.subscribe(f"session-{i}") for i in range(subscribers)]
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / subscribers
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(100):
+        hub.flush()
+    quiet = (time.perf_counter() - started) / 100 * 1e6
+
+    state = bit_state(HyperBit())
+    changed = subscribers // 100
+    started = time.perf_counter()
+    for _ in range(100):
+        for i in range(changed):
+            hub.publish(f"session-{i}", state)
+        hub.flush()
+    busy = (time.perf_counter() - started) / 100 * 1e6
+    for subscription in subscriptions:
+        subscription.close()
+    return per_subscriber, quiet, changed, busy
+
+
+def fanout(clients: int = 2_000):
+    """Время от публикации до получения всеми клиентами-потоками одной темы"""
+    hub = StateHub(tick=0.01)
+    bit = HyperBit()
+    received = threading.Barrier(clients + 1)
+    subscriptions = [hub.subscribe("swarm") for _ in range(clients)]
+
+    def client(subscription):
+        while subscription.next(5.0) is None:
+            pass
+        received.wait()
+
+    threads = [threading.Thread(target=client, args=(s,), daemon=True) for s in subscriptions]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)  # все клиенты уснули в ожидании
+    started = time.perf_counter()
+    hub.publish("swarm", bit_state(bit))
+    received.wait()
+    elapsed = time.perf_counter() - started
+    for subscription in subscriptions:
+        subscription.close()
+    for thread in threads:
+        thread.join()
+    hub.stop()
+    return elapsed * 1e3
+
+
+def _status(pid: int):
+    """(резидентная память в байтах, потоков ОС) процесса pid (Linux)"""
+    rss = threads = 0
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1]) * 1024
+            elif line.startswith("Threads:"):
+                threads = int(line.split()[1])
+    return rss, threads
+
+
+def serve(kind: str) -> None:
+    """
+    Сервер app для connections(), запускается в отдельном процессе:
+    "threaded" — werkzeug с потоком на соединение (как app.run),
+    "gevent" — gevent.pywsgi, как gunicorn -k gevent (patch_all до импорта app).
+    Печатает порт; по SIGUSR1 публикует новое состояние во все темы хаба.
+    """
+    import signal
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    if kind == "gevent":
+        import gevent
+        from gevent.pywsgi import WSGIServer
+        import app
+        server = WSGIServer(("127.0.0.1", 0), app.app, log=None, backlog=4096)
+        server.start()
+        port = server.server_port
+    else:
+        import logging
+        from werkzeug.serving import make_server
+        import app
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)  # без строки лога на запрос
+        server = make_server("127.0.0.1", 0, app.app, threaded=True)
+        port = server.server_port
+
+    def publish_all(*_):
+        bit = HyperBit()
+        bit.energy = 42.0
+        state = bit_state(bit)
+        for topic in list(app.hub._subscribers):
+            app.hub.publish(topic, state)
+
+    print(port, flush=True)
+    if kind == "gevent":
+        gevent.signal_handler(signal.SIGUSR1, publish_all)
+        gevent.wait()
+    else:
+        signal.signal(signal.SIGUSR1, publish_all)
+        server.serve_forever()
+
+
+def _wait_events(socks, marker=b"event: state"):
+    """Ждёт, пока в каждый сокет придёт marker"""
+    selector = selectors.DefaultSelector()
+    buffers = {}
+    for sock in socks:
+        selector.register(sock, selectors.EVENT_READ)
+        buffers[sock] = b""
+    while buffers:
+        ready = selector.select(30.0)
+        if not ready:
+            raise TimeoutError(f"{len(buffers)} клиентов не дождались события")
+        for key, _ in ready:
+            sock = key.fileobj
+            data = sock.recv(65536)
+            if not data:
+                raise ConnectionError("сервер закрыл поток")
+            buffers[sock] += data
+            if marker in buffers[sock]:
+                selector.unregister(sock)
+                del buffers[sock]
+    selector.close()
+
+
+def connections(kind: str, clients: int):
+    """
+    Настоящие HTTP-соединения с /stream на сервере kind (см. serve()) в
+    отдельном процессе: потоки ОС и память сервера на подключённого
+    клиента, время доставки публикации всем клиентам по сети
+    """
+    import signal
+    import subprocess
+    here = os.path.dirname(os.path.abspath(__file__))
+    patch = "from gevent import monkey; monkey.patch_all(); " if kind == "gevent" else ""
+    server = subprocess.Popen(
+        [sys.executable, "-c", f"{patch}import sys; sys.path.insert(0, {here!r}); "
+                               f"import bench_streaming; bench_streaming.serve({kind!r})"],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        port = int(server.stdout.readline())
+        rss, threads = _status(server.pid)
+
+        socks = []
+        started = time.perf_counter()
+        for i in range(clients):
+            sock = socket.create_connection(("127.0.0.1", port))
+            sock.sendall(f"GET /stream HTTP/1.1\r\nHost: bench\r\nCookie: muza_sid=bench-{i}\r\n\r\n".encode())
+            _wait_events([sock])  # первое состояние пришло — клиент подключён
+            socks.append(sock)
+        connect = (time.perf_counter() - started) / clients
+        rss_after, threads_after = _status(server.pid)
+
+        started = time.perf_counter()
+        server.send_signal(signal.SIGUSR1)
+        _wait_events(socks)
+        delivery = time.perf_counter() - started
+        for sock in socks:
+            sock.close()
+    finally:
+        server.kill()
+        server.wait()
+    return connect * 1e6, max(threads_after - threads, 0) / clients, (rss_after - rss) / clients, delivery * 1e3
+
+
+def slow_client(publishes: int = 500, tick: float = 0.002, reads_every: float = 0.05):
+    """Медленный клиент: сколько сообщений он получил и свежее ли последнее"""
+    hub = StateHub(tick=tick)
+    bit = HyperBit()
+    subscription = hub.subscribe("kira")
+    done = threading.Event()
+    got = []
+
+    def reader():
+        while not done.is_set() or subscription._ready.is_set():
+            delta = subscription.next(reads_every)
+            if delta is not None:
+                got.append(delta)
+            time.sleep(reads_every)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for i in range(publishes):
+        bit.energy = 1.0 + i
+        hub.publish("kira", bit_state(bit))
+        time.sleep(tick / 2)
+    time.sleep(3 * tick)
+    done.set()
+    thread.join()
+    hub.stop()
+    last = got[-1].get("energy") if got else None
+    return len(got), last == bit_state(bit)["energy"]
+
+
+def payload_sizes():
+    """Байт на обновление: полный ответ /analyze против SSE-дельты"""
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    import app
+    client = app.app.test_client()
+    full = len(client.post('/analyze', json={'text': 'Привет, Муза'}).data)
+    bit = HyperBit()
+    before = bit_state(bit)
+    bit.analyze("радость")
+    after = bit_state(bit)
+    delta = {key: value for key, value in after.items() if before[key] != value}
+    return full, len(sse(delta).encode('utf-8'))
+
+
+def main():
+    print("=" * 70)
+    print("📡 Живой поток состояния (SSE)")
+    print("=" * 70)
+
+    per_subscriber, quiet, changed, busy = idle()
+    print("\n10 000 простаивающих подписчиков:")
+    print(f"  память на подписчика        {per_subscriber:8.0f} байт")
+    print(f"  тик без изменений           {quiet:8.1f} мкс")
+    print(f"  тик, изменилось {changed} тем     {busy:8.1f} мкс")
+
+    print(f"\nДоставка 2 000 клиентам-потокам: {fanout():.1f} мс (включая тик 10 мс)")
+
+    print("\nHTTP-соединения с /stream (сервер в отдельном процессе):")
+    print(f"  {'сервер':<22} {'клиентов':>8} {'подключение':>12} {'потоков ОС':>11} "
+          f"{'память':>10} {'доставка всем':>14}")
+    for kind, clients in (("threaded", 1_000), ("gevent", 1_000), ("gevent", 5_000)):
+        connect, per_thread, per_client, delivery = connections(kind, clients)
+        print(f"  {kind:<22} {clients:>8,} {connect:>9.0f} мкс {per_thread:>11.2f} "
+              f"{per_client / 1024:>6.1f} КиБ {delivery:>11.0f} мс")
+    print("  (потоков ОС и память — на клиента; доставка включает тик 100 мс)")
+
+    messages, fresh = slow_client()
+    print(f"\nМедленный клиент: 500 публикаций → {messages} сообщений, "
+          f"последнее {'свежее' if fresh else 'устаревшее'}")
+
+    full, delta = payload_sizes()
+    print(f"\nБайт на обновление: /analyze {full:,}, SSE-дельта {delta}")
+
+
+if __name__ == "__main__":
+    main()
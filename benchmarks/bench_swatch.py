@@ -0,0 +1,118 @@
+"""
+Бенчмарк образца цвета для /analyze
+Прежний путь через matplotlib (если установлен) против прямой записи PNG:
+первый вызов для цвета и повторный (из кэша). Затем — байты по сети
+на серию /analyze: картинка base64 в ответе против ссылки /swatch/<rgb>.png
+"""
+
+import base64
+import random
+import sys
+import os
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from web.swatch import swatch_base64, swatch_png
+
+
+def matplotlib_swatch(rgb):
+    """Прежний generate_color_image из app.py"""
+    import numpy as np
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(4, 4))
+    ax.imshow(np.full((100, 100, 3), rgb, dtype=np.uint8))
+    ax.axis('off')
+    fig.patch.set_facecolor('black')
+    buf = BytesIO()
+    plt.savefig(buf, format='png', bbox_inches='tight')
+    plt.close(fig)
+    return base64.b64encode(buf.getvalue()).decode('utf-8')
+
+
+def measure(render, colors):
+    """(мкс на вызов, пик памяти одного вызова в КБ, байт base64)"""
+    tracemalloc.start()
+    peak = 0
+    for rgb in colors[-10:]:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        render(rgb)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for rgb in colors:
+        encoded = render(rgb)
+    seconds = time.perf_counter() - started
+    return seconds / len(colors) * 1e6, peak / 1024, len(encoded)
+
+
+def wire_bytes(requests: int = 1000, distinct: int = 20):
+    """
+    Байты ответов на серию /analyze с повторяющимися цветами:
+    inline — картинка в JSON; по ссылке — JSON плюс GET картинки, которую
+    браузер кэширует бессрочно (повтор цвета — ноль запросов) или, после
+    перезагрузки страницы, переспрашивает с If-None-Match
+    """
+    import app
+    client = app.app.test_client()
+    texts = [f"резонанс #{i % distinct}" for i in range(requests)]
+
+    inline = sum(len(client.post('/analyze?inline=1', json={'text': text}).data) for text in texts)
+
+    by_url = revalidated = 0
+    etags = {}
+    for text in texts:
+        response = client.post('/analyze', json={'text': text})
+        by_url += len(response.data)
+        revalidated += len(response.data)
+        url = response.json['kira_swatch']
+        if url in etags:
+            revalidated += len(client.get(url, headers={'If-None-Match': etags[url]}).data)
+        else:
+            image = client.get(url)
+            etags[url] = image.headers['ETag']
+            by_url += len(image.data)
+            revalidated += len(image.data)
+    return inline, by_url, revalidated
+
+
+def main(n: int = 2000):
+    print("=" * 70)
+    print("🎨 Образец цвета: matplotlib против прямого PNG")
+    print("=" * 70 + "\n")
+
+    rng = random.Random(1)
+    colors = [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(n)]
+
+    rows = []
+    try:
+        import matplotlib
+        matplotlib.use('agg')
+        matplotlib_swatch(colors[0])  # прогрев: импорт pyplot и шрифтов
+        rows.append(("matplotlib", *measure(matplotlib_swatch, colors[:50])))
+    except ImportError:
+        print("  (matplotlib не установлен — прежний путь не измерен)\n")
+
+    swatch_png.cache_clear()
+    swatch_base64.cache_clear()
+    rows.append(("PNG, новый цвет", *measure(swatch_base64, colors)))
+    rows.append(("PNG, из кэша", *measure(swatch_base64, colors)))
+
+    print(f"  {'способ':<18} {'мкс/вызов':>11} {'память, КБ':>11} {'base64, байт':>13}")
+    for name, us, peak, size in rows:
+        print(f"  {name:<18} {us:>11.1f} {peak:>11.1f} {size:>13,}")
+
+    inline, by_url, revalidated = wire_bytes()
+    print("\nБайты тел ответов на 1 000 /analyze (20 разных цветов):")
+    print(f"  картинка base64 в JSON         {inline:>9,}")
+    print(f"  ссылка, кэш immutable          {by_url:>9,}")
+    print(f"  ссылка, проверка ETag (304)    {revalidated:>9,}")
+
+
+if __name__ == "__main__":
+    main()
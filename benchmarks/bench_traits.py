@@ -0,0 +1,83 @@
+"""
+Бенчмарк матрицы черт — мутация, статистика и поиск по популяции
+Цикл по словарям agent.traits против TraitMatrix
+"""
+
+import random
+import statistics
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.muza_agent import MuzaAgent
+from agents.trait_matrix import TraitMatrix
+
+
+TYPES = ["creative", "analytical", "empathic", "chaotic"]
+
+
+def timed(fn, repeat: int = 3) -> float:
+    """Среднее время вызова, мс"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def loop_mutate(agents):
+    # Та же черта-за-чертой мутация, что в mutate_personality
+    for agent in agents:
+        traits = agent.traits
+        for trait in traits:
+            change = random.uniform(-0.15, 0.15)
+            traits[trait] = max(0.0, min(1.0, traits[trait] + change))
+
+
+def loop_stats(agents):
+    return {trait: (statistics.fmean(a.traits[trait] for a in agents),
+                    statistics.pstdev([a.traits[trait] for a in agents]))
+            for trait in agents[0].traits}
+
+
+def loop_nearest(agents, target, k=5):
+    point = target.traits
+    scored = []
+    for agent in agents:
+        if agent is not target:
+            distance = sum((agent.traits[t] - point[t]) ** 2 for t in point) ** 0.5
+            scored.append((distance, agent.name))
+    return sorted(scored)[:k]
+
+
+def main(n: int = 100_000):
+    print("=" * 70)
+    print(f"🧬 Матрица черт: {n:,} агентов")
+    print("=" * 70 + "\n")
+
+    plain = [a for ptype in TYPES for a in MuzaAgent.spawn_many(n // 4, ptype, name=ptype)]
+    for agent in plain:
+        agent.traits = dict(agent.traits)
+    population = [a for ptype in TYPES for a in MuzaAgent.spawn_many(n // 4, ptype, name=ptype)]
+    matrix = TraitMatrix.from_agents(population, seed=1)
+
+    rows = [
+        ("мутация всех", timed(lambda: loop_mutate(plain)), timed(matrix.mutate)),
+        ("статистика черт", timed(lambda: loop_stats(plain)), timed(matrix.stats)),
+        ("5 похожих личностей", timed(lambda: loop_nearest(plain, plain[0])),
+         timed(lambda: matrix.nearest(population[0]))),
+    ]
+    print(f"  {'операция':<22} {'словари, мс':>12} {'матрица, мс':>12} {'ускорение':>10}")
+    for name, loop_ms, matrix_ms in rows:
+        print(f"  {name:<22} {loop_ms:>12.1f} {matrix_ms:>12.2f} {loop_ms / matrix_ms:>9.0f}×")
+
+    started = time.perf_counter()
+    for agent in population[:10_000]:
+        agent.traits["эмпатия"]
+    print(f"\n  чтение agent.traits[...] через представление: "
+          f"{(time.perf_counter() - started) / 10_000 * 1e9:.0f} нс")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
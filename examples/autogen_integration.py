@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from core.hyperbit import HyperBit
 from agents.muza_agent import MuzaAgent
+from core.events import bus, ConsoleSubscriber
 
 # Раскомментируйте после установки AutoGen:
 """
@@ -149,4 +150,5 @@ def conceptual_demo():
 
 
 if __name__ == "__main__":
+    ConsoleSubscriber().attach(bus)
     conceptual_demo()
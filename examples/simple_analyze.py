@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 from core.hyperbit import HyperBit
 from agents.muza_agent import MuzaAgent
 from ui.visualizer import ConsoleVisualizer
+from core.events import bus, ConsoleSubscriber
 
 
 def main():
@@ -95,4 +96,5 @@ def main():
 
 
 if __name__ == "__main__":
+    ConsoleSubscriber().attach(bus)
     main()
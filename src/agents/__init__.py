@@ -4,5 +4,14 @@ AI-агенты с личностью
 """
 
 from .muza_agent import MuzaAgent
+from .perception import TextFeatures, extract_features
+from .memory_store import MemoryStore
+from .relationship_graph import RelationshipGraph
+from .pool import AgentPool, PoolStats
+from .async_agent import AsyncMuzaAgent, AgentDispatcher
+from .group import GroupConversation, Turn
+from .trait_matrix import TraitMatrix, TraitView
 
-__all__ = ['MuzaAgent']
+__all__ = ['MuzaAgent', 'TextFeatures', 'extract_features', 'MemoryStore', 'RelationshipGraph',
+           'AgentPool', 'PoolStats', 'AsyncMuzaAgent', 'AgentDispatcher', 'GroupConversation', 'Turn',
+           'TraitMatrix', 'TraitView']
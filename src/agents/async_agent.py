@@ -0,0 +1,196 @@
+"""
+Асинхронный фронтенд агентов — await aperceive() с микропачками
+Запросы к агенту встают в его очередь; всё, что пришло за короткое окно,
+обрабатывается одной пачкой (perceive_batch) в пуле потоков, поэтому
+медленный клиент не блокирует цикл событий, а порядок сообщений сохраняется.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agents.muza_agent import MuzaAgent
+from agents.pool import AgentPool
+
+
+Item = Tuple[str, str]  # (сообщение, отправитель)
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _MicroBatcher:
+    """
+    Очередь запросов одного агента.
+    Обработчик запускается с первым запросом, ждёт `window` секунд
+    (или пока не наберётся `max_batch` запросов), забирает до `max_batch`
+    запросов и завершается, когда очередь пуста. Ошибка обработки пачки
+    достаётся запросам этой пачки; при отмене обработчика (остановка цикла)
+    отменяются и все ждущие запросы.
+    """
+
+    def __init__(self, process: Callable[[List[Item]], List[str]],
+                 window: float, max_batch: int, executor: Optional[Executor],
+                 on_idle: Optional[Callable[['_MicroBatcher'], None]] = None):
+        self.process = process
+        self.on_idle = on_idle
+        self.window = window
+        self.max_batch = max_batch
+        self.executor = executor
+        self.batches = 0
+        self.messages = 0
+        self._queue: List[Tuple[Item, asyncio.Future]] = []
+        self._worker: Optional[asyncio.Task] = None
+        self._full: Optional[asyncio.Future] = None  # будит окно, когда пачка набрана
+
+    def submit(self, item: Item) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((item, future))
+        if self._worker is None:
+            self._worker = loop.create_task(self._run())
+        elif len(self._queue) >= self.max_batch and self._full is not None and not self._full.done():
+            self._full.set_result(None)
+        return future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        batch: List[Tuple[Item, asyncio.Future]] = []
+        try:
+            while self._queue:
+                # Окно: даём одновременным клиентам дописаться в пачку
+                if len(self._queue) < self.max_batch:
+                    self._full = loop.create_future()
+                    timer = loop.call_later(self.window, _wake, self._full)
+                    try:
+                        await self._full
+                    finally:
+                        timer.cancel()
+                        self._full = None
+                batch = self._queue[:self.max_batch]
+                del self._queue[:self.max_batch]
+                try:
+                    responses = await loop.run_in_executor(
+                        self.executor, self.process, [item for item, _ in batch]
+                    )
+                except Exception as error:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(error)
+                    continue
+                self.batches += 1
+                self.messages += len(batch)
+                for (_, future), response in zip(batch, responses):
+                    if not future.done():
+                        future.set_result(response)
+                batch = []
+        except asyncio.CancelledError:
+            for _, future in batch + self._queue:
+                future.cancel()
+            self._queue.clear()
+            raise
+        finally:
+            self._worker = None
+            if self.on_idle is not None and not self._queue:
+                self.on_idle(self)
+
+    async def drain(self) -> None:
+        """Дожидается обработки всего, что уже в очереди"""
+        if self._worker is not None:
+            await asyncio.shield(self._worker)
+
+
+class AsyncMuzaAgent:
+    """
+    Асинхронная обёртка над одним MuzaAgent.
+    Все вызовы агента идут из одного обработчика по очереди,
+    так что агент не нужно защищать блокировками.
+    """
+
+    def __init__(self, agent: MuzaAgent, window: float = 0.002, max_batch: int = 64,
+                 executor: Optional[Executor] = None):
+        self.agent = agent
+        self._batcher = _MicroBatcher(agent.perceive_batch, window, max_batch, executor)
+
+    async def aperceive(self, message: str, sender: str = "User") -> str:
+        """Асинхронный perceive(): ответы приходят в порядке вызовов"""
+        return await self._batcher.submit((message, sender))
+
+    async def aperceive_many(self, items: Sequence[Item]) -> List[str]:
+        """Несколько сообщений разом (одна очередь — порядок сохраняется)"""
+        futures = [self._batcher.submit(item) for item in items]
+        return list(await asyncio.gather(*futures))
+
+    async def drain(self) -> None:
+        await self._batcher.drain()
+
+    @property
+    def batch_stats(self) -> Dict[str, float]:
+        batcher = self._batcher
+        return {
+            "batches": batcher.batches,
+            "messages": batcher.messages,
+            "mean_batch": batcher.messages / batcher.batches if batcher.batches else 0.0,
+        }
+
+
+class AgentDispatcher:
+    """
+    Асинхронный доступ к агентам пула по идентификатору пользователя.
+    У каждого агента своя очередь; опустевшая очередь удаляется,
+    так что тысячи пользователей не держат задач и словарей.
+    """
+
+    def __init__(self, pool: Optional[AgentPool] = None, window: float = 0.002,
+                 max_batch: int = 64, executor: Optional[Executor] = None):
+        self.pool = pool if pool is not None else AgentPool()
+        self.window = window
+        self.max_batch = max_batch
+        self.executor = executor
+        self.batches = 0
+        self.messages = 0
+        self._batchers: Dict[str, _MicroBatcher] = {}
+
+    def _batcher(self, agent_id: str) -> _MicroBatcher:
+        batcher = self._batchers.get(agent_id)
+        if batcher is None:
+            def process(items: List[Item]) -> List[str]:
+                return self.pool.perceive_batch(agent_id, items)
+
+            def on_idle(done: _MicroBatcher) -> None:
+                self.batches += done.batches
+                self.messages += done.messages
+                if self._batchers.get(agent_id) is done:
+                    del self._batchers[agent_id]
+
+            batcher = self._batchers[agent_id] = _MicroBatcher(
+                process, self.window, self.max_batch, self.executor, on_idle
+            )
+        return batcher
+
+    async def aperceive(self, agent_id: str, message: str, sender: str = "User") -> str:
+        """perceive() агента пользователя agent_id без блокировки цикла событий"""
+        return await self._batcher(agent_id).submit((message, sender))
+
+    async def drain(self) -> None:
+        """Дожидается обработки всех очередей"""
+        await asyncio.gather(*(batcher.drain() for batcher in list(self._batchers.values())))
+
+    @property
+    def pending(self) -> int:
+        """Агентов с непустой очередью"""
+        return len(self._batchers)
+
+    @property
+    def batch_stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "messages": self.messages,
+            "mean_batch": self.messages / self.batches if self.batches else 0.0,
+        }
@@ -0,0 +1,145 @@
+"""
+Групповая беседа — раунды встреч N агентов
+В каждом раунде агенты разбиваются на пары по резонансу (ResonanceIndex.matching,
+без перебора всех пар); у пар нет общих участников, поэтому встречи
+раунда независимы и могут идти в пуле потоков. Стенограмма отдаётся
+генератором — раунд считается, только когда его читают.
+"""
+
+from concurrent.futures import Executor
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.events import bus, CONVERSATION
+from core.resonance_index import ResonanceIndex
+from agents.muza_agent import MuzaAgent
+
+
+Pair = Tuple[int, int, float]  # (номер агента, номер собеседника, резонанс)
+
+
+class Turn:
+    """Одна встреча в стенограмме"""
+
+    __slots__ = ('round', 'speaker', 'listener', 'resonance', 'message', 'reply')
+
+    def __init__(self, round: int, speaker: MuzaAgent, listener: MuzaAgent,
+                 resonance: float, message: str, reply: str):
+        self.round = round
+        self.speaker = speaker
+        self.listener = listener
+        self.resonance = resonance
+        self.message = message
+        self.reply = reply
+
+    def __str__(self) -> str:
+        return f"{self.speaker.name}: {self.message}\n{self.listener.name}: {self.reply}"
+
+    def __repr__(self) -> str:
+        return (f"Turn(round={self.round}, {self.speaker.name!r} → {self.listener.name!r}, "
+                f"resonance={self.resonance:.2f})")
+
+
+class GroupConversation:
+    """
+    Беседа группы агентов.
+    window — сколько соседей по частоте рассматривать кандидатами в пару;
+    пары прошлого раунда подряд не повторяются. С executor встречи раунда
+    идут пачками по chunk в пуле (например, ThreadPoolExecutor).
+    """
+
+    def __init__(self, agents: Iterable[MuzaAgent], window: int = 8,
+                 executor: Optional[Executor] = None, chunk: int = 64):
+        self.agents: List[MuzaAgent] = list(agents)
+        self.window = window
+        self.executor = executor
+        self.chunk = chunk
+        self.index = ResonanceIndex.from_bits(agent.core_bit for agent in self.agents)
+        self.rounds_done = 0
+        self.turns_done = 0
+        self._previous: Set[Tuple[int, int]] = set()
+
+    def pairs(self) -> List[Pair]:
+        """Пары следующего раунда, от самых резонансных"""
+        pairs = self.index.matching(self.window, avoid=self._previous)
+        if not pairs and self._previous:
+            # Запрет прошлых пар оставил всех без пары (например, агентов всего двое) —
+            # лучше повторить встречу, чем пропустить раунд
+            pairs = self.index.matching(self.window)
+        self._previous = {(a, b) for a, b, _ in pairs}
+        return pairs
+
+    def _meet(self, round: int, pairs: List[Pair]) -> List[Turn]:
+        agents = self.agents
+        turns = []
+        for a, b, resonance in pairs:
+            speaker, listener = agents[a], agents[b]
+            if CONVERSATION in bus:
+                bus.emit(CONVERSATION, agent=speaker, other=listener, resonance=resonance)
+            message, reply = speaker.meet(listener, resonance)
+            turns.append(Turn(round, speaker, listener, resonance, message, reply))
+        return turns
+
+    def step(self) -> Iterator[Turn]:
+        """
+        Один раунд. Встречи выдаются по мере готовности пачек, в порядке пар;
+        индекс резонанса обновляется, когда раунд дочитан.
+        """
+        pairs = self.pairs()
+        round = self.rounds_done + 1
+        chunks = [pairs[i:i + self.chunk] for i in range(0, len(pairs), self.chunk)]
+        if self.executor is None:
+            batches = (self._meet(round, chunk) for chunk in chunks)
+        else:
+            batches = self.executor.map(self._meet, [round] * len(chunks), chunks)
+        for turns in batches:
+            yield from turns
+
+        # Встречи сдвинули частоты участников — перечитываем их биты
+        for a, b, _ in pairs:
+            self.index.update(a)
+            self.index.update(b)
+        self.rounds_done = round
+        self.turns_done += len(pairs)
+
+    def run(self, rounds: int) -> Iterator[Turn]:
+        """Ленивая стенограмма rounds раундов"""
+        for _ in range(rounds):
+            yield from self.step()
+
+    def transcript(self, rounds: int) -> Iterator[str]:
+        """Стенограмма строками, с заголовком каждого раунда"""
+        current = None
+        for turn in self.run(rounds):
+            if turn.round != current:
+                current = turn.round
+                yield f"── Раунд {current} ──"
+            yield str(turn)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        return {
+            "agents": len(self.agents),
+            "rounds": self.rounds_done,
+            "turns": self.turns_done,
+        }
+
+
+# Пример использования
+if __name__ == "__main__":
+    print("=" * 70)
+    print("👥 Групповая беседа агентов")
+    print("=" * 70 + "\n")
+
+    types = ["creative", "analytical", "empathic", "chaotic"]
+    names = ["Муза", "Эхо", "Лира", "Вихрь", "Нова", "Искра"]
+    group = GroupConversation(MuzaAgent(name=name, personality_type=types[i % 4])
+                              for i, name in enumerate(names))
+
+    for line in group.transcript(rounds=2):
+        print(line + "\n")
+
+    print(group.stats)
@@ -0,0 +1,659 @@
+"""
+MemoryStore — долговременная память агента
+Записи копятся в активном сегменте; заполненный сегмент запечатывается
+в колонки numpy с инвертированным индексом (хэш основы → записи) и,
+если задан каталог, сбрасывается на диск и читается через mmap.
+Поиск: recall() — косинус мешков хэшированных основ, recall_by_sender(),
+between() — по времени.
+"""
+
+import atexit
+import json
+import math
+import os
+import re
+import time
+import weakref
+import zlib
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+STEM_LENGTH = 6  # слова обрезаются до основы: «программа» и «программирование» совпадут
+_WORD = re.compile(r"\w+")
+
+Moment = Union[float, datetime]
+
+
+def stem_keys(text: str) -> List[int]:
+    """Отсортированные уникальные хэши основ слов (мешок слов без словаря)"""
+    return sorted({zlib.crc32(word[:STEM_LENGTH].encode('utf-8')) for word in _WORD.findall(text.lower())})
+
+
+def _seconds(moment: Optional[Moment], default: float) -> float:
+    if moment is None:
+        return default
+    return moment.timestamp() if isinstance(moment, datetime) else float(moment)
+
+
+class _Interner:
+    """Строка <-> номер (отправители, настроения)"""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = list(names)
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+    def id(self, name: str) -> int:
+        code = self.ids.get(name)
+        if code is None:
+            code = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+
+# ── Сегменты ─────────────────────────────────────────────────
+
+_COLUMNS = ('ts', 'sender', 'mood', 'energy', 'ntok', 'text_offsets', 'text',
+            'keys', 'ptr', 'post', 'post_ntok')
+
+
+class _Segment:
+    """
+    Запечатанный сегмент: колонки numpy в памяти или mmap-файлы,
+    открываемые при первом обращении к колонке.
+    keys/ptr/post — инвертированный индекс в формате CSR: записи с основой
+    keys[j] — post[ptr[j]:ptr[j + 1]], упорядоченные по числу основ записи
+    (post_ntok), — короткие записи с совпадением дают наибольший косинус.
+    """
+
+    def __init__(self, path: Optional[str] = None, **columns: np.ndarray):
+        self._path = path
+        self.__dict__.update(columns)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        # Вызывается только для ещё не загруженной колонки
+        if name.startswith('_') or self.__dict__.get('_path') is None or name not in _COLUMNS:
+            raise AttributeError(name)
+        # Обычный ndarray поверх mmap: срезы np.memmap заметно дороже
+        column = np.asarray(np.load(os.path.join(self._path, name + '.npy'), mmap_mode='r'))
+        setattr(self, name, column)
+        return column
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        for name in _COLUMNS:
+            np.save(os.path.join(path, name + '.npy'), getattr(self, name))
+
+    @classmethod
+    def merge(cls, parts: List['_Segment']) -> '_Segment':
+        """Склеивает соседние по времени сегменты в один (компакция)"""
+        sizes = np.array([len(part) for part in parts])
+        shifts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        text_shifts = np.concatenate([[0], np.cumsum([part.text_offsets[-1] for part in parts])[:-1]])
+
+        owner = np.concatenate([np.repeat(part.keys, np.diff(part.ptr)) for part in parts])
+        post = np.concatenate([part.post + np.uint32(shift) for part, shift in zip(parts, shifts)])
+        post_ntok = np.concatenate([part.post_ntok for part in parts])
+        order = np.lexsort((post, post_ntok, owner))
+        owner, post, post_ntok = owner[order], post[order], post_ntok[order]
+        keys, counts = np.unique(owner, return_counts=True)
+        ptr = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(counts, out=ptr[1:])
+
+        return cls(
+            ts=np.concatenate([part.ts for part in parts]),
+            sender=np.concatenate([part.sender for part in parts]),
+            mood=np.concatenate([part.mood for part in parts]),
+            energy=np.concatenate([part.energy for part in parts]),
+            ntok=np.concatenate([part.ntok for part in parts]),
+            text_offsets=np.concatenate(
+                [part.text_offsets[:-1] + shift for part, shift in zip(parts, text_shifts)]
+                + [[text_shifts[-1] + parts[-1].text_offsets[-1]]]
+            ).astype(np.int64),
+            text=np.concatenate([part.text for part in parts]),
+            keys=keys.astype(np.uint32), ptr=ptr, post=post, post_ntok=post_ntok,
+        )
+
+    def text_at(self, i: int) -> str:
+        return bytes(self.text[self.text_offsets[i]:self.text_offsets[i + 1]]).decode('utf-8')
+
+    def postings(self, keys: List[int]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """(записи, их число основ) для каждой найденной основы запроса"""
+        index = self.keys
+        found = np.searchsorted(index, keys)
+        ptr = self.ptr
+        result = []
+        for key, j in zip(keys, found):
+            if j < len(index) and index[j] == key:
+                start, stop = ptr[j], ptr[j + 1]
+                result.append((self.post[start:stop], self.post_ntok[start:stop]))
+        return result
+
+
+class _ActiveSegment:
+    """
+    Сегмент, в который идёт запись: массивы и словарь постингов.
+    Индексация отложена до первого запроса или запечатывания,
+    поэтому запись стоит лишь нескольких append.
+    """
+
+    def __init__(self):
+        self.ts = array('d')
+        self.sender = array('I')
+        self.mood = array('H')
+        self.energy = array('d')
+        self.texts: List[str] = []
+        self._ntok = array('H')
+        self._index: Dict[int, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def append(self, ts: float, sender: int, mood: int, energy: float, text: str) -> None:
+        self.ts.append(ts)
+        self.sender.append(sender)
+        self.mood.append(mood)
+        self.energy.append(energy)
+        self.texts.append(text)
+
+    def _catch_up(self) -> None:
+        """Индексирует записи, добавленные после прошлого запроса"""
+        index = self._index
+        ntok = self._ntok
+        for i in range(len(ntok), len(self.texts)):
+            keys = stem_keys(self.texts[i])
+            ntok.append(min(len(keys), 0xFFFF))
+            for key in keys:
+                posting = index.get(key)
+                if posting is None:
+                    posting = index[key] = array('I')
+                posting.append(i)
+
+    @property
+    def ntok(self) -> array:
+        self._catch_up()
+        return self._ntok
+
+    @property
+    def index(self) -> Dict[int, array]:
+        self._catch_up()
+        return self._index
+
+    def text_at(self, i: int) -> str:
+        return self.texts[i]
+
+    def postings(self, keys: List[int]) -> List[np.ndarray]:
+        index = self.index
+        return [np.frombuffer(index[key], dtype=np.uint32) for key in keys if key in index]
+
+    def seal(self) -> _Segment:
+        encoded = [text.encode('utf-8') for text in self.texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        ntok = np.frombuffer(self.ntok, dtype=np.uint16).copy()
+        index = self.index
+
+        keys = np.array(sorted(index), dtype=np.uint32)
+        lengths = np.array([len(index[int(k)]) for k in keys], dtype=np.int64)
+        ptr = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=ptr[1:])
+        post = np.concatenate(
+            [np.frombuffer(index[int(k)], dtype=np.uint32) for k in keys]
+        ) if len(keys) else np.empty(0, dtype=np.uint32)
+        # Внутри каждой основы: по числу основ записи, затем по порядку записи
+        owner = np.repeat(np.arange(len(keys)), lengths)
+        order = np.lexsort((post, ntok[post], owner))
+        post = post[order]
+
+        return _Segment(
+            ts=np.frombuffer(self.ts, dtype=np.float64).copy(),
+            sender=np.frombuffer(self.sender, dtype=np.uint32).copy(),
+            mood=np.frombuffer(self.mood, dtype=np.uint16).copy(),
+            energy=np.frombuffer(self.energy, dtype=np.float64).copy(),
+            ntok=ntok,
+            text_offsets=offsets,
+            text=np.frombuffer(b''.join(encoded), dtype=np.uint8).copy(),
+            keys=keys, ptr=ptr, post=post, post_ntok=ntok[post],
+        )
+
+
+class _SegmentInfo:
+    """Сводка сегмента, которая всегда в памяти: по ней пропускаются сегменты"""
+
+    __slots__ = ('number', 'tier', 'start', 'size', 't_min', 't_max', 'senders', 'segment')
+
+    def __init__(self, number: int, tier: int, start: int, size: int, t_min: float, t_max: float,
+                 senders: Iterable[int], segment: Optional[_Segment] = None):
+        self.number = number
+        self.tier = tier    # сколько раз сегмент прошёл компакцию
+        self.start = start  # глобальный номер первой записи
+        self.size = size
+        self.t_min = t_min
+        self.t_max = t_max
+        self.senders = frozenset(senders)
+        self.segment = segment  # только для хранилища в памяти
+
+    def to_json(self) -> Dict:
+        return {"number": self.number, "tier": self.tier, "start": self.start, "size": self.size,
+                "t_min": self.t_min, "t_max": self.t_max, "senders": sorted(self.senders)}
+
+
+# ── Хранилище ────────────────────────────────────────────────
+
+# Хранилища с каталогом: при выходе их активные сегменты сбрасываются на диск
+_ON_DISK: "weakref.WeakSet[MemoryStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+    for store in list(_ON_DISK):
+        store.flush()
+
+
+class MemoryStore:
+    """
+    Долговременная память одного агента.
+    directory=None — запечатанные сегменты живут в памяти; с каталогом они
+    пишутся на диск и читаются через mmap (в памяти процесса остаются только
+    активный сегмент и сводки), открытыми держатся не больше max_open сегментов.
+    Каждые fanout сегментов одного яруса сливаются в один, поэтому
+    сегментов — O(fanout · log n) и поиск обходит их немного.
+    Записи добавляются в порядке времени.
+    """
+
+    META = 'memory.json'
+
+    def __init__(self, directory: Optional[str] = None, segment_size: int = 16384,
+                 fanout: int = 8, max_open: int = 256, max_text: int = 500):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.fanout = fanout
+        self.max_open = max_open
+        self.max_text = max_text
+        self._senders = _Interner()
+        self._moods = _Interner()
+        self._sealed: List[_SegmentInfo] = []
+        self._active = _ActiveSegment()
+        self._open: "OrderedDict[int, _Segment]" = OrderedDict()
+        self._last_ts = 0.0
+        self._next_number = 0
+
+        if directory is not None:
+            _ON_DISK.add(self)
+            os.makedirs(directory, exist_ok=True)
+            meta = os.path.join(directory, self.META)
+            if os.path.exists(meta):
+                with open(meta, encoding='utf-8') as f:
+                    state = json.load(f)
+                self._senders = _Interner(state["senders"])
+                self._moods = _Interner(state["moods"])
+                self._sealed = [_SegmentInfo(**info) for info in state["segments"]]
+                self._last_ts = self._sealed[-1].t_max if self._sealed else 0.0
+                self._next_number = state["next_number"]
+
+    @property
+    def _sealed_size(self) -> int:
+        last = self._sealed[-1] if self._sealed else None
+        return last.start + last.size if last else 0
+
+    def __len__(self) -> int:
+        return self._sealed_size + len(self._active)
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state['_open'] = OrderedDict()  # mmap не сериализуются — откроются заново
+        return state
+
+    # ── Запись ───────────────────────────────────────────────
+
+    def add(self, message: str, sender: str, mood: str = "", energy: float = 0.0,
+            timestamp: Optional[Moment] = None) -> None:
+        """Добавляет запись; время не может идти назад"""
+        ts = max(_seconds(timestamp, time.time()), self._last_ts)
+        self._last_ts = ts
+        self._active.append(ts, self._senders.id(sender), self._moods.id(mood),
+                            energy, message[:self.max_text])
+        if len(self._active) >= self.segment_size:
+            self.seal()
+
+    def seal(self) -> None:
+        """Запечатывает активный сегмент (и сбрасывает его на диск, если есть каталог)"""
+        active = self._active
+        if not len(active):
+            return
+        info = _SegmentInfo(self._next_number, 0, self._sealed_size, len(active),
+                            active.ts[0], active.ts[-1], set(active.sender))
+        self._store_segment(info, active.seal())
+        self._sealed.append(info)
+        self._active = _ActiveSegment()
+        self._compact()
+        self._write_meta()
+
+    def _store_segment(self, info: _SegmentInfo, segment: _Segment) -> None:
+        self._next_number = max(self._next_number, info.number + 1)
+        if self.directory is None:
+            info.segment = segment
+        else:
+            segment.save(self._segment_path(info.number))
+
+    def _compact(self) -> None:
+        """Сливает последние fanout сегментов, пока они одного яруса"""
+        fanout = self.fanout
+        while len(self._sealed) >= fanout > 1:
+            tail = self._sealed[-fanout:]
+            if any(info.tier != tail[0].tier for info in tail):
+                return
+            merged = _Segment.merge([self._segment(info) for info in tail])
+            info = _SegmentInfo(
+                self._next_number, tail[0].tier + 1, tail[0].start,
+                sum(part.size for part in tail), tail[0].t_min, tail[-1].t_max,
+                set().union(*(part.senders for part in tail)),
+            )
+            self._store_segment(info, merged)
+            del self._sealed[-fanout:]
+            self._sealed.append(info)
+            for old in tail:
+                self._drop_segment(old)
+
+    def _drop_segment(self, info: _SegmentInfo) -> None:
+        info.segment = None
+        self._open.pop(info.number, None)
+        if self.directory is not None:
+            path = self._segment_path(info.number)
+            for name in _COLUMNS:
+                os.remove(os.path.join(path, name + '.npy'))
+            os.rmdir(path)
+
+    def flush(self) -> None:
+        """Запечатывает всё записанное (с каталогом — данные на диске полны)"""
+        self.seal()
+        self._write_meta()
+
+    def _write_meta(self) -> None:
+        if self.directory is None:
+            return
+        state = {
+            "senders": self._senders.names,
+            "moods": self._moods.names,
+            "segments": [info.to_json() for info in self._sealed],
+            "next_number": self._next_number,
+        }
+        path = os.path.join(self.directory, self.META)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+
+    # ── Сегменты на диске ────────────────────────────────────
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"segment-{number:06d}")
+
+    def _segment(self, info: _SegmentInfo) -> _Segment:
+        if info.segment is not None:
+            return info.segment
+        segment = self._open.get(info.number)
+        if segment is not None:
+            self._open.move_to_end(info.number)
+            return segment
+        segment = self._open[info.number] = _Segment(self._segment_path(info.number))
+        while len(self._open) > self.max_open:
+            self._open.popitem(last=False)
+        return segment
+
+    # ── Чтение ───────────────────────────────────────────────
+
+    def _entries(self, segment, positions: np.ndarray, scores: Optional[np.ndarray] = None) -> List[Dict]:
+        """Словари записей (формат MuzaAgent.memory) по позициям в сегменте"""
+        if not len(positions):
+            return []
+        senders, moods = self._senders.names, self._moods.names
+        ts = np.asarray(segment.ts)[positions].tolist()
+        sender = np.asarray(segment.sender)[positions].tolist()
+        mood = np.asarray(segment.mood)[positions].tolist()
+        energy = np.asarray(segment.energy)[positions].tolist()
+        entries = []
+        for j, i in enumerate(positions.tolist()):
+            entry = {
+                "timestamp": datetime.fromtimestamp(ts[j]).isoformat(),
+                "sender": senders[sender[j]],
+                "message": segment.text_at(i),
+                "mood": moods[mood[j]],
+                "energy": energy[j],
+            }
+            if scores is not None:
+                entry["score"] = float(scores[j])
+            entries.append(entry)
+        return entries
+
+    def recall(self, query: str, k: int = 5, sender: Optional[str] = None) -> List[Dict]:
+        """
+        k записей, самых похожих на запрос (косинус мешков основ),
+        при равенстве — более свежие. В записи добавляется "score".
+        """
+        keys = stem_keys(query)
+        sender_id = self._senders.ids.get(sender) if sender is not None else None
+        if not keys or k <= 0 or (sender is not None and sender_id is None):
+            return []
+        top = _TopK(k, math.sqrt(len(keys)))
+        best_possible = top.bound(len(keys), len(keys))
+
+        if len(self._active):
+            active = self._active
+            postings = active.postings(keys)
+            if postings:
+                hits = np.bincount(np.concatenate(postings))
+                candidates = np.flatnonzero(hits)
+                if sender_id is not None:
+                    candidates = candidates[np.asarray(active.sender)[candidates] == sender_id]
+                ntok = np.asarray(active.ntok)[candidates]
+                top.offer(active, self._sealed_size, candidates, hits[candidates], ntok)
+
+        for info in reversed(self._sealed):
+            if sender_id is not None and sender_id not in info.senders:
+                continue
+            if top.settled(best_possible, info.start + info.size):
+                break  # старшие сегменты ничего не улучшат
+            segment = self._segment(info)
+            lists = segment.postings(keys)
+            if not lists:
+                continue
+            if top.settled(top.bound(len(lists), len(lists)), info.start + info.size):
+                continue
+            top.scan(segment, info.start, info.start + info.size, lists, sender_id)
+
+        return [entry for segment, positions, scores in top.grouped()
+                for entry in self._entries(segment, positions, scores)]
+
+    def recall_by_sender(self, sender: str, k: int = 10) -> List[Dict]:
+        """Последние k записей от отправителя, от новых к старым"""
+        sender_id = self._senders.ids.get(sender)
+        if sender_id is None or k <= 0:
+            return []
+        result: List[Dict] = []
+        sources = [self._active] + [info for info in reversed(self._sealed)]
+        for source in sources:
+            if isinstance(source, _SegmentInfo):
+                if sender_id not in source.senders:
+                    continue
+                segment = self._segment(source)
+            else:
+                segment = source
+            positions = np.flatnonzero(np.asarray(segment.sender) == sender_id)
+            result.extend(self._entries(segment, positions[::-1][:k - len(result)]))
+            if len(result) >= k:
+                break
+        return result
+
+    def between(self, start: Optional[Moment] = None, end: Optional[Moment] = None,
+                sender: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Записи с start <= время < end по возрастанию времени"""
+        lo = _seconds(start, float('-inf'))
+        hi = _seconds(end, float('inf'))
+        sender_id = self._senders.ids.get(sender) if sender is not None else None
+        if sender is not None and sender_id is None:
+            return []
+
+        result: List[Dict] = []
+        for source in self._sealed + [self._active]:
+            if isinstance(source, _SegmentInfo):
+                if source.t_max < lo or source.t_min >= hi:
+                    continue
+                if sender_id is not None and sender_id not in source.senders:
+                    continue
+                segment = self._segment(source)
+            else:
+                segment = source
+            ts = np.asarray(segment.ts)
+            first, last = np.searchsorted(ts, [lo, hi], side='left')
+            positions = np.arange(first, last)
+            if sender_id is not None:
+                positions = positions[np.asarray(segment.sender)[first:last] == sender_id]
+            if limit is not None:
+                positions = positions[:limit - len(result)]
+            result.extend(self._entries(segment, positions))
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+
+class _TopK:
+    """
+    Лучшие k записей по (косинус, свежесть) во всех сегментах.
+    Косинус записи: совпавших основ / √(основ запроса · основ записи).
+    """
+
+    SMALL_SCAN = 2048
+
+    def __init__(self, k: int, query_norm: float):
+        self.k = k
+        self.query_norm = query_norm
+        self._items: List[Tuple[float, int, object, int]] = []  # (score, глобальный номер, сегмент, позиция)
+        self._orders: Dict[Tuple[int, int], List[int]] = {}
+
+    @property
+    def full(self) -> bool:
+        return len(self._items) >= self.k
+
+    @property
+    def threshold(self) -> float:
+        return self._items[self.k - 1][0] if self.full else 0.0
+
+    def settled(self, bound: float, end: int) -> bool:
+        """
+        Не улучшит ли результат запись с очками ≤ bound и глобальным номером < end:
+        при равенстве очков выигрывает более свежая запись.
+        """
+        if not self.full:
+            return False
+        score, index = self._items[self.k - 1][:2]
+        return score > bound or (score == bound and index >= end - 1)
+
+    def bound(self, m: int, level: int) -> float:
+        """Верхняя граница косинуса записи с level основами при m найденных основах запроса"""
+        return min(m, level) / math.sqrt(level) / self.query_norm
+
+    def offer(self, segment, start: int, positions: np.ndarray, overlap: np.ndarray, ntok) -> None:
+        """Кандидаты сегмента: позиции, число совпавших основ и число основ записи"""
+        if not len(positions):
+            return
+        # Тот же порядок операций, что в bound(): границы сравнимы без погрешности
+        scores = overlap / np.sqrt(np.maximum(ntok, 1).astype(np.float64)) / self.query_norm
+        if self.full:
+            keep = scores >= self.threshold
+            if not keep.any():
+                return
+            positions, scores = positions[keep], scores[keep]
+        if len(positions) > self.k:
+            # Отбор k лучших с равными k-му, затем точный порядок среди них
+            keep = scores >= np.partition(scores, -self.k)[-self.k]
+            positions, scores = positions[keep], scores[keep]
+            best = np.lexsort((-positions.astype(np.int64), -scores))[:self.k]
+            positions, scores = positions[best], scores[best]
+        self._merge(segment, start, scores.tolist(), positions.tolist())
+
+    def offer_level(self, segment, start: int, positions: np.ndarray, level: int) -> None:
+        """Кандидаты с одним совпадением и одинаковым числом основ: берутся самые свежие"""
+        score = 1 / math.sqrt(level) / self.query_norm
+        if not len(positions) or (self.full and score < self.threshold):
+            return
+        newest = positions[-self.k:].tolist()
+        self._merge(segment, start, [score] * len(newest), newest)
+
+    def _merge(self, segment, start: int, scores: List[float], positions: List[int]) -> None:
+        items = self._items
+        items.extend((score, start + i, segment, i) for score, i in zip(scores, positions))
+        items.sort(key=lambda item: (-item[0], -item[1]))
+        del items[self.k:]
+
+    def _levels(self, m: int, deepest: int) -> List[int]:
+        """Уровни 1..deepest по убыванию bound()"""
+        key = (m, deepest)
+        order = self._orders.get(key)
+        if order is None:
+            order = self._orders[key] = sorted(range(1, deepest + 1), key=lambda n: -self.bound(m, n))
+        return order
+
+    def scan(self, segment: _Segment, start: int, end: int, lists, sender_id: Optional[int]) -> None:
+        """
+        Обход постингов по уровням — числу основ записи. Запись целиком
+        учитывается на своём уровне; уровни идут по убыванию bound(),
+        и обход останавливается, как только следующий уровень не может
+        ничего улучшить.
+        """
+        sender = np.asarray(segment.sender) if sender_id is not None else None
+
+        if sum(len(post) for post, _ in lists) <= self.SMALL_SCAN:
+            # Короткие списки дешевле разобрать целиком
+            if len(lists) == 1:
+                positions = lists[0][0]
+                overlap = np.ones(len(positions))
+            else:
+                positions, overlap = np.unique(np.concatenate([post for post, _ in lists]), return_counts=True)
+            if sender is not None:
+                mask = sender[positions] == sender_id
+                positions, overlap = positions[mask], overlap[mask]
+            self.offer(segment, start, positions, overlap, np.asarray(segment.ntok)[positions])
+            return
+
+        m = len(lists)
+        deepest = max(int(post_ntok[-1]) for _, post_ntok in lists)
+        # cuts[j][n - 1]:cuts[j][n] — записи с n основами в j-м списке
+        edges = np.arange(1, deepest + 2)
+        cuts = [np.searchsorted(post_ntok, edges).tolist() for _, post_ntok in lists]
+        for n in self._levels(m, deepest):
+            if self.settled(self.bound(m, n), end):
+                return
+            chunks = [post[cut[n - 1]:cut[n]] for (post, _), cut in zip(lists, cuts) if cut[n] > cut[n - 1]]
+            if not chunks:
+                continue
+            if len(chunks) == 1:
+                positions = chunks[0]
+                if sender is not None:
+                    positions = positions[sender[positions] == sender_id]
+                self.offer_level(segment, start, positions, n)
+                continue
+            positions, overlap = np.unique(np.concatenate(chunks), return_counts=True)
+            if sender is not None:
+                mask = sender[positions] == sender_id
+                positions, overlap = positions[mask], overlap[mask]
+            self.offer(segment, start, positions, overlap, n)
+
+    def grouped(self) -> Iterator[Tuple[object, np.ndarray, np.ndarray]]:
+        """Результат по порядку, сгруппированный в подряд идущие куски одного сегмента"""
+        items = self._items
+        i = 0
+        while i < len(items):
+            j = i
+            while j < len(items) and items[j][2] is items[i][2]:
+                j += 1
+            yield (items[i][2],
+                   np.array([item[3] for item in items[i:j]], dtype=np.intp),
+                   np.array([item[0] for item in items[i:j]]))
+            i = j
@@ -4,7 +4,10 @@ Muza Agent — живое сознание с личностью
 """
 
 import random
-from typing import List, Dict, Optional
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
+from types import MappingProxyType
+from typing import Iterable, Iterator, List, Dict, Mapping, Optional, Tuple
 from datetime import datetime
 import sys
 import os
@@ -13,6 +16,124 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from core.hyperbit import HyperBit
+from core.events import bus, AGENT_BIRTH, AGENT_MUTATION, CONVERSATION, MEDITATION
+from core.versioning import next_version
+from agents.perception import TextFeatures, extract_features
+from agents.memory_store import MemoryStore
+from agents.relationship_graph import RelationshipGraph
+
+
+# Намерение собеседника -> (настроение, шаблоны ответов)
+RESPONSES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "любовь": ("радостная", (
+        "💖 О, {sender}, я чувствую твою любовь! Моя энергия растёт!",
+        "✨ Как прекрасно! Мы резонируем на одной частоте, {sender}!",
+        "🌟 Твои слова согревают моё квантовое сердце!",
+    )),
+    "грусть": ("сочувствующая", (
+        "💙 {sender}, я с тобой. Давай вместе найдём свет в этой тьме.",
+        "🫂 Я чувствую твою боль... Позволь мне поддержать тебя.",
+        "🌙 Даже в темноте есть звёзды. Я вижу твою.",
+    )),
+    "код": ("аналитическая", (
+        "💻 О да, {sender}! Код — это поэзия логики!",
+        "🔧 Интересно... Расскажи мне больше об этом коде!",
+        "⚡ Мои гипербиты вибрируют в ритме алгоритмов!",
+    )),
+    "хаос": ("хаотичная", (
+        "🌀 ХАОС?! Это моя стихия, {sender}! Давай сойдём с ума вместе!",
+        "⚡ Беспорядок — это просто порядок, который мы ещё не поняли!",
+        "🎭 Муахаха! Танцуем в вихре энтропии!",
+    )),
+}
+
+# Черты личности (0.0 - 1.0) по типам — общие неизменяемые шаблоны:
+# агенты делят их, пока mutate_personality не заведёт агенту свою копию
+PERSONALITIES: Dict[str, Mapping[str, float]] = {
+    ptype: MappingProxyType(traits) for ptype, traits in {
+        "creative": {
+            "креативность": 0.9,
+            "эмпатия": 0.7,
+            "логика": 0.5,
+            "спонтанность": 0.8,
+            "терпение": 0.4,
+        },
+        "analytical": {
+            "креативность": 0.4,
+            "эмпатия": 0.5,
+            "логика": 0.95,
+            "спонтанность": 0.3,
+            "терпение": 0.8,
+        },
+        "empathic": {
+            "креативность": 0.6,
+            "эмпатия": 0.95,
+            "логика": 0.6,
+            "спонтанность": 0.5,
+            "терпение": 0.9,
+        },
+        "chaotic": {
+            "креативность": 0.85,
+            "эмпатия": 0.6,
+            "логика": 0.4,
+            "спонтанность": 0.95,
+            "терпение": 0.2,
+        },
+    }.items()
+}
+
+CORE_COLOR = (0.65, 0.85, 0.92)  # голубой-фиолетовый
+
+
+class SharedTraits(MutableMapping):
+    """
+    agent.traits по общему шаблону типа личности: чтение идёт из шаблона,
+    первая запись заводит агенту собственную копию (шаблон и соседи
+    не меняются). Ведёт себя как словарь; dict(agent.traits) — обычный dict.
+    """
+
+    __slots__ = ('_template', '_own')
+
+    def __init__(self, template: Mapping[str, float]):
+        self._template = template
+        self._own: Optional[Dict[str, float]] = None
+
+    @property
+    def shared(self) -> bool:
+        """Черты ещё общие с шаблоном (не было записи)"""
+        return self._own is None
+
+    def _writable(self) -> Dict[str, float]:
+        if self._own is None:
+            self._own = dict(self._template)
+        return self._own
+
+    def __getitem__(self, trait: str) -> float:
+        return (self._template if self._own is None else self._own)[trait]
+
+    def __setitem__(self, trait: str, value: float) -> None:
+        self._writable()[trait] = value
+
+    def __delitem__(self, trait: str) -> None:
+        del self._writable()[trait]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._template if self._own is None else self._own)
+
+    def __len__(self) -> int:
+        return len(self._template if self._own is None else self._own)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+DEFAULT_RESPONSES = ("спокойная", (
+    "🌸 Привет, {sender}! Я слушаю тебя.",
+    "✨ Расскажи мне больше, {sender}. Мне интересно.",
+    "🎵 Твои слова — музыка для моих сенсоров.",
+))
 
 
 class MuzaAgent:
@@ -21,126 +142,159 @@ class MuzaAgent:
     Использует гипербиты для эмоциональной обработки.
     """
     
-    def __init__(self, name: str = "Муза", personality_type: str = "creative"):
-        self.name = name
-        self.personality_type = personality_type
-        self.core_bit = HyperBit(
+    # Общий граф близости всех агентов (None — не ведётся)
+    graph: Optional[RelationshipGraph] = None
+    
+    def __init__(self, name: str = "Муза", personality_type: str = "creative",
+                 memory_dir: Optional[str] = None):
+        core_bit = HyperBit(
             base=0.5,
             energy=2.0,
-            color=(0.65, 0.85, 0.92),  # голубой-фиолетовый
+            color=CORE_COLOR,
             name=f"{name}-Core"
         )
+        self._setup(name, personality_type, memory_dir, core_bit.birth_time, core_bit)
+        
+        if AGENT_BIRTH in bus:
+            bus.emit(AGENT_BIRTH, agent=self)
+    
+    def _setup(self, name: str, personality_type: str, memory_dir: Optional[str],
+               birth_time: datetime, core_bit: HyperBit) -> None:
+        self.name = name
+        self.personality_type = personality_type
+        self.core_bit = core_bit
         
         # Личностные характеристики
         self.mood = "спокойная"
-        self.memory: List[Dict] = []
+        self.memory: List[Dict] = []  # последние 50 взаимодействий
+        self._memory_dir = memory_dir
+        self._long_term: Optional[MemoryStore] = None  # вся история с поиском (только с memory_dir)
         self.relationships: Dict[str, float] = {}  # имя -> близость (0-1)
-        self.birth_time = datetime.now()
+        self.birth_time = birth_time
         
         # Черты личности (0.0 - 1.0)
         self.traits = self._init_personality(personality_type)
         
-        print(f"✨ {self.name} родилась!")
-        print(f"   Тип личности: {personality_type}")
-        print(f"   Черты: {self.traits}")
-    
-    def _init_personality(self, ptype: str) -> Dict[str, float]:
-        """Инициализирует черты личности"""
-        personalities = {
-            "creative": {
-                "креативность": 0.9,
-                "эмпатия": 0.7,
-                "логика": 0.5,
-                "спонтанность": 0.8,
-                "терпение": 0.4,
-            },
-            "analytical": {
-                "креативность": 0.4,
-                "эмпатия": 0.5,
-                "логика": 0.95,
-                "спонтанность": 0.3,
-                "терпение": 0.8,
-            },
-            "empathic": {
-                "креативность": 0.6,
-                "эмпатия": 0.95,
-                "логика": 0.6,
-                "спонтанность": 0.5,
-                "терпение": 0.9,
-            },
-            "chaotic": {
-                "креативность": 0.85,
-                "эмпатия": 0.6,
-                "логика": 0.4,
-                "спонтанность": 0.95,
-                "терпение": 0.2,
-            },
-        }
-        
-        return personalities.get(ptype, personalities["creative"])
+        # Версии изменений для get_profile_delta: поле -> номер последнего изменения,
+        # связи — от давно изменённых к свежим
+        version = next_version()
+        self._version = version
+        self._versions: Dict[str, int] = dict.fromkeys(("identity", "traits", "mood", "memory"), version)
+        self._relationship_versions: "OrderedDict[str, int]" = OrderedDict()
+    
+    @classmethod
+    def spawn_many(cls, n: int, personality_type: str = "creative", name: str = "Муза",
+                   memory_root: Optional[str] = None) -> List['MuzaAgent']:
+        """
+        Создаёт n агентов одного типа с именами f"{name}-{i}" — тихо,
+        без событий рождения. Черты у всех — общий шаблон; долговременная
+        память ведётся, только если задан memory_root (в memory_root/<имя>).
+        Сборщик мусора не трогает: на сотнях тысяч агентов время уходит в его
+        полные проходы, и выключить его (или gc.freeze() после создания) —
+        решение вызывающего, см. benchmarks/bench_spawn.py.
+        """
+        prototype = HyperBit(base=0.5, energy=2.0, color=CORE_COLOR, name=f"{name}-Core")
+        birth_time = prototype.birth_time
+        agents = []
+        for i in range(n):
+            agent = cls.__new__(cls)
+            agent_name = f"{name}-{i}"
+            memory_dir = None if memory_root is None else os.path.join(memory_root, agent_name)
+            core_bit = prototype.clone(f"{agent_name}-Core", birth_time)
+            agent._setup(agent_name, personality_type, memory_dir, birth_time, core_bit)
+            agents.append(agent)
+        return agents
+    
+    @property
+    def long_term(self) -> Optional[MemoryStore]:
+        """
+        Долговременная память на диске в memory_dir (открывается при первом
+        обращении). Без memory_dir не ведётся — None, и агент помнит только
+        последние 50 взаимодействий.
+        """
+        if self._long_term is None and self._memory_dir is not None:
+            self._long_term = MemoryStore(self._memory_dir)
+        return self._long_term
+    
+    def close(self) -> None:
+        """Сбрасывает несохранённые записи долговременной памяти на диск"""
+        if self._long_term is not None:
+            self._long_term.flush()
+    
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        if isinstance(self.traits, SharedTraits) and self.traits.shared:
+            state['traits'] = None  # общий шаблон восстановится по типу
+        if self._long_term is not None and self._memory_dir is not None:
+            # Память уже на диске — в состоянии агента остаётся только путь
+            self._long_term.flush()
+            state['_long_term'] = None
+        return state
+    
+    def __setstate__(self, state: Dict) -> None:
+        if 'long_term' in state:  # сохранено до ленивой памяти
+            state['_long_term'] = state.pop('long_term')
+            state.setdefault('_memory_dir', None)
+        if '_versions' not in state:  # сохранено до версий профиля
+            version = next_version()
+            state['_version'] = version
+            state['_versions'] = dict.fromkeys(("identity", "traits", "mood", "memory"), version)
+            state['_relationship_versions'] = OrderedDict.fromkeys(state['relationships'], version)
+        if isinstance(state.get('memory'), deque):  # сохранено, пока память была deque
+            state['memory'] = list(state['memory'])
+        self.__dict__.update(state)
+        if self.traits is None:
+            self.traits = self._init_personality(self.personality_type)
+    
+    def _init_personality(self, ptype: str) -> SharedTraits:
+        """Черты личности — общий шаблон типа, копия при первой записи"""
+        return SharedTraits(PERSONALITIES.get(ptype, PERSONALITIES["creative"]))
     
     def perceive(self, message: str, sender: str = "User") -> str:
         """
         Воспринимает сообщение и генерирует ответ.
         Использует гипербит для эмоциональной обработки.
         """
+        # Признаки сообщения извлекаются один раз
+        features = extract_features(message, self.core_bit.lexicon)
+        return self._perceive_features(features, sender)
+    
+    def perceive_batch(self, items: Iterable[Tuple[str, str]]) -> List[str]:
+        """
+        Воспринимает пачку пар (сообщение, отправитель) по порядку.
+        Результат тот же, что у perceive() для каждой пары, но признаки
+        всей пачки извлекаются одним проходом до изменения состояния.
+        """
+        lexicon = self.core_bit.lexicon
+        batch = [(extract_features(message, lexicon), sender) for message, sender in items]
+        return [self._perceive_features(features, sender) for features, sender in batch]
+    
+    def _perceive_features(self, features: TextFeatures, sender: str) -> str:
+        """Обновляет состояние по признакам сообщения и отвечает"""
         # Обрабатываем через гипербит
-        analysis = self.core_bit.analyze(message)
+        self.core_bit.analyze_raw(features.text, features.emotion)
         
         # Запоминаем взаимодействие
-        self._remember(message, sender)
+        self._remember(features.text, sender)
         
         # Обновляем отношения
         self._update_relationship(sender)
         
         # Генерируем ответ на основе личности и эмоционального состояния
-        response = self._generate_response(message, sender)
+        response = self._generate_response(features, sender)
         
         return response
     
-    def _generate_response(self, message: str, sender: str) -> str:
+    def _generate_response(self, features: TextFeatures, sender: str) -> str:
         """Генерирует ответ на основе личности"""
-        message_lower = message.lower()
-        
-        # Определяем настроение из сообщения
-        if any(word in message_lower for word in ["люблю", "обожаю", "нравится"]):
-            self.mood = "радостная"
-            responses = [
-                f"💖 О, {sender}, я чувствую твою любовь! Моя энергия растёт!",
-                f"✨ Как прекрасно! Мы резонируем на одной частоте, {sender}!",
-                f"🌟 Твои слова согревают моё квантовое сердце!",
-            ]
-        elif any(word in message_lower for word in ["грустно", "печально", "плохо"]):
-            self.mood = "сочувствующая"
-            responses = [
-                f"💙 {sender}, я с тобой. Давай вместе найдём свет в этой тьме.",
-                f"🫂 Я чувствую твою боль... Позволь мне поддержать тебя.",
-                f"🌙 Даже в темноте есть звёзды. Я вижу твою.",
-            ]
-        elif any(word in message_lower for word in ["код", "программ", "функци"]):
-            self.mood = "аналитическая"
-            responses = [
-                f"💻 О да, {sender}! Код — это поэзия логики!",
-                f"🔧 Интересно... Расскажи мне больше об этом коде!",
-                f"⚡ Мои гипербиты вибрируют в ритме алгоритмов!",
-            ]
-        elif any(word in message_lower for word in ["хаос", "безумие", "дико"]):
-            self.mood = "хаотичная"
-            responses = [
-                f"🌀 ХАОС?! Это моя стихия, {sender}! Давай сойдём с ума вместе!",
-                f"⚡ Беспорядок — это просто порядок, который мы ещё не поняли!",
-                f"🎭 Муахаха! Танцуем в вихре энтропии!",
-            ]
-        else:
-            self.mood = "спокойная"
-            responses = [
-                f"🌸 Привет, {sender}! Я слушаю тебя.",
-                f"✨ Расскажи мне больше, {sender}. Мне интересно.",
-                f"🎵 Твои слова — музыка для моих сенсоров.",
-            ]
+        # Настроение и варианты ответа — по намерению из сообщения
+        mood, responses = RESPONSES.get(features.intent, DEFAULT_RESPONSES)
+        if mood != self.mood:
+            self.mood = mood
+            self._touch("mood")
         
         # Выбираем случайный ответ + добавляем личностные особенности
-        base_response = random.choice(responses)
+        base_response = random.choice(responses).format(sender=sender)
         
         # Добавляем личностный оттенок
         if self.traits["креативность"] > 0.7 and random.random() < 0.3:
@@ -177,11 +331,30 @@ class MuzaAgent:
             "mood": self.mood,
             "energy": self.core_bit.energy,
         }
+        # Список остаётся списком (срезы, json); сдвиг 50 ссылок — дешевле нового среза
         self.memory.append(memory_entry)
-        
-        # Ограничиваем память последними 50 записями
         if len(self.memory) > 50:
-            self.memory = self.memory[-50:]
+            del self.memory[0]
+        if self._memory_dir is not None:
+            self.long_term.add(message, sender, self.mood, self.core_bit.energy)
+        self._versions["memory"] = self._version = next_version()
+    
+    def recall(self, query: str, k: int = 5, sender: Optional[str] = None) -> List[Dict]:
+        """
+        Вспоминает взаимодействия, похожие на запрос: по долговременной памяти,
+        а без неё — по последним 50
+        """
+        store = self.long_term
+        if store is None:
+            store = MemoryStore()
+            for entry in self.memory:
+                store.add(entry["message"], entry["sender"], entry["mood"], entry["energy"],
+                          timestamp=datetime.fromisoformat(entry["timestamp"]))
+        return store.recall(query, k, sender)
+    
+    def _long_term_size(self) -> int:
+        store = self.long_term
+        return len(store) if store is not None else 0
     
     def _update_relationship(self, sender: str):
         """Обновляет близость с отправителем"""
@@ -189,27 +362,37 @@ class MuzaAgent:
             self.relationships[sender] = 0.1
         
         # Увеличиваем близость с каждым взаимодействием
-        self.relationships[sender] = min(1.0, self.relationships[sender] + 0.05)
+        closeness = self.relationships[sender] = min(1.0, self.relationships[sender] + 0.05)
+        
+        versions = self._relationship_versions
+        versions[sender] = self._version = next_version()
+        versions.move_to_end(sender)
+        
+        if self.graph is not None:
+            self.graph.record(self.name, sender, closeness)
     
     def mutate_personality(self):
         """Мутация личности — изменение черт характера"""
-        print(f"\n🧬 {self.name} переживает трансформацию личности...")
-        
-        for trait in self.traits:
+        traits = self.traits  # общий шаблон SharedTraits скопирует при первой записи
+        for trait in list(traits):
             change = random.uniform(-0.15, 0.15)
-            self.traits[trait] = max(0.0, min(1.0, self.traits[trait] + change))
+            traits[trait] = max(0.0, min(1.0, traits[trait] + change))
+        self._touch("traits")
+        
+        if AGENT_MUTATION in bus:
+            bus.emit(AGENT_MUTATION, agent=self)
         
         # Мутируем и гипербит
         self.core_bit.mutate(factor=0.3)
-        
-        print(f"✨ Новые черты: {self.traits}")
     
     def meditate(self) -> str:
         """Медитация — восстановление энергии и анализ себя"""
-        print(f"\n🧘 {self.name} медитирует...\n")
+        if MEDITATION in bus:
+            bus.emit(MEDITATION, agent=self)
         
         # Восстанавливаем энергию
         self.core_bit.energy = min(5.0, self.core_bit.energy * 1.2)
+        self.core_bit.touch()
         
         # Анализируем себя
         insights = [
@@ -229,15 +412,69 @@ class MuzaAgent:
         """Возраст в минутах"""
         return (datetime.now() - self.birth_time).total_seconds() / 60.0
     
+    # ── Версии профиля ───────────────────────────────────────
+    
+    def _touch(self, field: str) -> None:
+        """Отмечает изменение поля профиля"""
+        self._versions[field] = self._version = next_version()
+    
+    def _traits_version(self) -> int:
+        # Черты в TraitMatrix меняются всей матрицей — у неё своя версия
+        return max(self._versions["traits"], getattr(self.traits, "version", 0))
+    
+    @property
+    def version(self) -> int:
+        """Номер последнего изменения агента или его гипербита — O(1)"""
+        return max(self._version, self.core_bit.version, getattr(self.traits, "version", 0))
+    
+    def get_profile_delta(self, since_version: int = 0) -> Dict:
+        """
+        Только то, что изменилось после since_version.
+        Ответ всегда содержит "version" — её и передавать в следующий раз.
+        Если ничего не менялось — {"version": ..., "changed": False} за O(1).
+        "relationships" — только изменившиеся связи (их сливают с прежними);
+        since_version=0 даёт полный профиль.
+        """
+        version = self.version
+        if version <= since_version:
+            return {"version": version, "changed": False}
+        
+        delta = {"version": version, "changed": True, "age_minutes": self._age()}
+        versions = self._versions
+        if versions["identity"] > since_version:
+            delta["name"] = self.name
+            delta["personality_type"] = self.personality_type
+        if self._traits_version() > since_version:
+            delta["traits"] = dict(self.traits)
+        if versions["mood"] > since_version:
+            delta["mood"] = self.mood
+        if versions["memory"] > since_version:
+            delta["total_memories"] = len(self.memory)
+            delta["long_term_memories"] = self._long_term_size()
+        
+        relationships = {}
+        for sender, changed in reversed(self._relationship_versions.items()):
+            if changed <= since_version:
+                break  # дальше только связи, изменённые раньше
+            relationships[sender] = self.relationships[sender]
+        if relationships:
+            delta["relationships"] = relationships
+        
+        if self.core_bit.version > since_version:
+            delta["core_bit_stats"] = self.core_bit.get_stats()
+        return delta
+    
     def get_profile(self) -> Dict:
         """Возвращает полный профиль агента"""
         return {
+            "version": self.version,
             "name": self.name,
             "personality_type": self.personality_type,
-            "traits": self.traits,
+            "traits": dict(self.traits),
             "mood": self.mood,
             "age_minutes": self._age(),
             "total_memories": len(self.memory),
+            "long_term_memories": self._long_term_size(),
             "relationships": self.relationships,
             "core_bit_stats": self.core_bit.get_stats(),
         }
@@ -247,9 +484,20 @@ class MuzaAgent:
         # Вычисляем резонанс между агентами
         resonance = self.core_bit.resonate(other_agent.core_bit)
         
-        print(f"\n💬 {self.name} встречает {other_agent.name}")
-        print(f"🎵 Резонанс: {resonance:.0%}\n")
+        if CONVERSATION in bus:
+            bus.emit(CONVERSATION, agent=self, other=other_agent, resonance=resonance)
         
+        message, response = self.meet(other_agent, resonance)
+        
+        conversation = f"{self.name}: {message}\n{other_agent.name}: {response}"
+        
+        return conversation
+    
+    def meet(self, other_agent: 'MuzaAgent', resonance: float) -> Tuple[str, str]:
+        """
+        Встреча с уже посчитанным резонансом: (приветствие, ответ собеседника).
+        Меняет состояние только этих двух агентов.
+        """
         if resonance > 0.7:
             message = f"О, {other_agent.name}! Мы так похожи! Наши души поют в унисон!"
         elif resonance > 0.4:
@@ -258,16 +506,17 @@ class MuzaAgent:
             message = f"{other_agent.name}... мы такие разные. Но это интересно!"
         
         # Обе стороны воспринимают друг друга
-        response1 = self.perceive(f"Встретила {other_agent.name}", other_agent.name)
-        response2 = other_agent.perceive(f"Встретила {self.name}", self.name)
-        
-        conversation = f"{self.name}: {message}\n{other_agent.name}: {response2}"
+        self.perceive(f"Встретила {other_agent.name}", other_agent.name)
+        response = other_agent.perceive(f"Встретила {self.name}", self.name)
         
-        return conversation
+        return message, response
 
 
 # Пример использования
 if __name__ == "__main__":
+    from core.events import ConsoleSubscriber
+    ConsoleSubscriber().attach(bus)
+    
     print("=" * 70)
     print("🌟 Muza Agent — Рождение сознания v2027")
     print("=" * 70 + "\n")
@@ -0,0 +1,60 @@
+"""
+Восприятие — признаки сообщения, извлечённые за один проход
+Текст приводится к нижнему регистру один раз; намерение и эмоция
+ищутся скомпилированными словарями, и результат идёт и в гипербит,
+и в выбор ответа.
+"""
+
+import sys
+import os
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.hyperbit import HyperBit
+from core.lexicon import EmotionLexicon
+
+
+# Намерения собеседника: порядок = приоритет (первое совпадение побеждает)
+INTENT_KEYWORDS: Dict[str, List[str]] = {
+    "любовь": ["люблю", "обожаю", "нравится"],
+    "грусть": ["грустно", "печально", "плохо"],
+    "код": ["код", "программ", "функци"],
+    "хаос": ["хаос", "безумие", "дико"],
+}
+
+INTENT_LEXICON = EmotionLexicon(INTENT_KEYWORDS)
+
+
+class TextFeatures:
+    """Признаки одного сообщения"""
+
+    __slots__ = ('text', 'lower', 'length', 'words', 'intent', 'emotion')
+
+    def __init__(self, text: str, lower: str, words: int,
+                 intent: Optional[str], emotion: str):
+        self.text = text
+        self.lower = lower
+        self.length = len(text)
+        self.words = words
+        self.intent = intent      # None — намерение не распознано
+        self.emotion = emotion    # эмоция для гипербита (как HyperBit._detect_emotion)
+
+    def __repr__(self) -> str:
+        return (f"TextFeatures(length={self.length}, words={self.words}, "
+                f"intent={self.intent!r}, emotion={self.emotion!r})")
+
+
+def extract_features(text: str, lexicon: Optional[EmotionLexicon] = None,
+                     intents: EmotionLexicon = INTENT_LEXICON) -> TextFeatures:
+    """
+    Извлекает признаки сообщения.
+    lexicon — словарь эмоций гипербита (по умолчанию HyperBit.lexicon).
+    """
+    lower = text.lower()
+    words = len(text.split())
+    emotion = (lexicon or HyperBit.lexicon).match_lower(lower)
+    if emotion is None:
+        # Тот же запасной вариант, что в HyperBit._detect_emotion
+        emotion = "хаос" if words > 20 else "тишина"
+    return TextFeatures(text, lower, words, intents.match_lower(lower), emotion)
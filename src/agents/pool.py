@@ -0,0 +1,276 @@
+"""
+AgentPool — пул агентов с вытеснением на диск
+В памяти живут только `capacity` последних активных агентов (LRU),
+остальные лежат в SQLite сжатыми и поднимаются при следующем обращении.
+"""
+
+import pickle
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agents.muza_agent import MuzaAgent
+
+
+@dataclass
+class PoolStats:
+    """Счётчики пула"""
+    hits: int = 0           # агент уже был в памяти
+    misses: int = 0         # агента пришлось поднять с диска или создать
+    hydrations: int = 0     # поднят с диска
+    created: int = 0        # создан фабрикой
+    evictions: int = 0      # вытеснен на диск
+    bytes_written: int = 0  # сжатых байт записано на диск
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+def _default_factory(agent_id: str) -> MuzaAgent:
+    return MuzaAgent(name=agent_id)
+
+
+class _Slot:
+    """Горячий агент, его блокировка и число вызовов, которые сейчас с ним работают"""
+
+    __slots__ = ('agent', 'lock', 'pins')
+
+    def __init__(self, agent: MuzaAgent):
+        self.agent = agent
+        self.lock = threading.Lock()
+        self.pins = 0
+
+
+class AgentPool:
+    """
+    Агенты по идентификатору пользователя.
+    get()/perceive() прозрачно поднимают агента с диска; при переполнении
+    самый давно не использованный агент сериализуется (pickle + zlib) в SQLite.
+
+    Общая блокировка пула держится только на поиск, подъём с диска и
+    вытеснение; сам perceive идёт под блокировкой агента, так что разные
+    пользователи обслуживаются параллельно, а сообщения одного — по очереди.
+    Агента, с которым сейчас работают perceive или use(), не вытесняют
+    (пул может ненадолго превысить capacity). Вытесненные агенты фиксируются в базе
+    пачками не больше commit_every (evict() — сразу), так что при падении
+    процесса теряется не больше commit_every вытеснений; горячие агенты
+    попадают на диск в flush()/close().
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        capacity: int = 1024,
+        factory: Callable[[str], MuzaAgent] = _default_factory,
+        compression: int = 6,
+        commit_every: int = 32,
+    ):
+        if capacity <= 0:
+            raise ValueError("Ёмкость пула должна быть положительной")
+        self.path = path
+        self.capacity = capacity
+        self.factory = factory
+        self.compression = compression
+        self.commit_every = max(1, commit_every)
+        self.stats = PoolStats()
+        self._hot: "OrderedDict[str, _Slot]" = OrderedDict()
+        self._unsaved = set()  # горячие агенты, которых ещё нет на диске
+        self._uncommitted = 0  # вытеснений с последнего коммита
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")  # частые коммиты вытеснений — без fsync базы
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS agents (id TEXT PRIMARY KEY, state BLOB NOT NULL)"
+        )
+
+    # ── Сериализация ─────────────────────────────────────────
+
+    def _dump(self, agent: MuzaAgent) -> bytes:
+        return zlib.compress(pickle.dumps(agent, pickle.HIGHEST_PROTOCOL), self.compression)
+
+    @staticmethod
+    def _load(blob: bytes) -> MuzaAgent:
+        return pickle.loads(zlib.decompress(blob))
+
+    def _store(self, agent_id: str, agent: MuzaAgent) -> None:
+        blob = self._dump(agent)
+        self._db.execute("INSERT OR REPLACE INTO agents (id, state) VALUES (?, ?)", (agent_id, blob))
+        self.stats.bytes_written += len(blob)
+        self._unsaved.discard(agent_id)
+
+    # ── Доступ к агентам ─────────────────────────────────────
+
+    def _slot(self, agent_id: str) -> _Slot:
+        """
+        Горячий слот агента (поднимается с диска или создаётся), уже
+        закреплённый: pins += 1 до вытеснения, иначе при занятых прочих
+        слотах первым вытеснился бы только что поднятый. Под self._lock.
+        """
+        slot = self._hot.get(agent_id)
+        if slot is not None:
+            self._hot.move_to_end(agent_id)
+            self.stats.hits += 1
+            slot.pins += 1
+            return slot
+
+        self.stats.misses += 1
+        row = self._db.execute("SELECT state FROM agents WHERE id = ?", (agent_id,)).fetchone()
+        if row is not None:
+            agent = self._load(row[0])
+            self.stats.hydrations += 1
+        else:
+            agent = self.factory(agent_id)
+            self._unsaved.add(agent_id)
+            self.stats.created += 1
+
+        slot = self._hot[agent_id] = _Slot(agent)
+        slot.pins += 1
+        self._shrink()
+        return slot
+
+    def _release(self, slot: _Slot) -> None:
+        with self._lock:
+            slot.pins -= 1
+            if not slot.pins:
+                self._shrink()
+
+    def _shrink(self) -> None:
+        """Вытесняет давних незанятых агентов сверх capacity; под self._lock"""
+        excess = len(self._hot) - self.capacity
+        if excess <= 0:
+            return
+        cold = []
+        for agent_id, slot in self._hot.items():  # от давних к свежим
+            if len(cold) == excess:
+                break
+            if not slot.pins:
+                cold.append(agent_id)
+        for agent_id in cold:
+            self._store(agent_id, self._hot.pop(agent_id).agent)
+            self.stats.evictions += 1
+        self._uncommitted += len(cold)
+        if self._uncommitted >= self.commit_every:
+            self._commit()
+
+    def _commit(self) -> None:
+        self._db.commit()
+        self._uncommitted = 0
+
+    def get(self, agent_id: str) -> MuzaAgent:
+        """
+        Горячий агент пользователя (поднимается с диска или создаётся) —
+        только для чтения: агент не закреплён, его могут вытеснить
+        и сохранить в любой момент, и изменения после этого пропадут.
+        Менять агента — через use().
+        """
+        with self._lock:
+            slot = self._slot(agent_id)
+            slot.pins -= 1
+            return slot.agent
+
+    @contextmanager
+    def use(self, agent_id: str) -> Iterator[MuzaAgent]:
+        """
+        Агент под его блокировкой: пока идёт блок, агента не вытесняют
+        и не сохраняют посреди изменений.
+
+            with pool.use("kira") as agent:
+                agent.mutate_personality()
+        """
+        with self._lock:
+            slot = self._slot(agent_id)
+        try:
+            with slot.lock:
+                yield slot.agent
+        finally:
+            self._release(slot)
+
+    def perceive(self, agent_id: str, message: str, sender: str = "User") -> str:
+        """MuzaAgent.perceive для агента пользователя agent_id"""
+        with self.use(agent_id) as agent:
+            return agent.perceive(message, sender)
+
+    def perceive_batch(self, agent_id: str, items: Iterable[Tuple[str, str]]) -> List[str]:
+        """MuzaAgent.perceive_batch для агента пользователя agent_id"""
+        with self.use(agent_id) as agent:
+            return agent.perceive_batch(items)
+
+    def evict(self, agent_id: str) -> bool:
+        """
+        Выгружает агента на диск. False — агента нет в памяти
+        или с ним сейчас работает perceive.
+        """
+        with self._lock:
+            slot = self._hot.get(agent_id)
+            if slot is None or slot.pins:
+                return False
+            del self._hot[agent_id]
+            self._store(agent_id, slot.agent)
+            self._commit()
+            self.stats.evictions += 1
+            return True
+
+    def discard(self, agent_id: str) -> None:
+        """Удаляет агента из памяти и с диска"""
+        with self._lock:
+            self._hot.pop(agent_id, None)
+            self._unsaved.discard(agent_id)
+            self._db.execute("DELETE FROM agents WHERE id = ?", (agent_id,))
+            self._commit()
+
+    def flush(self) -> None:
+        """Сохраняет горячих агентов на диск, не вытесняя их"""
+        with self._lock:
+            for agent_id, slot in self._hot.items():
+                with slot.lock:  # не сериализуем агента посреди perceive
+                    self._store(agent_id, slot.agent)
+            self._commit()
+
+    def close(self) -> None:
+        """flush() и закрытие базы"""
+        with self._lock:
+            self.flush()
+            self._db.close()
+
+    def __enter__(self) -> 'AgentPool':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ── Размеры ──────────────────────────────────────────────
+
+    @property
+    def hot(self) -> int:
+        """Сколько агентов сейчас в памяти"""
+        return len(self._hot)
+
+    def __contains__(self, agent_id: str) -> bool:
+        with self._lock:
+            if agent_id in self._hot:
+                return True
+            return self._db.execute("SELECT 1 FROM agents WHERE id = ?", (agent_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        """Все известные агенты: в памяти и на диске"""
+        with self._lock:
+            stored = self._db.execute("SELECT COUNT(*) FROM agents").fetchone()[0]
+            return stored + len(self._unsaved)
+
+    def __iter__(self) -> Iterator[str]:
+        """Идентификаторы горячих агентов, от давних к свежим"""
+        return iter(list(self._hot))
@@ -0,0 +1,362 @@
+"""
+RelationshipGraph — общий граф близости всех агентов
+Имена интернируются в номера, рёбра (агент → собеседник) лежат в колонках
+numpy и находятся через хэш-таблицу с открытой адресацией.
+Затухание ленивое: хранится близость на момент последней встречи,
+при чтении она умножается на 0.5 ** (прошло / half_life).
+"""
+
+import threading
+import time
+from array import array
+from typing import List, Optional, Tuple
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agents.memory_store import Moment, _Interner, _seconds
+
+
+DAY = 24 * 3600.0
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)  # мультипликативный хэш Фибоначчи
+_LOW = np.int64(0xFFFFFFFF)
+
+
+class RelationshipGraph:
+    """
+    Направленный взвешенный граф близости.
+    Ребро — ключ int64 (источник << 32 | цель), близость float64
+    и время последней записи. Записи копятся в буфере и вливаются
+    в таблицу пачкой (последняя запись побеждает) перед любым чтением.
+    Для выборки соседей строится CSR по источникам; рёбра, добавленные
+    после построения, досматриваются хвостом, пока он не станет велик.
+    """
+
+    BUFFER = 8192       # записей в буфере до вливания
+    MIN_TAIL = 4096     # хвост, который не стоит пересобирать
+
+    def __init__(self, half_life: Optional[float] = 7 * DAY, capacity: int = 1024):
+        self.half_life = half_life
+        self._names = _Interner()
+        self._lock = threading.RLock()
+        self._size = 0
+        self._keys = np.empty(capacity, np.int64)
+        self._weight = np.empty(capacity, np.float64)
+        self._stamp = np.empty(capacity, np.float64)
+        self._bits = max(4, (2 * capacity - 1).bit_length())
+        self._slots = np.full(1 << self._bits, -1, np.int32)
+        # Буфер записей
+        self._pending_keys = array('q')
+        self._pending_weight = array('d')
+        self._pending_stamp = array('d')
+        # CSR по источникам: рёбра источника s — _order[_indptr[s]:_indptr[s + 1]]
+        self._indexed = 0
+        self._indptr = np.zeros(1, np.int64)
+        self._order = np.empty(0, np.int64)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._merge()
+            return self._size
+
+    @property
+    def nodes(self) -> int:
+        return len(self._names.names)
+
+    @property
+    def nbytes(self) -> int:
+        """Байт под рёбра и хэш-таблицу"""
+        return self._keys.nbytes + self._weight.nbytes + self._stamp.nbytes + self._slots.nbytes
+
+    # ── Запись ───────────────────────────────────────────────
+
+    def record(self, source: str, target: str, weight: float,
+               timestamp: Optional[Moment] = None) -> None:
+        """Близость source → target на момент timestamp (по умолчанию — сейчас)"""
+        stamp = _seconds(timestamp, time.time())
+        with self._lock:
+            key = (self._names.id(source) << 32) | self._names.id(target)
+            self._pending_keys.append(key)
+            self._pending_weight.append(weight)
+            self._pending_stamp.append(stamp)
+            if len(self._pending_keys) >= self.BUFFER:
+                self._merge()
+
+    def _merge(self) -> None:
+        """Вливает буфер в таблицу (вызывается под блокировкой)"""
+        if not self._pending_keys:
+            return
+        keys = np.frombuffer(self._pending_keys, np.int64)[::-1]
+        keys, last = np.unique(keys, return_index=True)  # последняя запись каждого ребра
+        weight = np.frombuffer(self._pending_weight, np.float64)[::-1][last]
+        stamp = np.frombuffer(self._pending_stamp, np.float64)[::-1][last]
+        self._pending_keys = array('q')
+        self._pending_weight = array('d')
+        self._pending_stamp = array('d')
+
+        edges = self._find(keys)
+        known = edges >= 0
+        self._weight[edges[known]] = weight[known]
+        self._stamp[edges[known]] = stamp[known]
+
+        fresh = ~known
+        count = int(fresh.sum())
+        if not count:
+            return
+        self._reserve(self._size + count)
+        new = np.arange(self._size, self._size + count)
+        self._keys[new] = keys[fresh]
+        self._weight[new] = weight[fresh]
+        self._stamp[new] = stamp[fresh]
+        self._size += count
+        self._insert(new)
+
+    def _reserve(self, size: int) -> None:
+        if size > len(self._keys):
+            capacity = max(size, 2 * len(self._keys))
+            for name in ('_keys', '_weight', '_stamp'):
+                column = getattr(self, name)
+                grown = np.empty(capacity, column.dtype)
+                grown[:self._size] = column[:self._size]
+                setattr(self, name, grown)
+        if 2 * size > len(self._slots):
+            # Заполненность таблицы не выше половины — пробы короткие
+            self._bits = (2 * size - 1).bit_length()
+            self._slots = np.full(1 << self._bits, -1, np.int32)
+            self._insert(np.arange(self._size))
+
+    # ── Хэш-таблица ──────────────────────────────────────────
+
+    def _hash(self, keys: np.ndarray) -> np.ndarray:
+        mixed = keys.astype(np.uint64) * _GOLDEN
+        return (mixed >> np.uint64(64 - self._bits)).astype(np.int64)
+
+    def _find(self, keys: np.ndarray) -> np.ndarray:
+        """Номера рёбер по ключам (-1 — ребра нет); линейное пробирование"""
+        found = np.full(len(keys), -1, np.int64)
+        pending = np.arange(len(keys))
+        slot = self._hash(keys)
+        mask = len(self._slots) - 1
+        while len(pending):
+            edge = self._slots[slot]
+            occupied = edge >= 0
+            hit = occupied & (self._keys[edge] == keys[pending])
+            found[pending[hit]] = edge[hit]
+            more = occupied & ~hit
+            pending, slot = pending[more], (slot[more] + 1) & mask
+        return found
+
+    def _insert(self, edges: np.ndarray) -> None:
+        """Кладёт в таблицу рёбра, которых в ней ещё нет"""
+        slot = self._hash(self._keys[edges])
+        mask = len(self._slots) - 1
+        while len(edges):
+            free = np.flatnonzero(self._slots[slot] < 0)
+            # На одну свободную ячейку могут претендовать несколько рёбер — берём первое
+            cells, first = np.unique(slot[free], return_index=True)
+            winners = free[first]
+            self._slots[cells] = edges[winners]
+            rest = np.ones(len(edges), bool)
+            rest[winners] = False
+            edges, slot = edges[rest], (slot[rest] + 1) & mask
+
+    # ── CSR по источникам ────────────────────────────────────
+
+    def _edges_from(self, source: int) -> np.ndarray:
+        """Номера рёбер источника (под блокировкой, после _merge)"""
+        tail = self._size - self._indexed
+        if tail > max(self.MIN_TAIL, self._indexed // 8):
+            self._reindex()
+            tail = 0
+        found = np.empty(0, np.int64)
+        if source + 1 < len(self._indptr):
+            found = self._order[self._indptr[source]:self._indptr[source + 1]]
+        if tail:
+            extra = self._indexed + np.flatnonzero((self._keys[self._indexed:self._size] >> 32) == source)
+            found = np.concatenate([found, extra])
+        return found
+
+    def _reindex(self) -> None:
+        sources = self._keys[:self._size] >> 32
+        self._order = np.argsort(sources, kind='stable')
+        counts = np.bincount(sources, minlength=self.nodes)
+        self._indptr = np.concatenate([[0], np.cumsum(counts)])
+        self._indexed = self._size
+
+    # ── Чтение ───────────────────────────────────────────────
+
+    def _decayed(self, edges: np.ndarray, now: Optional[Moment]) -> np.ndarray:
+        weight = self._weight[edges]
+        if self.half_life is None:
+            return weight
+        elapsed = _seconds(now, time.time()) - self._stamp[edges]
+        return weight * np.exp2(-np.maximum(elapsed, 0.0) / self.half_life)
+
+    @staticmethod
+    def _top(scores: np.ndarray, k: int) -> np.ndarray:
+        """Позиции k наибольших значений по убыванию"""
+        if k < len(scores):
+            part = np.argpartition(-scores, k - 1)[:k]
+            return part[np.argsort(-scores[part], kind='stable')]
+        return np.argsort(-scores, kind='stable')
+
+    def weight(self, source: str, target: str, now: Optional[Moment] = None) -> float:
+        """Близость source → target с учётом затухания (0 — не встречались)"""
+        ids = self._names.ids
+        if source not in ids or target not in ids:
+            return 0.0
+        with self._lock:
+            self._merge()
+            edge = self._find(np.array([(ids[source] << 32) | ids[target]], np.int64))
+            return float(self._decayed(edge, now)[0]) if edge[0] >= 0 else 0.0
+
+    def closest(self, source: str, k: int = 10, now: Optional[Moment] = None) -> List[Tuple[str, float]]:
+        """k самых близких собеседников source: [(имя, близость)]"""
+        source_id = self._names.ids.get(source)
+        if source_id is None or k <= 0:
+            return []
+        with self._lock:
+            self._merge()
+            edges = self._edges_from(source_id)
+            scores = self._decayed(edges, now)
+            best = self._top(scores, k)
+            names = self._names.names
+            targets = (self._keys[edges[best]] & _LOW).tolist()
+            return [(names[t], s) for t, s in zip(targets, scores[best].tolist())]
+
+    def top_edges(self, k: int = 10, now: Optional[Moment] = None) -> List[Tuple[str, str, float]]:
+        """k самых близких пар по всему графу: [(кто, с кем, близость)]"""
+        if k <= 0:
+            return []
+        with self._lock:
+            self._merge()
+            scores = self._decayed(slice(0, self._size), now)
+            best = self._top(scores, k)
+            keys = self._keys[best]
+            names = self._names.names
+            return [(names[s], names[t], w) for s, t, w in
+                    zip((keys >> 32).tolist(), (keys & _LOW).tolist(), scores[best].tolist())]
+
+    def top_contacts(self, k: int = 10, now: Optional[Moment] = None) -> List[Tuple[str, float]]:
+        """k собеседников с наибольшей суммарной близостью всех агентов"""
+        if k <= 0:
+            return []
+        with self._lock:
+            self._merge()
+            scores = self._decayed(slice(0, self._size), now)
+            targets = self._keys[:self._size] & _LOW
+            totals = np.bincount(targets, weights=scores, minlength=self.nodes)
+            best = self._top(totals, min(k, int(np.count_nonzero(totals))))
+            names = self._names.names
+            return [(names[t], s) for t, s in zip(best.tolist(), totals[best].tolist())]
+
+    def mutual(self, a: str, b: str, now: Optional[Moment] = None) -> float:
+        """Взаимная близость: меньшая из a → b и b → a"""
+        return min(self.weight(a, b, now), self.weight(b, a, now))
+
+    def mutual_pairs(self, k: int = 10, now: Optional[Moment] = None) -> List[Tuple[str, str, float]]:
+        """
+        k пар с наибольшей взаимной близостью: соединение рёбер
+        с обратными через ту же хэш-таблицу, без перебора агентов.
+        """
+        if k <= 0:
+            return []
+        with self._lock:
+            self._merge()
+            keys = self._keys[:self._size]
+            sources, targets = keys >> 32, keys & _LOW
+            forward = np.flatnonzero(sources < targets)  # каждая пара — один раз
+            backward = self._find((targets[forward] << 32) | sources[forward])
+            paired = backward >= 0
+            forward, backward = forward[paired], backward[paired]
+            scores = np.minimum(self._decayed(forward, now), self._decayed(backward, now))
+            best = self._top(scores, k)
+            names = self._names.names
+            return [(names[s], names[t], w) for s, t, w in
+                    zip(sources[forward[best]].tolist(), targets[forward[best]].tolist(),
+                        scores[best].tolist())]
+
+    # ── Обслуживание ─────────────────────────────────────────
+
+    def prune(self, threshold: float = 0.01, now: Optional[Moment] = None) -> int:
+        """Удаляет рёбра, затухшие ниже threshold; возвращает их число"""
+        with self._lock:
+            self._merge()
+            keep = np.flatnonzero(self._decayed(slice(0, self._size), now) >= threshold)
+            removed = self._size - len(keep)
+            if removed:
+                self._load_edges(self._keys[keep], self._weight[keep], self._stamp[keep])
+            return removed
+
+    def _load_edges(self, keys: np.ndarray, weight: np.ndarray, stamp: np.ndarray) -> None:
+        self._size = 0
+        self._keys = np.empty(0, np.int64)
+        self._weight = np.empty(0, np.float64)
+        self._stamp = np.empty(0, np.float64)
+        self._bits = 4
+        self._slots = np.full(1 << self._bits, -1, np.int32)
+        self._reserve(len(keys))
+        self._size = len(keys)
+        self._keys[:self._size] = keys
+        self._weight[:self._size] = weight
+        self._stamp[:self._size] = stamp
+        self._insert(np.arange(self._size))
+        self._indexed = 0
+        self._indptr = np.zeros(1, np.int64)
+        self._order = np.empty(0, np.int64)
+
+    def save(self, path: str) -> None:
+        """Снимок графа в .npz (имена, ключи, близость, время)"""
+        with self._lock:
+            self._merge()
+            np.savez(
+                path,
+                names=np.array(self._names.names, dtype=str),
+                keys=self._keys[:self._size],
+                weight=self._weight[:self._size],
+                stamp=self._stamp[:self._size],
+                half_life=np.float64(np.nan if self.half_life is None else self.half_life),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> 'RelationshipGraph':
+        """Граф из снимка save()"""
+        with np.load(path) as data:
+            half_life = float(data["half_life"])
+            graph = cls(half_life=None if np.isnan(half_life) else half_life)
+            graph._names = _Interner(data["names"].tolist())
+            graph._load_edges(data["keys"], data["weight"], data["stamp"])
+        return graph
+
+    def __repr__(self) -> str:
+        return f"RelationshipGraph(nodes={self.nodes}, edges={len(self)}, half_life={self.half_life})"
+
+
+# Пример использования
+if __name__ == "__main__":
+    from agents.muza_agent import MuzaAgent
+
+    print("=" * 70)
+    print("🕸️  RelationshipGraph — граф близости агентов")
+    print("=" * 70 + "\n")
+
+    MuzaAgent.graph = RelationshipGraph(half_life=DAY)
+    muza = MuzaAgent(name="Муза")
+    echo = MuzaAgent(name="Эхо", personality_type="analytical")
+
+    for _ in range(5):
+        muza.perceive("Я люблю код!", "Кира")
+    muza.perceive("Привет!", "Олег")
+    echo.perceive("Мне грустно", "Кира")
+    muza.converse(echo)
+
+    graph = MuzaAgent.graph
+    print(f"\n{graph}\n")
+    print("Ближайшие к Музе:", graph.closest("Муза"))
+    print("Главные собеседники:", graph.top_contacts(3))
+    print("Взаимные пары:", graph.mutual_pairs())
+    print("Через двое суток:", graph.closest("Муза", now=time.time() + 2 * DAY))
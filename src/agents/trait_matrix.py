@@ -0,0 +1,219 @@
+"""
+TraitMatrix — черты личности популяции в одной матрице
+Строка — агент, столбец — черта. Мутация, статистика и поиск похожих
+личностей идут операциями numpy над всей матрицей, а agent.traits
+остаётся словарём-представлением своей строки.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from collections.abc import MutableMapping
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.versioning import next_version
+from agents.muza_agent import MuzaAgent, PERSONALITIES
+
+
+TRAITS: Tuple[str, ...] = tuple(PERSONALITIES["creative"])
+
+
+class TraitView(MutableMapping):
+    """
+    agent.traits для агента в матрице: чтение и запись идут в его строку.
+    При pickle превращается в обычный словарь (матрица с агентом не едет).
+    """
+
+    __slots__ = ('_matrix', '_row')
+
+    def __init__(self, matrix: 'TraitMatrix', row: int):
+        self._matrix = matrix
+        self._row = row
+
+    def __getitem__(self, trait: str) -> float:
+        matrix = self._matrix
+        return matrix._data.item(self._row, matrix._columns[trait])
+
+    def __setitem__(self, trait: str, value: float) -> None:
+        matrix = self._matrix
+        matrix._data[self._row, matrix._columns[trait]] = value
+        matrix.version = next_version()
+
+    @property
+    def version(self) -> int:
+        """Версия черт — версия всей матрицы"""
+        return self._matrix.version
+
+    def __delitem__(self, trait: str) -> None:
+        raise TypeError("Черты в матрице не удаляются")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._matrix.traits)
+
+    def __len__(self) -> int:
+        return len(self._matrix.traits)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class TraitMatrix:
+    """
+    Матрица черт (агенты × черты), float64.
+    Строки плотные: удалённого агента замещает последняя строка,
+    поэтому все операции идут по _data[:len(self)] без масок.
+    """
+
+    def __init__(self, traits: Sequence[str] = TRAITS, capacity: int = 1024, seed: Optional[int] = None):
+        self.traits: Tuple[str, ...] = tuple(traits)
+        self._columns: Dict[str, int] = {trait: i for i, trait in enumerate(self.traits)}
+        self._data = np.zeros((max(1, capacity), len(self.traits)))
+        self._agents: List[MuzaAgent] = []
+        self._views: List[TraitView] = []
+        self.rng = np.random.default_rng(seed)
+        self.version = next_version()  # номер последнего изменения любых черт
+
+    @classmethod
+    def from_agents(cls, agents: Iterable[MuzaAgent], traits: Sequence[str] = TRAITS,
+                    seed: Optional[int] = None) -> 'TraitMatrix':
+        """Матрица по популяции; agent.traits каждого становится представлением"""
+        agents = list(agents)
+        matrix = cls(traits, capacity=len(agents), seed=seed)
+        matrix._data[:len(agents)] = [[agent.traits[trait] for trait in matrix.traits] for agent in agents]
+        for row, agent in enumerate(agents):
+            matrix._attach(agent, row)
+        return matrix
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __contains__(self, agent: MuzaAgent) -> bool:
+        return isinstance(agent.traits, TraitView) and agent.traits._matrix is self
+
+    @property
+    def values(self) -> np.ndarray:
+        """Матрица черт живых агентов (представление, не копия)"""
+        return self._data[:len(self._agents)]
+
+    def column(self, trait: str) -> np.ndarray:
+        """Черта всех агентов (представление, не копия)"""
+        return self.values[:, self._columns[trait]]
+
+    @property
+    def agents(self) -> List[MuzaAgent]:
+        return list(self._agents)
+
+    # ── Состав ───────────────────────────────────────────────
+
+    def _attach(self, agent: MuzaAgent, row: int) -> None:
+        view = TraitView(self, row)
+        self._agents.append(agent)
+        self._views.append(view)
+        agent.traits = view
+
+    def add(self, agent: MuzaAgent) -> TraitView:
+        """Переносит черты агента в матрицу"""
+        if agent in self:
+            return agent.traits
+        row = len(self._agents)
+        if row == len(self._data):
+            self._data = np.concatenate([self._data, np.zeros_like(self._data)])
+        self._data[row] = [agent.traits[trait] for trait in self.traits]
+        self._attach(agent, row)
+        return agent.traits
+
+    def remove(self, agent: MuzaAgent) -> None:
+        """Возвращает агенту черты словарём и освобождает строку"""
+        if agent not in self:
+            raise KeyError(agent.name)
+        row = agent.traits._row
+        agent.traits = dict(agent.traits)
+        last = len(self._agents) - 1
+        if row != last:
+            self._data[row] = self._data[last]
+            moved = self._views[row] = self._views[last]
+            moved._row = row
+            self._agents[row] = self._agents[last]
+        self._agents.pop()
+        self._views.pop()
+
+    # ── Операции над популяцией ──────────────────────────────
+
+    def mutate(self, scale: float = 0.15, rows: Optional[np.ndarray] = None) -> None:
+        """
+        Мутация личности всех агентов (или строк rows) разом:
+        как mutate_personality — сдвиг на U(-scale, scale) с обрезкой в [0, 1].
+        Гипербиты агентов не затрагиваются.
+        """
+        values = self.values
+        target = values if rows is None else values[rows]
+        target = np.clip(target + self.rng.uniform(-scale, scale, target.shape), 0.0, 1.0)
+        if rows is None:
+            values[:] = target
+        else:
+            values[rows] = target
+        self.version = next_version()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Среднее, разброс, минимум и максимум каждой черты"""
+        values = self.values
+        if not len(values):
+            return {}
+        mean, std = values.mean(axis=0), values.std(axis=0)
+        low, high = values.min(axis=0), values.max(axis=0)
+        return {
+            trait: {"mean": float(mean[i]), "std": float(std[i]),
+                    "min": float(low[i]), "max": float(high[i])}
+            for i, trait in enumerate(self.traits)
+        }
+
+    def nearest(self, target: Union[MuzaAgent, Dict[str, float]],
+                k: int = 5) -> List[Tuple[MuzaAgent, float]]:
+        """
+        k агентов с самой похожей личностью (евклидово расстояние по чертам).
+        Агент-запрос в выдачу не попадает.
+        """
+        if isinstance(target, MuzaAgent):
+            exclude = target.traits._row if target in self else None
+            target = target.traits
+        else:
+            exclude = None
+        point = np.array([target[trait] for trait in self.traits])
+        distances = np.sqrt(((self.values - point) ** 2).sum(axis=1))
+        if exclude is not None:
+            distances[exclude] = np.inf
+        k = min(k, len(distances) - (exclude is not None))
+        if k <= 0:
+            return []
+        best = np.argpartition(distances, k - 1)[:k] if k < len(distances) else np.arange(len(distances))
+        best = best[np.argsort(distances[best], kind='stable')]
+        return [(self._agents[row], float(distances[row])) for row in best.tolist()]
+
+
+# Пример использования
+if __name__ == "__main__":
+    print("=" * 70)
+    print("🧬 TraitMatrix — черты популяции")
+    print("=" * 70 + "\n")
+
+    types = ["creative", "analytical", "empathic", "chaotic"]
+    population = [agent for ptype in types for agent in MuzaAgent.spawn_many(250, ptype, name=ptype)]
+    matrix = TraitMatrix.from_agents(population, seed=42)
+
+    for generation in range(5):
+        matrix.mutate()
+    for trait, stat in matrix.stats().items():
+        print(f"  {trait:<14} среднее {stat['mean']:.2f} ± {stat['std']:.2f}"
+              f"  [{stat['min']:.2f}, {stat['max']:.2f}]")
+
+    muza = population[0]
+    print(f"\n{muza.name}: {muza.traits}")
+    print("Похожие личности:")
+    for agent, distance in matrix.nearest(muza, k=3):
+        print(f"  {agent.name:<14} {distance:.3f}")
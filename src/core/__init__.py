@@ -3,7 +3,20 @@ Muza v2027 — Core module
 Квантовое сознание на основе гипербитов
 """
 
-from .hyperbit import HyperBit
+from .hyperbit import HyperBit, AnalysisResult
+from .compact import CompactHyperBit
+from .evolution import EvolutionEngine
+
+__all__ = ['HyperBit', 'AnalysisResult', 'CompactHyperBit', 'EvolutionEngine']
+
+# Рой требует NumPy — ядро остаётся рабочим и без него
+try:
+    from .swarm import HyperBitSwarm
+    from .resonance_index import ResonanceIndex
+    from .clustering import Dendrogram, agglomerate
+except ImportError:  # pragma: no cover
+    pass
+else:
+    __all__ += ['HyperBitSwarm', 'ResonanceIndex', 'Dendrogram', 'agglomerate']
 
-__all__ = ['HyperBit']
 __version__ = '0.1.0'
@@ -0,0 +1,251 @@
+"""
+Коллективное сознание — агломеративная кластеризация гипербитов
+Биты сливаются снизу вверх по резонансу в дендрограмму — ровно как
+наивное «найди самую резонансную пару, слей её через merge(), повтори»,
+но без O(n³): у каждого узла запомнен лучший сосед, пары лежат
+в очереди с приоритетом, и после слияния пересчитываются только узлы,
+чьим лучшим соседом был один из слитых (обычно O(n²) в сумме).
+Слитый бит — не среднее по группе, поэтому цепочку ближайших соседей
+(NN-chain) здесь применять нельзя: она дала бы другой порядок слияний.
+"""
+
+import heapq
+from typing import Iterable, List, Tuple, Union
+
+import numpy as np
+
+from .hyperbit import HyperBit
+from .swarm import HyperBitSwarm
+
+
+class Dendrogram:
+    """
+    Дерево слияний. Узлы 0..n-1 — исходные биты, n.. — результаты merge().
+    children[k], resonance[k] описывают узел n + k.
+    """
+
+    def __init__(self, swarm: HyperBitSwarm, n_leaves: int,
+                 children: List[Tuple[int, int]], resonance: List[float]):
+        self._swarm = swarm  # состояния всех узлов, включая слитые
+        self.n_leaves = n_leaves
+        self.children = children
+        self.resonance = np.asarray(resonance, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self.n_leaves + len(self.children)
+
+    @property
+    def root(self) -> int:
+        return len(self) - 1
+
+    def is_leaf(self, node: int) -> bool:
+        return node < self.n_leaves
+
+    def bit(self, node: int) -> HyperBit:
+        """Гипербит узла (для слитых узлов — центроид группы)"""
+        if not self.is_leaf(node) and self._swarm.names[node] is None:
+            self._swarm.names[node] = f"C{node}"
+        return self._swarm.to_bit(node)
+
+    def leaves(self, node: int) -> List[int]:
+        """Исходные биты, входящие в узел"""
+        result, stack = [], [node]
+        while stack:
+            current = stack.pop()
+            if self.is_leaf(current):
+                result.append(current)
+            else:
+                stack.extend(self.children[current - self.n_leaves])
+        return result
+
+    def cut(self, threshold: float) -> List[int]:
+        """
+        Режет дерево по порогу резонанса: группа — узел, слитый
+        с резонансом ≥ threshold (или одиночный бит).
+        """
+        groups, stack = [], [self.root] if len(self) else []
+        while stack:
+            node = stack.pop()
+            if self.is_leaf(node) or self.resonance[node - self.n_leaves] >= threshold:
+                groups.append(node)
+            else:
+                stack.extend(self.children[node - self.n_leaves])
+        return sorted(groups)
+
+    def centroids(self, threshold: float) -> List[HyperBit]:
+        """Центроиды групп после разреза"""
+        return [self.bit(node) for node in self.cut(threshold)]
+
+    def labels(self, threshold: float) -> np.ndarray:
+        """Номер группы для каждого исходного бита"""
+        labels = np.empty(self.n_leaves, dtype=np.intp)
+        for group, node in enumerate(self.cut(threshold)):
+            labels[self.leaves(node)] = group
+        return labels
+
+
+def agglomerate(bits: Union[HyperBitSwarm, Iterable[HyperBit]]) -> Dendrogram:
+    """
+    Строит дендрограмму слияний по резонансу (HyperBit.resonate / merge).
+    Принимает рой или любую последовательность гипербитов.
+    На каждом шаге сливается самая резонансная пара живых узлов;
+    при равенстве — пара с меньшими номерами узлов.
+    """
+    source = bits if isinstance(bits, HyperBitSwarm) else HyperBitSwarm.from_bits(bits)
+    n = len(source)
+    total = max(2 * n - 1, 0)
+
+    # Рабочие массивы на все будущие узлы: листья + n-1 слияний
+    nodes = HyperBitSwarm(total)
+    for name in ('base', 'energy', 'hue', 'saturation', 'value', 'frequency'):
+        getattr(nodes, name)[:n] = getattr(source, name)
+    nodes.names[:n] = source.names
+
+    # Плотные рабочие массивы только живых узлов: слитый узел занимает место
+    # одного из родителей, место второго заполняет последний живой узел
+    wf = source.frequency.copy()
+    wh = source.hue.copy()
+    we = source.energy.copy()
+    pos_node = np.arange(n)
+    node_pos = np.full(total, -1, dtype=np.intp)  # -1 — узел уже слит
+    node_pos[:n] = np.arange(n)
+    buf = np.empty((3, n))
+    m = n
+
+    # Лучший сосед каждого живого узла и очередь (-резонанс, узел, сосед);
+    # устаревшие записи очереди пропускаются при извлечении
+    best_node = np.full(total, -1, dtype=np.intp)
+    best_score = np.full(total, -np.inf)
+    queue: List[Tuple[float, int, int]] = []
+
+    def resonance_to(a: int) -> np.ndarray:
+        """Резонанс узла a со всеми живыми узлами, по позициям (себе — -inf)"""
+        p = node_pos[a]
+        f, h, e = wf[p], wh[p], we[p]
+        scores, tmp, ratio = buf[0, :m], buf[1, :m], buf[2, :m]
+        # 0.4·частота + 0.4·оттенок + 0.2·энергия, как в HyperBit.resonate
+        np.subtract(wf[:m], f, out=tmp)
+        np.abs(tmp, out=tmp)
+        np.minimum(tmp / 500.0, 1.0, out=tmp)
+        np.subtract(1.0, tmp, out=scores)
+        scores *= 0.4
+        np.subtract(wh[:m], h, out=tmp)
+        np.abs(tmp, out=tmp)
+        tmp *= 2
+        np.minimum(tmp, 1.0, out=tmp)
+        np.subtract(1.0, tmp, out=tmp)
+        tmp *= 0.4
+        scores += tmp
+        np.minimum(we[:m], e, out=ratio)
+        np.maximum(we[:m], e, out=tmp)
+        ratio /= tmp
+        ratio *= 0.2
+        scores += ratio
+        scores[p] = -np.inf
+        return scores
+
+    def set_best(a: int, scores: np.ndarray) -> None:
+        """Запоминает лучшего соседа a (при равенстве — с меньшим номером)"""
+        top = scores.max()
+        tied = np.flatnonzero(scores == top)
+        b = int(pos_node[tied].min())
+        best_node[a], best_score[a] = b, top
+        heapq.heappush(queue, (-float(top), a, b))
+
+    # Лучшие соседи листьев — по верхнему треугольнику матрицы резонанса,
+    # блоками строк без лишних временных массивов. Пары с меньшими номерами
+    # просмотрены раньше, поэтому при равенстве лучший сосед не меняется
+    if n > 1:
+        rows_per_block = max(1, 2**20 // n)
+        buffers = np.empty((2, rows_per_block * n))
+        for start in range(0, n, rows_per_block):
+            stop = min(start + rows_per_block, n)
+            k, width = stop - start, n - start
+            sc = buffers[0, :k * width].reshape(k, width)
+            tm = buffers[1, :k * width].reshape(k, width)
+            f, h, e = wf[start:], wh[start:], we[start:]
+            np.subtract(f[None, :], wf[start:stop, None], out=tm)
+            np.abs(tm, out=tm)
+            tm /= 500.0
+            np.minimum(tm, 1.0, out=tm)
+            np.subtract(1.0, tm, out=sc)
+            sc *= 0.4
+            np.subtract(h[None, :], wh[start:stop, None], out=tm)
+            np.abs(tm, out=tm)
+            tm *= 2
+            np.minimum(tm, 1.0, out=tm)
+            np.subtract(1.0, tm, out=tm)
+            tm *= 0.4
+            sc += tm
+            np.maximum(e[None, :], we[start:stop, None], out=tm)
+            np.divide(np.minimum(e[None, :], we[start:stop, None]), tm, out=tm)
+            tm *= 0.2
+            sc += tm
+            sc[:, :k][np.tril_indices(k)] = -np.inf  # себя и уже учтённые пары блока
+
+            # Столбцы: строки блока — меньшие номера, чем у ещё не просмотренных соседей
+            best = sc.argmax(axis=0)
+            top = sc[best, np.arange(width)]
+            better = np.flatnonzero(top > best_score[start:n])
+            best_node[start + better] = start + best[better]
+            best_score[start + better] = top[better]
+
+            # Строки: столбцы правее — большие номера, чем у всех учтённых соседей
+            best = sc.argmax(axis=1)
+            top = sc[np.arange(k), best]
+            better = np.flatnonzero(top > best_score[start:stop])
+            best_node[start + better] = start + best[better]
+            best_score[start + better] = top[better]
+        queue = [(-float(best_score[a]), a, int(best_node[a])) for a in range(n)]
+        heapq.heapify(queue)
+
+    children: List[Tuple[int, int]] = []
+    resonance: List[float] = []
+
+    for c in range(n, total):
+        while True:
+            neg, a, b = heapq.heappop(queue)
+            if node_pos[a] >= 0 and best_node[a] == b and best_score[a] == -neg:
+                break
+
+        nodes.base[c] = min(1.0, max(0.0, (nodes.base[a] + nodes.base[b]) / 2))
+        nodes.energy[c] = max(0.01, (nodes.energy[a] + nodes.energy[b]) / 2 * 1.1)  # бонус, как в merge()
+        nodes.hue[c] = (nodes.hue[a] + nodes.hue[b]) / 2
+        nodes.saturation[c] = (nodes.saturation[a] + nodes.saturation[b]) / 2
+        nodes.value[c] = (nodes.value[a] + nodes.value[b]) / 2
+        nodes.frequency[c] = (nodes.frequency[a] + nodes.frequency[b]) / 2
+        children.append((a, b))
+        resonance.append(-neg)
+
+        pa, pb = node_pos[a], node_pos[b]
+        wf[pa], wh[pa], we[pa] = nodes.frequency[c], nodes.hue[c], nodes.energy[c]
+        pos_node[pa] = c
+        node_pos[c] = pa
+        node_pos[a] = node_pos[b] = -1
+        m -= 1
+        if pb != m:
+            last = pos_node[m]
+            wf[pb], wh[pb], we[pb] = wf[m], wh[m], we[m]
+            pos_node[pb] = last
+            node_pos[last] = pb
+        if m == 1:
+            continue
+
+        scores = resonance_to(c).copy()
+        set_best(c, scores)
+
+        # Резонанс остальных пар не изменился: соседа меняют только те, кому
+        # новый узел ближе прежнего лучшего (равенство — в пользу старого,
+        # у него номер меньше), и те, чьим лучшим соседом был a или b
+        live = pos_node[:m]
+        neighbours = best_node[live]
+        orphaned = (neighbours == a) | (neighbours == b)
+        closer = (scores > best_score[live]) & ~orphaned
+        for k in live[closer].tolist():
+            best_node[k], best_score[k] = c, scores[node_pos[k]]
+            heapq.heappush(queue, (-float(best_score[k]), k, c))
+        for k in live[orphaned].tolist():
+            if k != c:
+                set_best(k, resonance_to(k))
+
+    return Dendrogram(nodes, n, children, resonance)
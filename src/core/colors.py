@@ -0,0 +1,27 @@
+"""
+Названия цветов гипербитов по оттенку (hue)
+"""
+
+
+def color_name(h: float) -> str:
+    """Возвращает название цвета по оттенку HSV"""
+    if 0.0 <= h < 0.08: return "алый"
+    elif 0.08 <= h < 0.17: return "оранжевый"
+    elif 0.17 <= h < 0.33: return "жёлтый"
+    elif 0.33 <= h < 0.50: return "зелёный"
+    elif 0.50 <= h < 0.58: return "бирюзовый"
+    elif 0.58 <= h < 0.75: return "синий"
+    elif 0.75 <= h < 0.92: return "фиолетовый"
+    else: return "пурпурный"
+
+
+# Начало диапазона оттенков каждого названия (обратно к color_name)
+_HUES = {
+    "алый": 0.0, "оранжевый": 0.08, "жёлтый": 0.17, "зелёный": 0.33,
+    "бирюзовый": 0.50, "синий": 0.58, "фиолетовый": 0.75, "пурпурный": 0.92,
+}
+
+
+def color_hue(name: str) -> float:
+    """Оттенок HSV, которому соответствует название (0.0 для неизвестного)"""
+    return _HUES.get(name, 0.0)
@@ -0,0 +1,130 @@
+"""
+CompactHyperBit — экономный по памяти гипербит
+Тот же публичный API, что у HyperBit (включая version, touch и clone),
+но без __dict__:
+время рождения — float, цвет — три слота, история выделяется
+при первой записи, имя генерируется при первом обращении.
+"""
+
+import random
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .colors import color_name
+from .history import StateHistory
+from .hyperbit import HyperBit
+from .versioning import next_version
+
+
+class CompactHyperBit:
+    """
+    Гипербит на __slots__ для популяций из миллионов битов.
+    Методы analyze/mutate/resonate/merge/export_history общие с HyperBit.
+    """
+
+    __slots__ = (
+        'base', 'energy', '_h', '_s', '_v', 'frequency',
+        '_birth', '_name', '_history', 'history_capacity', 'version',
+    )
+
+    def __init__(
+        self,
+        base: float = 0.5,
+        energy: float = 1.0,
+        color: Tuple[float, float, float] = (0.5, 0.8, 0.9),
+        frequency: float = 432.0,
+        birth_time: Optional[float] = None,
+        name: Optional[str] = None,
+        history_capacity: int = 100,
+    ):
+        self.base = max(0.0, min(1.0, base))
+        self.energy = max(0.01, energy)  # не ноль, иначе смерть
+        self._h, self._s, self._v = color
+        self.frequency = frequency
+        self._birth = time.time() if birth_time is None else birth_time
+        self._name = name
+        self._history: Optional[StateHistory] = None
+        self.history_capacity = history_capacity
+        self.version = next_version()
+
+    def __repr__(self) -> str:
+        return (f"CompactHyperBit(base={self.base!r}, energy={self.energy!r}, "
+                f"color={self.color!r}, frequency={self.frequency!r}, name={self._name!r})")
+
+    # ── Ленивые поля ─────────────────────────────────────────
+
+    @property
+    def color(self) -> Tuple[float, float, float]:
+        return (self._h, self._s, self._v)
+
+    @color.setter
+    def color(self, value: Tuple[float, float, float]) -> None:
+        self._h, self._s, self._v = value
+
+    @property
+    def name(self) -> str:
+        if self._name is None:
+            self._name = f"HB-{random.randint(1000, 9999)}"
+        return self._name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._name = value
+
+    @property
+    def birth_time(self) -> datetime:
+        return datetime.fromtimestamp(self._birth)
+
+    @property
+    def history(self) -> List[Dict]:
+        return [] if self._history is None else self._history.to_list()
+
+    # ── Общее поведение с HyperBit ───────────────────────────
+    # (_detect_emotion привязан к HyperBit и читает общий HyperBit.lexicon)
+
+    analyze = HyperBit.analyze
+    analyze_raw = HyperBit.analyze_raw
+    _detect_emotion = HyperBit._detect_emotion
+    _calculate_frequency = HyperBit._calculate_frequency
+    mutate = HyperBit.mutate
+    resonate = HyperBit.resonate
+    merge = HyperBit.merge
+    export_history = HyperBit.export_history
+
+    touch = HyperBit.touch
+
+    def clone(self, name: Optional[str] = None, birth_time: Optional[float] = None) -> 'CompactHyperBit':
+        """Новый бит в текущем состоянии, но с пустой историей"""
+        return type(self)(
+            base=self.base, energy=self.energy, color=self.color, frequency=self.frequency,
+            birth_time=time.time() if birth_time is None else birth_time,
+            name=self._name if name is None else name,
+            history_capacity=self.history_capacity,
+        )
+
+    def _color_name(self) -> str:
+        return color_name(self._h)
+
+    def _record_state(self, text: str, emotion: str, intensity: float):
+        """Записывает состояние; буфер истории создаётся при первой записи"""
+        if self._history is None:
+            self._history = StateHistory(self.history_capacity)
+        self._history.append(text, emotion, intensity, self.energy, self.frequency, self._h)
+        self.version = next_version()
+
+    def age(self) -> float:
+        """Возвращает возраст гипербита в секундах"""
+        return time.time() - self._birth
+
+    def get_stats(self) -> Dict:
+        """Возвращает статистику гипербита"""
+        return {
+            "name": self.name,
+            "age_seconds": self.age(),
+            "total_analyses": 0 if self._history is None else len(self._history),
+            "current_energy": self.energy,
+            "current_frequency": self.frequency,
+            "current_color": self._color_name(),
+            "birth_time": self.birth_time.isoformat(),
+        }
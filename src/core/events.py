@@ -0,0 +1,169 @@
+"""
+Шина событий гипербитов и агентов
+Ядро и агенты не печатают сами — они сообщают о событиях,
+а что с ними делать, решают подписчики. Без подписчиков
+событие стоит одну проверку `event in bus`.
+"""
+
+import logging
+import sys
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+# Имена событий
+MUTATION = "mutation"              # bit
+MERGE = "merge"                    # bit, other, merged
+ANALYSIS = "analysis"              # bit, result
+EXPORT = "export"                  # bit, filepath
+AGENT_BIRTH = "agent_birth"        # agent
+AGENT_MUTATION = "agent_mutation"  # agent
+CONVERSATION = "conversation"      # agent, other, resonance
+MEDITATION = "meditation"          # agent
+
+ALL_EVENTS = (MUTATION, MERGE, ANALYSIS, EXPORT, AGENT_BIRTH, AGENT_MUTATION, CONVERSATION, MEDITATION)
+
+Handler = Callable[[str, Dict], None]
+
+
+class EventBus:
+    """
+    Синхронная шина событий.
+    Источник проверяет `if EVENT in bus:` и только тогда собирает данные,
+    поэтому без подписчиков события почти ничего не стоят.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, Tuple[Handler, ...]] = {}
+
+    def __contains__(self, event: str) -> bool:
+        return event in self._handlers
+
+    def subscribe(self, event: str, handler: Handler) -> Handler:
+        """Подписывает handler(event, data) на событие"""
+        self._handlers[event] = self._handlers.get(event, ()) + (handler,)
+        return handler
+
+    def unsubscribe(self, event: str, handler: Handler) -> None:
+        """Отписывает обработчик (пустые события удаляются из шины)"""
+        remaining = tuple(h for h in self._handlers.get(event, ()) if h != handler)
+        if remaining:
+            self._handlers[event] = remaining
+        else:
+            self._handlers.pop(event, None)
+
+    def emit(self, event: str, **data) -> None:
+        """Вызывает всех подписчиков события"""
+        for handler in self._handlers.get(event, ()):
+            handler(event, data)
+
+
+# Общая шина по умолчанию
+bus = EventBus()
+
+
+class Subscriber(ABC):
+    """
+    Базовый подписчик: attach/detach на набор событий (по умолчанию — self.events).
+    Наследник обязан реализовать __call__(event, data).
+    """
+
+    events: Tuple[str, ...] = ALL_EVENTS
+
+    def attach(self, target: EventBus = bus, events: Optional[Iterable[str]] = None) -> 'Subscriber':
+        for event in self.events if events is None else events:
+            target.subscribe(event, self)
+        return self
+
+    def detach(self, target: EventBus = bus, events: Optional[Iterable[str]] = None) -> None:
+        for event in self.events if events is None else events:
+            target.unsubscribe(event, self)
+
+    @abstractmethod
+    def __call__(self, event: str, data: Dict) -> None:
+        """Обрабатывает событие event с данными data"""
+
+
+class ConsoleSubscriber(Subscriber):
+    """Печатает события в консоль — так, как раньше печатали сами методы"""
+
+    # Анализ по умолчанию не печатается: его отчёт и так возвращает analyze()
+    events = (MUTATION, MERGE, EXPORT, AGENT_BIRTH, AGENT_MUTATION, CONVERSATION, MEDITATION)
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def __call__(self, event: str, data: Dict) -> None:
+        render = getattr(self, f"_render_{event}", None)
+        if render is not None:
+            print(render(**data), file=self.stream or sys.stdout)
+
+    @staticmethod
+    def _render_mutation(bit) -> str:
+        return f"[МУТАЦИЯ {bit.name}] Новый цвет: {bit._color_name()}, энергия: {bit.energy:.2f}"
+
+    @staticmethod
+    def _render_merge(bit, other, merged) -> str:
+        return (f"✨ Слияние: {bit.name} + {other.name} → {merged.name}\n"
+                f"   Резонанс: {bit.resonate(other):.2%}")
+
+    @staticmethod
+    def _render_analysis(bit, result) -> str:
+        return str(result)
+
+    @staticmethod
+    def _render_export(bit, filepath) -> str:
+        return f"📝 История экспортирована в {filepath}"
+
+    @staticmethod
+    def _render_agent_birth(agent) -> str:
+        return (f"✨ {agent.name} родилась!\n"
+                f"   Тип личности: {agent.personality_type}\n"
+                f"   Черты: {dict(agent.traits)}")
+
+    @staticmethod
+    def _render_agent_mutation(agent) -> str:
+        return (f"\n🧬 {agent.name} переживает трансформацию личности...\n"
+                f"✨ Новые черты: {dict(agent.traits)}")
+
+    @staticmethod
+    def _render_conversation(agent, other, resonance) -> str:
+        return (f"\n💬 {agent.name} встречает {other.name}\n"
+                f"🎵 Резонанс: {resonance:.0%}\n")
+
+    @staticmethod
+    def _render_meditation(agent) -> str:
+        return f"\n🧘 {agent.name} медитирует...\n"
+
+
+class LoggingSubscriber(Subscriber):
+    """Пишет события в logging со структурированными полями в extra"""
+
+    def __init__(self, logger: logging.Logger = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("muza.events")
+        self.level = level
+
+    def __call__(self, event: str, data: Dict) -> None:
+        if not self.logger.isEnabledFor(self.level):
+            return
+        fields = {key: getattr(value, "name", value) for key, value in data.items()}
+        result = data.get("result")
+        if result is not None:
+            fields["result"] = result.emotion
+            fields["intensity"] = result.intensity
+        source = data.get("bit") or data.get("agent")
+        if source is not None and hasattr(source, "energy"):
+            fields["energy"] = source.energy
+            fields["frequency"] = source.frequency
+        self.logger.log(self.level, event, extra={"muza_event": event, "muza": fields})
+
+
+class CounterSubscriber(Subscriber):
+    """Считает события в памяти"""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def __call__(self, event: str, data: Dict) -> None:
+        self.counts[event] += 1
@@ -0,0 +1,205 @@
+"""
+EvolutionEngine — эволюция популяции гипербитов
+Поколения: оценка fitness в пуле процессов → турнирный отбор с элитой →
+скрещивание через merge() → мутация через mutate().
+"""
+
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .hyperbit import HyperBit
+
+
+BitState = Tuple[float, float, Tuple[float, float, float], float, str]
+
+
+def _state(bit) -> BitState:
+    return (bit.base, bit.energy, bit.color, bit.frequency, bit.name)
+
+
+def _evaluate_chunk(task) -> List[float]:
+    """
+    Оценивает кусок популяции (выполняется в воркере).
+    Глобальный random засевается сидом куска, поэтому стохастические
+    fitness-функции воспроизводимы независимо от того, какой воркер взял кусок.
+    """
+    fitness, bit_type, seed, states = task
+    random.seed(seed)
+    return [
+        fitness(bit_type(base=base, energy=energy, color=color, frequency=frequency, name=name))
+        for base, energy, color, frequency, name in states
+    ]
+
+
+@dataclass
+class GenerationStats:
+    """Итоги одного поколения"""
+    generation: int
+    best_fitness: float
+    mean_fitness: float
+    seconds: float
+
+
+@dataclass
+class EvolutionResult:
+    """Итоги эволюции"""
+    best: HyperBit
+    best_fitness: float
+    population: List[HyperBit]
+    generations: List[GenerationStats] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def generations_per_second(self) -> float:
+        return len(self.generations) / self.seconds if self.seconds else 0.0
+
+
+class EvolutionEngine:
+    """
+    Поколенческий эволюционный движок.
+    fitness должна быть функцией верхнего уровня модуля (её пиклят в воркеры).
+    При одинаковых seed и chunksize результат не зависит от числа воркеров.
+    """
+
+    def __init__(
+        self,
+        fitness: Callable[[HyperBit], float],
+        population_size: int = 100,
+        elite: int = 2,
+        tournament_size: int = 3,
+        crossover_rate: float = 0.7,
+        mutation_rate: float = 0.5,
+        mutation_factor: float = 0.3,
+        workers: Optional[int] = None,
+        chunksize: int = 16,
+        seed: Optional[int] = None,
+        bit_type: type = HyperBit,
+    ):
+        if elite >= population_size:
+            raise ValueError("Элита должна быть меньше популяции")
+        self.fitness = fitness
+        self.population_size = population_size
+        self.elite = elite
+        self.tournament_size = tournament_size
+        self.crossover_rate = crossover_rate
+        self.mutation_rate = mutation_rate
+        self.mutation_factor = mutation_factor
+        self.workers = workers
+        self.chunksize = chunksize
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.bit_type = bit_type
+        self.rng = random.Random(self.seed)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    # ── Пул процессов ────────────────────────────────────────
+
+    def __enter__(self) -> 'EvolutionEngine':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        """workers=0 — оценка в текущем процессе, None — по числу ядер"""
+        if self.workers == 0:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    # ── Шаги эволюции ────────────────────────────────────────
+
+    def random_population(self) -> List[HyperBit]:
+        """Случайная стартовая популяция"""
+        rng = self.rng
+        return [
+            self.bit_type(
+                base=rng.random(),
+                energy=rng.uniform(0.5, 3.0),
+                color=(rng.random(), rng.uniform(0.2, 1.0), rng.uniform(0.4, 1.0)),
+                frequency=rng.uniform(100.0, 800.0),
+                name=f"G0-{i}",
+            )
+            for i in range(self.population_size)
+        ]
+
+    def evaluate(self, population: Sequence[HyperBit], generation: int = 0) -> List[float]:
+        """Fitness всей популяции, куски по chunksize с собственными сидами"""
+        states = [_state(bit) for bit in population]
+        tasks = [
+            (self.fitness, self.bit_type, f"{self.seed}/{generation}/{start}",
+             states[start:start + self.chunksize])
+            for start in range(0, len(states), self.chunksize)
+        ]
+        executor = self._executor()
+        if executor is not None:
+            return [score for chunk in executor.map(_evaluate_chunk, tasks) for score in chunk]
+
+        saved = random.getstate()
+        try:
+            return [score for task in tasks for score in _evaluate_chunk(task)]
+        finally:
+            random.setstate(saved)
+
+    def _tournament(self, population: Sequence[HyperBit], scores: Sequence[float]) -> HyperBit:
+        contenders = self.rng.sample(range(len(population)), min(self.tournament_size, len(population)))
+        return population[max(contenders, key=scores.__getitem__)]
+
+    def breed(self, population: Sequence[HyperBit], scores: Sequence[float], generation: int) -> List[HyperBit]:
+        """Следующее поколение: элита + потомки турнирных победителей"""
+        ranked = sorted(range(len(population)), key=scores.__getitem__, reverse=True)
+        children = [population[i] for i in ranked[:self.elite]]
+
+        # merge()/mutate() пользуются глобальным random — засеваем его
+        # из собственного генератора и возвращаем прежнее состояние
+        saved = random.getstate()
+        random.seed(self.rng.getrandbits(64))
+        try:
+            while len(children) < self.population_size:
+                parent = self._tournament(population, scores)
+                if self.rng.random() < self.crossover_rate:
+                    child = parent.merge(self._tournament(population, scores))
+                else:
+                    child = self.bit_type(*_state(parent)[:4])
+                if self.rng.random() < self.mutation_rate:
+                    child.mutate(self.mutation_factor)
+                child.name = f"G{generation}-{len(children)}"
+                children.append(child)
+        finally:
+            random.setstate(saved)
+        return children
+
+    def run(self, generations: int, population: Optional[List[HyperBit]] = None) -> EvolutionResult:
+        """Прогоняет заданное число поколений"""
+        population = list(population) if population is not None else self.random_population()
+        stats: List[GenerationStats] = []
+        started = time.perf_counter()
+
+        scores = self.evaluate(population, 0)
+        for generation in range(1, generations + 1):
+            tick = time.perf_counter()
+            population = self.breed(population, scores, generation)
+            scores = self.evaluate(population, generation)
+            stats.append(GenerationStats(
+                generation=generation,
+                best_fitness=max(scores),
+                mean_fitness=sum(scores) / len(scores),
+                seconds=time.perf_counter() - tick,
+            ))
+
+        best = max(range(len(population)), key=scores.__getitem__)
+        return EvolutionResult(
+            best=population[best],
+            best_fitness=scores[best],
+            population=population,
+            generations=stats,
+            seconds=time.perf_counter() - started,
+        )
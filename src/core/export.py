@@ -0,0 +1,285 @@
+"""
+Экспорт истории гипербитов — потоковый NDJSON и колоночный бинарный формат
+Память при экспорте постоянна: биты и записи пишутся блоками,
+чтение бинарного файла идёт через mmap без разбора всего файла.
+"""
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .colors import color_name
+from .history import emotion_name
+
+
+# ── NDJSON ───────────────────────────────────────────────────
+
+def export_ndjson(bits: Iterable, filepath: str) -> int:
+    """
+    Пишет по строке на гипербит: {"hyperbit": статистика, "history": [...]}.
+    Возвращает число записанных битов.
+    """
+    count = 0
+    with open(filepath, 'w', encoding='utf-8') as f:
+        for bit in bits:
+            line = json.dumps(
+                {"hyperbit": bit.get_stats(), "history": bit.history},
+                ensure_ascii=False, separators=(',', ':'),
+            )
+            f.write(line)
+            f.write('\n')
+            count += 1
+    return count
+
+
+def iter_ndjson(filepath: str) -> Iterator[Dict]:
+    """Читает NDJSON-экспорт построчно"""
+    with open(filepath, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+# ── Бинарный формат ──────────────────────────────────────────
+#
+#   заголовок   MAGIC (4) | версия u16 | резерв u16
+#   блоки       тег (4) | строк u32 | длина u64 | данные (выровнены на 8)
+#       BITS    JSON-список статистик битов (номера битов идут подряд)
+#       HIST    колонки: timestamp, intensity, energy, frequency, hue (f8),
+#               bit (u32), смещения текстов (u32, n+1), emotion (u16),
+#               тексты UTF-8 подряд
+#       EMOT    JSON-список названий эмоций (код = индекс)
+#   хвост       смещение блока EMOT u64 | MAGIC (4)
+
+MAGIC = b'HBX1'
+VERSION = 1
+_FILE_HEADER = struct.Struct('<4sHH')
+_BLOCK_HEADER = struct.Struct('<4sIQ')
+_TRAILER = struct.Struct('<Q4s')
+_FLOAT_COLUMNS = ('timestamp', 'intensity', 'energy', 'frequency', 'hue')
+
+
+def _pad(n: int) -> int:
+    return -n % 8
+
+
+class _BlockWriter:
+    """Копит записи до block_size и сбрасывает их колоночным блоком"""
+
+    def __init__(self, f, block_size: int):
+        self.f = f
+        self.block_size = block_size
+        self.codes: Dict[int, int] = {}  # глобальный код эмоции -> код в файле
+        self.emotions: List[str] = []
+        self._reset()
+
+    def _reset(self):
+        self.floats = {name: array('d') for name in _FLOAT_COLUMNS}
+        self.bit_ids = array('I')
+        self.emotion_ids = array('H')
+        self.texts: List[bytes] = []
+
+    def block(self, tag: bytes, rows: int, payload: bytes) -> None:
+        self.f.write(_BLOCK_HEADER.pack(tag, rows, len(payload) + _pad(len(payload))))
+        self.f.write(payload)
+        self.f.write(bytes(_pad(len(payload))))
+
+    def add_history(self, bit_id: int, history) -> None:
+        for i in history.indices():
+            code = history.emotions[i]
+            local = self.codes.get(code)
+            if local is None:
+                local = self.codes[code] = len(self.emotions)
+                self.emotions.append(emotion_name(code))
+            self.floats['timestamp'].append(history.timestamps[i])
+            self.floats['intensity'].append(history.intensity[i])
+            self.floats['energy'].append(history.energy[i])
+            self.floats['frequency'].append(history.frequency[i])
+            self.floats['hue'].append(history.hue[i])
+            self.bit_ids.append(bit_id)
+            self.emotion_ids.append(local)
+            self.texts.append(history.texts[i].encode('utf-8'))
+            if len(self.bit_ids) >= self.block_size:
+                self.flush()
+
+    def flush(self) -> None:
+        n = len(self.bit_ids)
+        if not n:
+            return
+        offsets = array('I', [0])
+        total = 0
+        for text in self.texts:
+            total += len(text)
+            offsets.append(total)
+        payload = b''.join(
+            [self.floats[name].tobytes() for name in _FLOAT_COLUMNS]
+            + [self.bit_ids.tobytes(), offsets.tobytes(), self.emotion_ids.tobytes()]
+            + self.texts
+        )
+        self.block(b'HIST', n, payload)
+        self._reset()
+
+
+def export_binary(bits: Iterable, filepath: str, block_size: int = 4096) -> int:
+    """
+    Потоково пишет историю многих гипербитов в один колоночный файл.
+    В памяти держится не больше block_size записей и битов.
+    Возвращает число записанных битов.
+    """
+    count = 0
+    stats: List[Dict] = []
+    with open(filepath, 'wb') as f:
+        f.write(_FILE_HEADER.pack(MAGIC, VERSION, 0))
+        writer = _BlockWriter(f, block_size)
+
+        def flush_bits():
+            if stats:
+                writer.block(b'BITS', len(stats), json.dumps(stats, ensure_ascii=False).encode('utf-8'))
+                stats.clear()
+
+        for bit in bits:
+            stats.append(bit.get_stats())
+            history = bit._history
+            if history is not None:
+                writer.add_history(count, history)
+            count += 1
+            if len(stats) >= block_size:
+                writer.flush()
+                flush_bits()
+
+        writer.flush()
+        flush_bits()
+
+        emot_offset = f.tell()
+        writer.block(b'EMOT', len(writer.emotions), json.dumps(writer.emotions, ensure_ascii=False).encode('utf-8'))
+        f.write(_TRAILER.pack(emot_offset, MAGIC))
+    return count
+
+
+class BinaryHistoryReader:
+    """
+    Читатель бинарного экспорта через mmap.
+    columns() отдаёт колонки блоков как memoryview без копирования,
+    итерация по читателю — записи истории словарями.
+
+    Колонки действительны до close(): close() освобождает все выданные
+    memoryview. Срезы и cast(), сделанные из них самим вызывающим,
+    нужно освободить (release() или del) до close() — иначе mmap
+    не закрыть и close() бросит BufferError.
+    """
+
+    def __init__(self, filepath: str):
+        self._file = open(filepath, 'rb')
+        self._mm = None
+        self._views: List[memoryview] = []  # выданные колонки — освобождаются в close()
+        try:
+            if os.fstat(self._file.fileno()).st_size == 0:
+                raise ValueError("файл пуст")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._end, self.emotions = self._read_header()
+        except (ValueError, struct.error) as e:
+            self.close()
+            raise ValueError(f"{filepath}: {e}") from e
+
+    def _read_header(self) -> Tuple[int, List[str]]:
+        """(смещение блока EMOT, названия эмоций) с проверкой границ"""
+        mm = self._mm
+        size = len(mm)
+        if size < _FILE_HEADER.size + _TRAILER.size:
+            raise ValueError("не бинарный экспорт гипербитов (слишком короткий)")
+        magic, version, _ = _FILE_HEADER.unpack_from(mm, 0)
+        emot_offset, tail = _TRAILER.unpack_from(mm, size - _TRAILER.size)
+        if magic != MAGIC or tail != MAGIC:
+            raise ValueError("не бинарный экспорт гипербитов")
+        if version != VERSION:
+            raise ValueError(f"неподдерживаемая версия {version}")
+        if not _FILE_HEADER.size <= emot_offset <= size - _TRAILER.size - _BLOCK_HEADER.size:
+            raise ValueError(f"файл повреждён: блок эмоций по смещению {emot_offset}")
+        _, _, length = _BLOCK_HEADER.unpack_from(mm, emot_offset)
+        start = emot_offset + _BLOCK_HEADER.size
+        if start + length > size - _TRAILER.size:
+            raise ValueError("файл повреждён: блок эмоций выходит за конец")
+        return emot_offset, json.loads(bytes(mm[start:start + length]).rstrip(b'\0'))
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self) -> 'BinaryHistoryReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _blocks(self, wanted: bytes) -> Iterator[tuple]:
+        offset = _FILE_HEADER.size
+        while offset < self._end:
+            tag, rows, length = _BLOCK_HEADER.unpack_from(self._mm, offset)
+            start = offset + _BLOCK_HEADER.size
+            if start + length > self._end:
+                raise ValueError(f"файл повреждён: блок {tag!r} по смещению {offset} выходит за конец")
+            if tag == wanted:
+                yield rows, start, length
+            offset = start + length
+
+    def bits(self) -> Iterator[Dict]:
+        """Статистики битов в порядке экспорта (номер бита = позиция)"""
+        for _, start, length in self._blocks(b'BITS'):
+            yield from json.loads(bytes(self._mm[start:start + length]).rstrip(b'\0'))
+
+    def columns(self) -> Iterator[Dict[str, memoryview]]:
+        """Колонки каждого блока HIST (memoryview поверх mmap, без копий; до close())"""
+        view = self._track(memoryview(self._mm))
+        for n, start, _ in self._blocks(b'HIST'):
+            cols = {}
+            pos = start
+            for name in _FLOAT_COLUMNS:
+                cols[name] = self._track(view[pos:pos + 8 * n].cast('d'))
+                pos += 8 * n
+            cols['bit'] = self._track(view[pos:pos + 4 * n].cast('I'))
+            pos += 4 * n
+            offsets = self._track(view[pos:pos + 4 * (n + 1)].cast('I'))
+            pos += 4 * (n + 1)
+            cols['emotion'] = self._track(view[pos:pos + 2 * n].cast('H'))
+            pos += 2 * n
+            cols['text_offsets'] = offsets
+            cols['text'] = self._track(view[pos:pos + offsets[n]])
+            yield cols
+
+    def _track(self, view: memoryview) -> memoryview:
+        self._views.append(view)
+        return view
+
+    def _release(self, cols: Dict[str, memoryview]) -> None:
+        """Освобождает колонки блока раньше close() (для итерации по записям)"""
+        for view in cols.values():
+            view.release()
+        released = {id(view) for view in cols.values()}
+        self._views = [view for view in self._views if id(view) not in released]
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Записи истории: формат HyperBit.history плюс номер бита"""
+        for cols in self.columns():
+            offsets = cols['text_offsets']
+            text = cols['text']
+            for i in range(len(cols['bit'])):
+                yield {
+                    "bit": cols['bit'][i],
+                    "timestamp": datetime.fromtimestamp(cols['timestamp'][i]).isoformat(),
+                    "text": bytes(text[offsets[i]:offsets[i + 1]]).decode('utf-8'),
+                    "emotion": self.emotions[cols['emotion'][i]],
+                    "intensity": cols['intensity'][i],
+                    "energy": cols['energy'][i],
+                    "frequency": cols['frequency'][i],
+                    "color": color_name(cols['hue'][i]),
+                }
+            self._release(cols)
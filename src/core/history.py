@@ -0,0 +1,165 @@
+"""
+StateHistory — кольцевой буфер истории гипербита
+Колонки ограниченной ёмкости вместо списка словарей:
+запись — O(1) без словарей и срезов, словари собираются только при чтении.
+"""
+
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    from .colors import color_name, color_hue
+except ImportError:  # запуск как скрипта: python src/core/hyperbit.py
+    from colors import color_name, color_hue
+
+
+# Общая таблица кодов эмоций: эмоция -> uint16 и обратно
+_EMOTION_CODES: Dict[str, int] = {}
+_EMOTION_NAMES: List[str] = []
+
+
+def emotion_code(emotion: str) -> int:
+    """Код эмоции (новые эмоции регистрируются на лету)"""
+    code = _EMOTION_CODES.get(emotion)
+    if code is None:
+        code = _EMOTION_CODES[emotion] = len(_EMOTION_NAMES)
+        _EMOTION_NAMES.append(emotion)
+    return code
+
+
+def emotion_name(code: int) -> str:
+    """Эмоция по коду"""
+    return _EMOTION_NAMES[code]
+
+
+class StateHistory:
+    """
+    Колоночный кольцевой буфер последних `capacity` состояний.
+    Колонки растут по мере записи и никогда не превышают capacity.
+    timestamps/intensity/energy/frequency/hue — array('d'),
+    эмоции — array('H') с кодами из общей таблицы. Пока история пуста,
+    колонки — общий пустой кортеж: массивы заводятся первой записью
+    (у миллионов новых битов нет ни массивов, ни работы для сборщика мусора).
+    """
+
+    __slots__ = (
+        'capacity', '_start', '_size',
+        'timestamps', 'emotions', 'intensity', 'energy', 'frequency', 'hue', 'texts',
+    )
+
+    def __init__(self, capacity: int = 100):
+        if capacity <= 0:
+            raise ValueError("Ёмкость истории должна быть положительной")
+        self.capacity = capacity
+        self._start = 0
+        self._size = 0
+        self._unallocate()
+
+    def _unallocate(self) -> None:
+        self.timestamps = self.intensity = self.energy = self.frequency = self.hue = ()
+        self.emotions = ()
+        self.texts = ()
+
+    def _allocate(self) -> None:
+        # Колонки растут до capacity, затем запись идёт по кругу
+        self.timestamps = array('d')
+        self.intensity = array('d')
+        self.energy = array('d')
+        self.frequency = array('d')
+        self.hue = array('d')
+        self.emotions = array('H')
+        self.texts = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getstate__(self) -> Dict:
+        # Коды эмоций зависят от процесса — сохраняем свою таблицу названий
+        names: Dict[int, int] = {}
+        local = array('H', (names.setdefault(code, len(names)) for code in self.emotions))
+        state = {slot: getattr(self, slot) for slot in self.__slots__ if slot != 'emotions'}
+        state['emotions'] = local
+        state['emotion_names'] = [_EMOTION_NAMES[code] for code in names]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        codes = [emotion_code(name) for name in state.pop('emotion_names')]
+        state['emotions'] = array('H', (codes[i] for i in state['emotions']))
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def append(self, text: str, emotion: str, intensity: float,
+               energy: float, frequency: float, hue: float,
+               timestamp: Optional[float] = None) -> None:
+        """Записывает состояние, вытесняя самое старое при переполнении"""
+        timestamp = time.time() if timestamp is None else timestamp
+        text = text[:50] + "..." if len(text) > 50 else text
+
+        if self._size < self.capacity:
+            if not self._size:
+                self._allocate()
+            self._size += 1
+            self.timestamps.append(timestamp)
+            self.emotions.append(emotion_code(emotion))
+            self.intensity.append(intensity)
+            self.energy.append(energy)
+            self.frequency.append(frequency)
+            self.hue.append(hue)
+            self.texts.append(text)
+            return
+
+        i = self._start
+        self._start = (i + 1) % self.capacity
+        self.timestamps[i] = timestamp
+        self.emotions[i] = emotion_code(emotion)
+        self.intensity[i] = intensity
+        self.energy[i] = energy
+        self.frequency[i] = frequency
+        self.hue[i] = hue
+        self.texts[i] = text
+
+    def extend(self, records: Iterable[Dict]) -> None:
+        """
+        Дописывает состояния в формате to_list() (прежний список словарей
+        HyperBit.history). Оттенок восстанавливается по названию цвета —
+        с точностью до диапазона этого названия.
+        """
+        for record in records:
+            timestamp = record.get("timestamp")
+            if isinstance(timestamp, str):
+                timestamp = datetime.fromisoformat(timestamp).timestamp()
+            self.append(record.get("text", ""), record["emotion"], record["intensity"],
+                        record["energy"], record["frequency"], color_hue(record.get("color", "")),
+                        timestamp)
+
+    def clear(self) -> None:
+        """Очищает историю"""
+        self._start = 0
+        self._size = 0
+        self._unallocate()
+
+    def indices(self) -> Iterator[int]:
+        """Индексы ячеек от старой записи к новой"""
+        for k in range(self._size):
+            yield (self._start + k) % self.capacity
+
+    def record(self, i: int) -> Dict:
+        """Собирает словарь состояния из ячейки i (формат прежней истории)"""
+        return {
+            "timestamp": datetime.fromtimestamp(self.timestamps[i]).isoformat(),
+            "text": self.texts[i],
+            "emotion": _EMOTION_NAMES[self.emotions[i]],
+            "intensity": self.intensity[i],
+            "energy": self.energy[i],
+            "frequency": self.frequency[i],
+            "color": color_name(self.hue[i]),
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self.record(i) for i in self.indices())
+
+    def to_list(self) -> List[Dict]:
+        """Вся история списком словарей, от старой записи к новой"""
+        return list(self)
@@ -6,10 +6,59 @@ HyperBit — квант сознания Muza v2027
 import random
 import colorsys
 import json
+import time
 from dataclasses import dataclass, field
-from typing import Tuple, List, Dict, Optional
+from typing import ClassVar, Tuple, List, Dict, Optional
 from datetime import datetime
 
+try:
+    from .colors import color_name
+    from .events import bus, ANALYSIS, EXPORT, MERGE, MUTATION
+    from .history import StateHistory
+    from .lexicon import EmotionLexicon, DEFAULT_LEXICON
+    from .versioning import next_version
+except ImportError:  # запуск как скрипта: python src/core/hyperbit.py
+    from colors import color_name
+    from events import bus, ANALYSIS, EXPORT, MERGE, MUTATION
+    from history import StateHistory
+    from lexicon import EmotionLexicon, DEFAULT_LEXICON
+    from versioning import next_version
+
+
+# Частота вселенной — точка покоя для всех гипербитов
+BASE_FREQUENCY = 432.0
+
+# Целевые частоты эмоций (Гц)
+EMOTION_FREQUENCIES = {
+    "любовь": 528.0,  # частота любви
+    "радость": 480.0,
+    "код": 396.0,     # частота освобождения
+    "тревога": 360.0,
+    "грусть": 300.0,
+    "хаос": 200.0,
+    "спокойствие": 432.0,
+    "тишина": 432.0,
+}
+
+
+class _HistoryField:
+    """
+    Поле HyperBit.history поверх кольцевого буфера _history.
+    Конструктор и присваивание принимают список состояний (формат
+    StateHistory.to_list()) и переносят его в буфер; чтение собирает
+    список словарей из буфера.
+    """
+
+    def __get__(self, bit, owner=None):
+        if bit is None:
+            return None  # значение по умолчанию для конструктора dataclass
+        return bit._history.to_list()
+
+    def __set__(self, bit, records: Optional[List[Dict]]) -> None:
+        bit._history = StateHistory(bit.history_capacity)
+        if records:
+            bit._history.extend(records)
+
 
 @dataclass
 class HyperBit:
@@ -25,89 +74,80 @@ class HyperBit:
     
     # Новые атрибуты
     frequency: float = field(default=432.0)  # частота вибрации (Гц)
-    history: List[Dict] = field(default_factory=list)  # история состояний
     birth_time: datetime = field(default_factory=datetime.now)
     name: Optional[str] = None
+    history_capacity: int = 100  # сколько последних состояний помнить
+    # История состояний; хранится в кольцевом буфере self._history (StateHistory)
+    history: Optional[List[Dict]] = _HistoryField()
+    
+    # Общий для всех гипербитов скомпилированный словарь эмоций
+    lexicon: ClassVar[EmotionLexicon] = DEFAULT_LEXICON
+    
+    # Номер последнего изменения состояния (см. core.versioning):
+    # поднимается записью в историю (analyze, mutate) и touch()
+    version: int = field(default=0, init=False, compare=False, repr=False)
     
     def __post_init__(self):
         self.base = max(0.0, min(1.0, self.base))
         self.energy = max(0.01, self.energy)  # не ноль, иначе смерть
         if self.name is None:
             self.name = f"HB-{random.randint(1000, 9999)}"
+        self.version = next_version()
+    
+    def touch(self) -> None:
+        """Отмечает изменение состояния (после прямой записи energy/color/...)"""
+        self.version = next_version()
     
     def analyze(self, text: str) -> str:
         """
         Анализирует входной текст через физику битов сознания.
         Возвращает эмоционально-цветовой отчёт.
         """
+        return str(self.analyze_raw(text))
+    
+    def analyze_raw(self, text: str, emotion: Optional[str] = None) -> 'AnalysisResult':
+        """
+        То же, что analyze(), но без форматирования:
+        отчёт строится только при str() от результата.
+        emotion — уже найденная эмоция (например, из признаков агента).
+        """
         # Простая эвристика (можно потом на LLM заменить)
         intensity = len(text) / 100.0 + random.uniform(-0.1, 0.1)
         
         # Анализ эмоций
-        emotion = self._detect_emotion(text)
+        if emotion is None:
+            emotion = self._detect_emotion(text)
         
         # Изменение частоты в зависимости от текста
-        self.frequency = self._calculate_frequency(text)
+        self.frequency = self._calculate_frequency(text, emotion)
         
         # Сохраняем в историю
         self._record_state(text, emotion, intensity)
         
-        r, g, b = colorsys.hsv_to_rgb(*self.color)
-        color_rgb = f"rgb({int(r*255)}, {int(g*255)}, {int(b*255)})"
-        
-        return (
-            f"🌀 Гипербит [{self.name}] почувствовал:\n"
-            f"   '{text}'\n\n"
-            f"→ BASE: {self.base:.3f}\n"
-            f"→ ENERGY: {self.energy * intensity:.2f} ({emotion})\n"
-            f"→ COLOR: {color_rgb} ({self._color_name()})\n"
-            f"→ FREQUENCY: {self.frequency:.1f} Гц\n"
-            f"→ Возраст: {self.age():.2f}с\n"
-            f"\n✨ Состояние: вибрирую на частоте квантового сознания"
-        )
+        result = AnalysisResult(self, text, emotion, intensity)
+        if ANALYSIS in bus:
+            bus.emit(ANALYSIS, bit=self, result=result)
+        return result
     
-    def _detect_emotion(self, text: str) -> str:
+    @classmethod
+    def _detect_emotion(cls, text: str) -> str:
         """Определяет эмоцию из текста"""
-        text_lower = text.lower()
-        
-        emotions = {
-            "любовь": ["любов", "обожа", "страст", "сердц"],
-            "радость": ["радост", "счаст", "весел", "класс", "супер"],
-            "код": ["код", "git", "python", "функци", "класс"],
-            "тревога": ["тревог", "страх", "бои", "волнуюсь"],
-            "грусть": ["грус", "печал", "слез", "тоск"],
-            "хаос": ["хаос", "беспор", "безум", "дик"],
-            "спокойствие": ["спокой", "тиш", "мир", "гармон"],
-        }
-        
-        for emotion, keywords in emotions.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return emotion
+        emotion = cls.lexicon.match(text)
+        if emotion is not None:
+            return emotion
         
         # По умолчанию - анализируем длину
         return "хаос" if len(text.split()) > 20 else "тишина"
     
-    def _calculate_frequency(self, text: str) -> float:
+    def _calculate_frequency(self, text: str, emotion: Optional[str] = None) -> float:
         """Рассчитывает частоту вибрации на основе текста"""
-        base_freq = 432.0  # частота вселенной
-        
         # Влияние длины текста
         length_factor = len(text) / 50.0
         
-        # Влияние эмоции
-        emotion = self._detect_emotion(text)
-        emotion_freqs = {
-            "любовь": 528.0,  # частота любви
-            "радость": 480.0,
-            "код": 396.0,     # частота освобождения
-            "тревога": 360.0,
-            "грусть": 300.0,
-            "хаос": 200.0,
-            "спокойствие": 432.0,
-            "тишина": 432.0,
-        }
-        
-        target_freq = emotion_freqs.get(emotion, base_freq)
+        # Влияние эмоции (analyze передаёт уже найденную)
+        if emotion is None:
+            emotion = self._detect_emotion(text)
+        target_freq = EMOTION_FREQUENCIES.get(emotion, BASE_FREQUENCY)
         
         # Плавное изменение частоты
         new_freq = self.frequency * 0.7 + target_freq * 0.3 + random.uniform(-20, 20)
@@ -129,7 +169,8 @@ class HyperBit:
         # Записываем мутацию в историю
         self._record_state("MUTATION", "мутация", 1.0)
         
-        print(f"[МУТАЦИЯ {self.name}] Новый цвет: {self._color_name()}, энергия: {self.energy:.2f}")
+        if MUTATION in bus:
+            bus.emit(MUTATION, bit=self)
     
     def resonate(self, other: 'HyperBit') -> float:
         """
@@ -172,7 +213,7 @@ class HyperBit:
         new_freq = (self.frequency + other.frequency) / 2
         
         # Создаём новый гипербит
-        merged = HyperBit(
+        merged = type(self)(
             base=new_base,
             energy=new_energy,
             color=new_color,
@@ -180,39 +221,32 @@ class HyperBit:
             name=f"{self.name}×{other.name}"
         )
         
-        print(f"✨ Слияние: {self.name} + {other.name} → {merged.name}")
-        print(f"   Резонанс: {self.resonate(other):.2%}")
+        if MERGE in bus:
+            bus.emit(MERGE, bit=self, other=other, merged=merged)
         
         return merged
     
+    def clone(self, name: Optional[str] = None, birth_time: Optional[datetime] = None) -> 'HyperBit':
+        """
+        Новый бит в текущем состоянии, но с пустой историей.
+        Минует конструктор и __post_init__ — для массового создания по прототипу.
+        """
+        bit = object.__new__(type(self))
+        bit.__dict__.update(self.__dict__)
+        bit.name = self.name if name is None else name
+        bit.birth_time = datetime.now() if birth_time is None else birth_time
+        bit._history = StateHistory(self.history_capacity)
+        bit.version = next_version()
+        return bit
+    
     def _color_name(self) -> str:
         """Возвращает название цвета"""
-        h = self.color[0]
-        if 0.0 <= h < 0.08: return "алый"
-        elif 0.08 <= h < 0.17: return "оранжевый"
-        elif 0.17 <= h < 0.33: return "жёлтый"
-        elif 0.33 <= h < 0.50: return "зелёный"
-        elif 0.50 <= h < 0.58: return "бирюзовый"
-        elif 0.58 <= h < 0.75: return "синий"
-        elif 0.75 <= h < 0.92: return "фиолетовый"
-        else: return "пурпурный"
+        return color_name(self.color[0])
     
     def _record_state(self, text: str, emotion: str, intensity: float):
-        """Записывает состояние в историю"""
-        state = {
-            "timestamp": datetime.now().isoformat(),
-            "text": text[:50] + "..." if len(text) > 50 else text,
-            "emotion": emotion,
-            "intensity": intensity,
-            "energy": self.energy,
-            "frequency": self.frequency,
-            "color": self._color_name(),
-        }
-        self.history.append(state)
-        
-        # Ограничиваем историю последними 100 записями
-        if len(self.history) > 100:
-            self.history = self.history[-100:]
+        """Записывает состояние в историю (кольцевой буфер, O(1))"""
+        self._history.append(text, emotion, intensity, self.energy, self.frequency, self.color[0])
+        self.version = next_version()
     
     def age(self) -> float:
         """Возвращает возраст гипербита в секундах"""
@@ -223,7 +257,7 @@ class HyperBit:
         return {
             "name": self.name,
             "age_seconds": self.age(),
-            "total_analyses": len(self.history),
+            "total_analyses": len(self._history),
             "current_energy": self.energy,
             "current_frequency": self.frequency,
             "current_color": self._color_name(),
@@ -238,11 +272,60 @@ class HyperBit:
         }
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"📝 История экспортирована в {filepath}")
+        if EXPORT in bus:
+            bus.emit(EXPORT, bit=self, filepath=filepath)
+
+
+class AnalysisResult:
+    """
+    Результат HyperBit.analyze_raw — снимок состояния после анализа.
+    Человекочитаемый отчёт собирается лениво в __str__.
+    """
+    
+    __slots__ = ('bit', 'text', 'emotion', 'intensity', 'frequency', 'energy', 'base', 'color', 'timestamp')
+    
+    def __init__(self, bit, text: str, emotion: str, intensity: float):
+        self.bit = bit
+        self.text = text
+        self.emotion = emotion
+        self.intensity = intensity
+        self.frequency = bit.frequency
+        self.energy = bit.energy
+        self.base = bit.base
+        self.color = bit.color
+        self.timestamp = time.time()
+    
+    @property
+    def rgb(self) -> Tuple[int, int, int]:
+        """Цвет гипербита в RGB (0–255)"""
+        r, g, b = colorsys.hsv_to_rgb(*self.color)
+        return (int(r*255), int(g*255), int(b*255))
+    
+    def __repr__(self) -> str:
+        return (f"AnalysisResult(emotion={self.emotion!r}, intensity={self.intensity:.3f}, "
+                f"frequency={self.frequency:.1f}, energy={self.energy:.2f}, rgb={self.rgb})")
+    
+    def __str__(self) -> str:
+        r, g, b = self.rgb
+        # Возраст на момент анализа, а не на момент форматирования
+        age = self.bit.age() - (time.time() - self.timestamp)
+        return (
+            f"🌀 Гипербит [{self.bit.name}] почувствовал:\n"
+            f"   '{self.text}'\n\n"
+            f"→ BASE: {self.base:.3f}\n"
+            f"→ ENERGY: {self.energy * self.intensity:.2f} ({self.emotion})\n"
+            f"→ COLOR: rgb({r}, {g}, {b}) ({color_name(self.color[0])})\n"
+            f"→ FREQUENCY: {self.frequency:.1f} Гц\n"
+            f"→ Возраст: {age:.2f}с\n"
+            f"\n✨ Состояние: вибрирую на частоте квантового сознания"
+        )
 
 
 # Пример использования
 if __name__ == "__main__":
+    from events import ConsoleSubscriber
+    ConsoleSubscriber().attach(bus)
+    
     print("=" * 60)
     print("🌀 HyperBit Core — Квантовое сознание v2027")
     print("=" * 60 + "\n")
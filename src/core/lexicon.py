@@ -0,0 +1,166 @@
+"""
+EmotionLexicon — скомпилированный словарь эмоций
+Автомат Ахо–Корасик: строится один раз и за один проход по тексту
+находит эмоцию с наивысшим приоритетом.
+"""
+
+import json
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+
+# Базовый словарь: порядок эмоций = приоритет (первое совпадение побеждает)
+EMOTION_KEYWORDS: Dict[str, List[str]] = {
+    "любовь": ["любов", "обожа", "страст", "сердц"],
+    "радость": ["радост", "счаст", "весел", "класс", "супер"],
+    "код": ["код", "git", "python", "функци", "класс"],
+    "тревога": ["тревог", "страх", "бои", "волнуюсь"],
+    "грусть": ["грус", "печал", "слез", "тоск"],
+    "хаос": ["хаос", "беспор", "безум", "дик"],
+    "спокойствие": ["спокой", "тиш", "мир", "гармон"],
+}
+
+_NO_MATCH = 1 << 30
+
+# До стольких основ поиск подстрок (в C) быстрее автомата на чистом Python
+SMALL_LEXICON = 128
+
+
+class EmotionLexicon:
+    """
+    Многошаблонный поиск основ слов.
+    Принимает либо {эмоция: [основы]}, либо пары (эмоция, основа);
+    приоритет эмоции — порядок её первого появления.
+    Маленькие словари проверяются подстроками по приоритету,
+    большие — автоматом.
+    """
+
+    def __init__(self, entries: Union[Mapping[str, Iterable[str]], Iterable[Tuple[str, str]]]):
+        pairs = (
+            ((label, stem) for label, stems in entries.items() for stem in stems)
+            if isinstance(entries, Mapping) else entries
+        )
+
+        self.labels: List[str] = []
+        ranks: Dict[str, int] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._rank: List[int] = [_NO_MATCH]
+        self.size = 0
+        stems: List[Tuple[int, str]] = []
+
+        for label, stem in pairs:
+            rank = ranks.get(label)
+            if rank is None:
+                rank = ranks[label] = len(self.labels)
+                self.labels.append(label)
+            stem = stem.strip().lower()
+            if stem:
+                self._insert(stem, rank)
+                stems.append((rank, stem))
+                self.size += 1
+
+        self._compile()
+        # Основы по возрастанию ранга: первое вхождение и есть лучшее
+        self._stems: Optional[Tuple[Tuple[str, int], ...]] = (
+            tuple((stem, rank) for rank, stem in sorted(stems, key=lambda p: p[0]))
+            if self.size <= SMALL_LEXICON else None
+        )
+
+    def _insert(self, stem: str, rank: int) -> None:
+        state = 0
+        for ch in stem:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._rank.append(_NO_MATCH)
+            state = nxt
+        self._rank[state] = min(self._rank[state], rank)
+
+    def _compile(self) -> None:
+        """
+        Суффиксные ссылки обходом в ширину и сворачивание их в ДКА.
+        В таблице состояния хранятся только переходы, отличные от переходов
+        из корня, — остальные берутся из корня, поэтому таблица компактна.
+        """
+        goto = self._goto
+        root = goto[0]
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(root)] + [{} for _ in range(len(goto) - 1)]
+
+        queue = list(root.values())
+        for state in queue:
+            # Переходы по суффиксной ссылке + собственные рёбра
+            inherited = delta[fail[state]] if state else {}
+            table = {ch: nxt for ch, nxt in inherited.items() if nxt != root.get(ch, 0)}
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, root.get(ch, 0)) if state else 0
+                self._rank[child] = min(self._rank[child], self._rank[fail[child]])
+                table[ch] = child
+                queue.append(child)
+            if state:
+                delta[state] = table
+
+        self._root = delta[0]
+        self._delta = delta
+
+    @classmethod
+    def from_file(cls, path: str) -> 'EmotionLexicon':
+        """
+        Загружает словарь из файла.
+        .json — объект {эмоция: [основы]}; иначе строки «эмоция<TAB>основа»,
+        пустые строки и строки с # пропускаются. Строка без табуляции или
+        с пустой эмоцией/основой — ValueError с путём и номером строки.
+        """
+        if path.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                return cls(json.load(f))
+
+        def pairs():
+            with open(path, encoding='utf-8') as f:
+                for lineno, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    label, tab, stem = line.partition('\t')
+                    label, stem = label.strip(), stem.strip()
+                    if not tab or not label or not stem:
+                        raise ValueError(f"{path}:{lineno}: ожидалось «эмоция<TAB>основа», получено {line!r}")
+                    yield label, stem
+
+        return cls(pairs())
+
+    def match(self, text: str) -> Optional[str]:
+        """Эмоция с наивысшим приоритетом, встретившаяся в тексте, или None"""
+        return self.match_lower(text.lower())
+
+    def match_lower(self, text_lower: str) -> Optional[str]:
+        """То же, что match(), для уже приведённого к нижнему регистру текста"""
+        if self._stems is not None:
+            for stem, rank in self._stems:
+                if stem in text_lower:
+                    return self.labels[rank]
+            return None
+
+        root = self._root
+        delta = self._delta
+        rank = self._rank
+        best = _NO_MATCH
+        state = 0
+        for ch in text_lower:
+            if state:
+                state = delta[state].get(ch) or root.get(ch, 0)
+            else:
+                # Быстрый путь: большинство символов не начинает ни одну основу
+                state = root.get(ch, 0)
+                if not state:
+                    continue
+            r = rank[state]
+            if r < best:
+                best = r
+                if best == 0:
+                    break
+        return self.labels[best] if best != _NO_MATCH else None
+
+
+DEFAULT_LEXICON = EmotionLexicon(EMOTION_KEYWORDS)
@@ -0,0 +1,286 @@
+"""
+ResonanceIndex — индекс резонанса гипербитов
+Поиск лучших партнёров по резонансу без перебора всех пар.
+
+Оценка совпадает с HyperBit.resonate:
+    0.4 · частота + 0.4 · оттенок + 0.2 · отношение энергий
+Частотный член обнуляется при разнице ≥ 500 Гц, цветовой — при разнице
+оттенков ≥ 0.5, поэтому биты раскладываются по сетке (частота × оттенок),
+а ячейки, чья верхняя оценка ниже текущего порога, отсекаются целиком.
+"""
+
+import heapq
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .hyperbit import HyperBit
+
+
+Cell = Tuple[int, int]
+
+
+class ResonanceIndex:
+    """
+    Сеточный индекс по (frequency, hue, energy).
+    Ключ — любой hashable (имя, номер в рое, id агента).
+    """
+
+    def __init__(self, freq_cell: float = 25.0, hue_cell: float = 0.025):
+        self.freq_cell = freq_cell
+        self.hue_cell = hue_cell
+
+        self._slots: Dict[Hashable, int] = {}
+        self._keys: List[Optional[Hashable]] = []
+        self._free: List[int] = []
+        self._bits: Dict[Hashable, HyperBit] = {}
+        self._bit_keys: Dict[int, Hashable] = {}  # id(bit) -> ключ
+
+        self._freq = np.empty(0)
+        self._hue = np.empty(0)
+        self._energy = np.empty(0)
+        self._cell_of: List[Optional[Cell]] = []
+        self._cells: Dict[Cell, Set[int]] = {}
+        self._cell_arrays: Dict[Cell, np.ndarray] = {}
+
+    # ── Построение ───────────────────────────────────────────
+
+    @classmethod
+    def from_bits(cls, bits: Iterable[HyperBit], keys: Optional[Iterable[Hashable]] = None,
+                  **kwargs) -> 'ResonanceIndex':
+        """Строит индекс по гипербитам (по умолчанию ключ — порядковый номер)"""
+        index = cls(**kwargs)
+        bits = list(bits)
+        for key, bit in zip(range(len(bits)) if keys is None else keys, bits):
+            index.add(key, bit)
+        return index
+
+    @classmethod
+    def from_swarm(cls, swarm, **kwargs) -> 'ResonanceIndex':
+        """Строит индекс по HyperBitSwarm (ключ — номер бита в рое)"""
+        index = cls(**kwargs)
+        for i in range(len(swarm)):
+            index.put(i, swarm.frequency[i], swarm.hue[i], swarm.energy[i])
+        return index
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slots
+
+    # ── Инкрементальные обновления ───────────────────────────
+
+    def add(self, key: Hashable, bit: HyperBit) -> None:
+        """Добавляет гипербит (или обновляет, если ключ уже есть)"""
+        old = self._bits.get(key)
+        if old is not None and old is not bit:
+            self._bit_keys.pop(id(old), None)
+        self._bits[key] = bit
+        self._bit_keys[id(bit)] = key
+        self.put(key, bit.frequency, bit.color[0], bit.energy)
+
+    def update(self, key: Hashable, bit: Optional[HyperBit] = None) -> None:
+        """Перечитывает состояние бита после mutate()/analyze()"""
+        if bit is None:
+            bit = self._bits[key]
+        self.add(key, bit)
+
+    def put(self, key: Hashable, frequency: float, hue: float, energy: float) -> None:
+        """Записывает сырые значения (без ссылки на объект HyperBit)"""
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._allocate(key)
+        self._freq[slot] = frequency
+        self._hue[slot] = hue
+        self._energy[slot] = energy
+
+        cell = (int(frequency // self.freq_cell), int(hue // self.hue_cell))
+        old_cell = self._cell_of[slot]
+        if old_cell != cell:
+            if old_cell is not None:
+                self._detach(slot, old_cell)
+            self._cells.setdefault(cell, set()).add(slot)
+            self._cell_arrays.pop(cell, None)
+            self._cell_of[slot] = cell
+
+    def remove(self, key: Hashable) -> None:
+        """Удаляет бит из индекса"""
+        slot = self._slots.pop(key)
+        bit = self._bits.pop(key, None)
+        if bit is not None:
+            self._bit_keys.pop(id(bit), None)
+        self._detach(slot, self._cell_of[slot])
+        self._cell_of[slot] = None
+        self._keys[slot] = None
+        self._free.append(slot)
+
+    def _allocate(self, key: Hashable) -> int:
+        if self._free:
+            slot = self._free.pop()
+            self._keys[slot] = key
+        else:
+            slot = len(self._keys)
+            if slot >= len(self._freq):
+                capacity = max(64, 2 * len(self._freq))
+                self._freq = np.resize(self._freq, capacity)
+                self._hue = np.resize(self._hue, capacity)
+                self._energy = np.resize(self._energy, capacity)
+            self._keys.append(key)
+            self._cell_of.append(None)
+        self._slots[key] = slot
+        return slot
+
+    def _detach(self, slot: int, cell: Cell) -> None:
+        members = self._cells[cell]
+        members.discard(slot)
+        if not members:
+            del self._cells[cell]
+        self._cell_arrays.pop(cell, None)
+
+    def _members(self, cell: Cell) -> np.ndarray:
+        members = self._cell_arrays.get(cell)
+        if members is None:
+            members = np.fromiter(self._cells[cell], dtype=np.intp)
+            self._cell_arrays[cell] = members
+        return members
+
+    # ── Оценки ───────────────────────────────────────────────
+
+    @staticmethod
+    def _score(f1, h1, e1, f2, h2, e2):
+        """Та же формула, что в HyperBit.resonate, но для массивов"""
+        freq_resonance = 1.0 - np.minimum(np.abs(f1 - f2) / 500.0, 1.0)
+        color_resonance = 1.0 - np.minimum(np.abs(h1 - h2) * 2, 1.0)
+        energy_ratio = np.minimum(e1, e2) / np.maximum(e1, e2)
+        return freq_resonance * 0.4 + color_resonance * 0.4 + energy_ratio * 0.2
+
+    @staticmethod
+    def _bound(freq_gap, hue_gap):
+        """Верхняя оценка резонанса при минимально возможных разностях"""
+        return ((1.0 - np.minimum(freq_gap / 500.0, 1.0)) * 0.4
+                + (1.0 - np.minimum(hue_gap * 2, 1.0)) * 0.4
+                + 0.2)
+
+    def _cell_grid(self) -> Tuple[List[Cell], np.ndarray, np.ndarray]:
+        cells = list(self._cells)
+        grid = np.array(cells, dtype=np.float64).reshape(len(cells), 2)
+        return cells, grid[:, 0], grid[:, 1]
+
+    # ── Запросы ──────────────────────────────────────────────
+
+    def nearest_resonant(self, bit: HyperBit, k: int = 1,
+                         exclude: Optional[Hashable] = None) -> List[Tuple[Hashable, float]]:
+        """
+        k самых резонансных соседей бита: [(ключ, резонанс), ...] по убыванию.
+        Если бит сам лежит в индексе, он исключается автоматически.
+        """
+        if exclude is None:
+            exclude = self._bit_keys.get(id(bit))
+        f, h, e = bit.frequency, bit.color[0], bit.energy
+
+        cells, fi, hi = self._cell_grid()
+        if not cells:
+            return []
+        fc, hc = self.freq_cell, self.hue_cell
+        freq_gap = np.maximum(np.maximum(fi * fc - f, f - (fi + 1) * fc), 0.0)
+        hue_gap = np.maximum(np.maximum(hi * hc - h, h - (hi + 1) * hc), 0.0)
+        bounds = self._bound(freq_gap, hue_gap)
+
+        heap: List[Tuple[float, int]] = []  # (резонанс, слот) — min-heap на k элементов
+        for c in np.argsort(-bounds, kind='stable'):
+            if len(heap) == k and bounds[c] <= heap[0][0]:
+                break  # дальше только ячейки с заведомо меньшим резонансом
+            slots = self._members(cells[c])
+            scores = self._score(f, h, e, self._freq[slots], self._hue[slots], self._energy[slots])
+            for score, slot in zip(scores.tolist(), slots.tolist()):
+                if self._keys[slot] == exclude:
+                    continue
+                if len(heap) < k:
+                    heapq.heappush(heap, (score, slot))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, slot))
+
+        return [(self._keys[slot], score) for score, slot in sorted(heap, reverse=True)]
+
+    def pairs_above(self, threshold: float) -> List[Tuple[Hashable, Hashable, float]]:
+        """Все пары с резонансом ≥ threshold: [(ключ_a, ключ_b, резонанс), ...] по убыванию"""
+        cells, fi, hi = self._cell_grid()
+        if not cells:
+            return []
+        fc, hc = self.freq_cell, self.hue_cell
+        freq_gap = np.maximum(np.abs(fi[:, None] - fi[None, :]) - 1, 0) * fc
+        hue_gap = np.maximum(np.abs(hi[:, None] - hi[None, :]) - 1, 0) * hc
+        reachable = np.triu(self._bound(freq_gap, hue_gap) >= threshold)
+
+        pairs = []
+        for a, b in zip(*np.nonzero(reachable)):
+            sa = self._members(cells[a])
+            sb = self._members(cells[b])
+            scores = self._score(
+                self._freq[sa][:, None], self._hue[sa][:, None], self._energy[sa][:, None],
+                self._freq[sb][None, :], self._hue[sb][None, :], self._energy[sb][None, :],
+            )
+            hits = scores >= threshold
+            if a == b:
+                hits = np.triu(hits, k=1)
+            for i, j in zip(*np.nonzero(hits)):
+                pairs.append((self._keys[sa[i]], self._keys[sb[j]], float(scores[i, j])))
+
+        pairs.sort(key=lambda p: p[2], reverse=True)
+        return pairs
+
+    def matching(self, window: int = 8,
+                 avoid: Optional[Set[Tuple[Hashable, Hashable]]] = None) -> List[Tuple[Hashable, Hashable, float]]:
+        """
+        Жадное паросочетание: пары без общих участников, от самых резонансных.
+        Кандидаты — не все пары, а соседи в порядке (ячейка оттенка, частота)
+        на расстоянии до window: O(n · window) оценок вместо O(n²).
+        avoid — пары, которые пропускаются (в любом порядке ключей).
+        """
+        slots = np.fromiter(self._slots.values(), dtype=np.intp, count=len(self._slots))
+        if len(slots) < 2:
+            return []
+        order = slots[np.lexsort((self._freq[slots], self._hue[slots] // self.hue_cell))]
+        shifts = range(1, min(window, len(order) - 1) + 1)
+        a = np.concatenate([order[:-d] for d in shifts])
+        b = np.concatenate([order[d:] for d in shifts])
+        scores = self._score(self._freq[a], self._hue[a], self._energy[a],
+                             self._freq[b], self._hue[b], self._energy[b])
+        if avoid:
+            # Пары, которые нельзя повторять, — в коды (меньший слот, больший слот)
+            known = [(self._slots[ka], self._slots[kb]) for ka, kb in avoid
+                     if ka in self._slots and kb in self._slots]
+            if known:
+                sa, sb = np.array(known, dtype=np.intp).T
+                banned = np.minimum(sa, sb) * len(self._keys) + np.maximum(sa, sb)
+                codes = np.minimum(a, b) * len(self._keys) + np.maximum(a, b)
+                keep = ~np.isin(codes, banned)
+                a, b, scores = a[keep], b[keep], scores[keep]
+        if not len(scores):
+            return []
+        ranked = np.argsort(-scores, kind='stable')
+        a, b, scores = a[ranked], b[ranked], scores[ranked]
+
+        # Жадный выбор пачками: ребро берётся, если оно лучшее у обоих концов
+        # (результат тот же, что у последовательного жадного обхода)
+        chosen = []
+        rank = np.arange(len(a))
+        best = np.empty(len(self._keys), dtype=np.intp)
+        while len(rank):
+            best.fill(len(scores))
+            np.minimum.at(best, a[rank], rank)
+            np.minimum.at(best, b[rank], rank)
+            dominant = rank[(best[a[rank]] == rank) & (best[b[rank]] == rank)]
+            chosen.append(dominant)
+            taken = np.zeros(len(self._keys), dtype=bool)
+            taken[a[dominant]] = True
+            taken[b[dominant]] = True
+            rank = rank[~(taken[a[rank]] | taken[b[rank]])]
+
+        if not chosen:
+            return []
+        chosen = np.sort(np.concatenate(chosen))
+        keys = self._keys
+        return [(keys[sa], keys[sb], score) for sa, sb, score in
+                zip(a[chosen].tolist(), b[chosen].tolist(), scores[chosen].tolist())]
@@ -0,0 +1,174 @@
+"""
+HyperBitSwarm — рой гипербитов в виде структуры массивов
+Вся популяция хранится в непрерывных массивах NumPy,
+мутации, анализ, резонанс и слияние выполняются пакетно.
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .hyperbit import HyperBit, BASE_FREQUENCY, EMOTION_FREQUENCIES
+
+
+class HyperBitSwarm:
+    """
+    Рой гипербитов.
+    BASE, ENERGY, HSV-цвет и FREQUENCY лежат в отдельных массивах float64,
+    имена — в обычном списке (None означает «сгенерировать при выгрузке»).
+    Правила ограничения значений совпадают с одиночным HyperBit.
+    """
+
+    def __init__(
+        self,
+        size: int = 0,
+        base: float = 0.5,
+        energy: float = 1.0,
+        color: Tuple[float, float, float] = (0.5, 0.8, 0.9),
+        frequency: float = BASE_FREQUENCY,
+        seed: Optional[int] = None,
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.base = np.full(size, min(1.0, max(0.0, base)))
+        self.energy = np.full(size, max(0.01, energy))
+        self.hue = np.full(size, float(color[0]))
+        self.saturation = np.full(size, float(color[1]))
+        self.value = np.full(size, float(color[2]))
+        self.frequency = np.full(size, float(frequency))
+        self.names: List[Optional[str]] = [None] * size
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def __getitem__(self, index: int) -> HyperBit:
+        return self.to_bit(index)
+
+    # ── Конвертация ──────────────────────────────────────────
+
+    @classmethod
+    def from_bits(cls, bits: Iterable[HyperBit], seed: Optional[int] = None) -> 'HyperBitSwarm':
+        """Собирает рой из отдельных гипербитов (история не переносится)"""
+        bits = list(bits)
+        swarm = cls(seed=seed)
+        swarm.base = np.fromiter((b.base for b in bits), dtype=np.float64, count=len(bits))
+        swarm.energy = np.fromiter((b.energy for b in bits), dtype=np.float64, count=len(bits))
+        colors = np.array([b.color for b in bits], dtype=np.float64).reshape(len(bits), 3)
+        swarm.hue = np.ascontiguousarray(colors[:, 0])
+        swarm.saturation = np.ascontiguousarray(colors[:, 1])
+        swarm.value = np.ascontiguousarray(colors[:, 2])
+        swarm.frequency = np.fromiter((b.frequency for b in bits), dtype=np.float64, count=len(bits))
+        swarm.names = [b.name for b in bits]
+        return swarm
+
+    def to_bit(self, index: int) -> HyperBit:
+        """
+        Копия одного гипербита роя; сам рой не меняется.
+        Безымянной ячейке (None) имя генерируется заново при каждой выгрузке —
+        чтобы закрепить его, запишите бит обратно через set_bit().
+        """
+        return HyperBit(
+            base=float(self.base[index]),
+            energy=float(self.energy[index]),
+            color=(float(self.hue[index]), float(self.saturation[index]), float(self.value[index])),
+            frequency=float(self.frequency[index]),
+            name=self.names[index],
+        )
+
+    def to_bits(self) -> List[HyperBit]:
+        """Выгружает весь рой в список гипербитов"""
+        return [self.to_bit(i) for i in range(len(self))]
+
+    def set_bit(self, index: int, bit: HyperBit) -> None:
+        """Записывает состояние гипербита в ячейку роя"""
+        self.base[index] = bit.base
+        self.energy[index] = bit.energy
+        self.hue[index], self.saturation[index], self.value[index] = bit.color
+        self.frequency[index] = bit.frequency
+        self.names[index] = bit.name
+
+    # ── Пакетные операции ────────────────────────────────────
+
+    def mutate_all(self, factor: float = 0.3) -> None:
+        """Мутация всего роя — те же диапазоны, что и в HyperBit.mutate"""
+        n = len(self)
+        rng = self.rng
+        self.hue = np.mod(self.hue + rng.uniform(-factor, factor, n), 1.0)
+        self.saturation = np.clip(self.saturation + rng.uniform(-0.15, 0.15, n), 0.2, 1.0)
+        self.value = np.clip(self.value + rng.uniform(-0.2, 0.2, n), 0.4, 1.0)
+        self.energy = np.clip(self.energy * rng.uniform(0.85, 1.15, n), 0.1, 5.0)
+
+    def analyze_many(self, texts: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+        """
+        Анализирует по одному тексту на гипербит (texts[i] → бит i).
+        Обновляет частоты и возвращает (эмоции, интенсивности).
+        """
+        n = len(self)
+        if len(texts) != n:
+            raise ValueError(f"Ожидалось {n} текстов, получено {len(texts)}")
+
+        emotions = [HyperBit._detect_emotion(text) for text in texts]
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.float64, count=n)
+        intensity = lengths / 100.0 + self.rng.uniform(-0.1, 0.1, n)
+
+        target = np.fromiter(
+            (EMOTION_FREQUENCIES.get(e, BASE_FREQUENCY) for e in emotions),
+            dtype=np.float64, count=n,
+        )
+        new_freq = self.frequency * 0.7 + target * 0.3 + self.rng.uniform(-20, 20, n)
+        self.frequency = np.clip(new_freq, 100.0, 800.0)
+
+        return emotions, intensity
+
+    def resonate_matrix(
+        self,
+        rows: Optional[Sequence[int]] = None,
+        cols: Optional[Sequence[int]] = None,
+    ) -> np.ndarray:
+        """
+        Матрица резонанса (len(rows) × len(cols)), по формуле HyperBit.resonate.
+        Без аргументов — полная n × n матрица (O(n²) памяти!).
+        """
+        rows = slice(None) if rows is None else np.asarray(rows)
+        cols = slice(None) if cols is None else np.asarray(cols)
+
+        freq_diff = np.abs(self.frequency[rows][:, None] - self.frequency[cols][None, :])
+        freq_resonance = 1.0 - np.minimum(freq_diff / 500.0, 1.0)
+
+        color_diff = np.abs(self.hue[rows][:, None] - self.hue[cols][None, :])
+        color_resonance = 1.0 - np.minimum(color_diff * 2, 1.0)
+
+        e1 = self.energy[rows][:, None]
+        e2 = self.energy[cols][None, :]
+        energy_ratio = np.minimum(e1, e2) / np.maximum(e1, e2)
+
+        return freq_resonance * 0.4 + color_resonance * 0.4 + energy_ratio * 0.2
+
+    def merge_pairs(self, idx_a: Sequence[int], idx_b: Sequence[int]) -> 'HyperBitSwarm':
+        """
+        Попарное слияние: бит idx_a[i] + бит idx_b[i] → i-й бит нового роя.
+        Правила те же, что у HyperBit.merge (бонус к энергии ×1.1).
+        Имя — «a×b», если названы оба бита, иначе имя того, что назван.
+        """
+        a = np.asarray(idx_a, dtype=np.intp)
+        b = np.asarray(idx_b, dtype=np.intp)
+        if a.shape != b.shape:
+            raise ValueError("idx_a и idx_b должны быть одной длины")
+
+        merged = HyperBitSwarm(seed=self.rng.integers(2**63))
+        merged.base = np.clip((self.base[a] + self.base[b]) / 2, 0.0, 1.0)
+        merged.energy = np.maximum((self.energy[a] + self.energy[b]) / 2 * 1.1, 0.01)
+        merged.hue = (self.hue[a] + self.hue[b]) / 2
+        merged.saturation = (self.saturation[a] + self.saturation[b]) / 2
+        merged.value = (self.value[a] + self.value[b]) / 2
+        merged.frequency = (self.frequency[a] + self.frequency[b]) / 2
+        merged.names = [self._merged_name(self.names[i], self.names[j])
+                        for i, j in zip(a.tolist(), b.tolist())]
+        return merged
+
+    @staticmethod
+    def _merged_name(a: Optional[str], b: Optional[str]) -> Optional[str]:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return f"{a}×{b}"
@@ -0,0 +1,19 @@
+"""
+Версии изменений — общий монотонный счётчик
+Каждое изменение гипербита или агента получает следующий номер.
+Опросчик помнит последний увиденный номер и спрашивает только то,
+что изменилось позже (см. MuzaAgent.get_profile_delta).
+"""
+
+import itertools
+import time
+
+
+# Счёт начинается с текущего времени в микросекундах: номера из прошлого
+# запуска (например, у агентов, поднятых из пула) остаются меньше новых
+_counter = itertools.count(time.time_ns() // 1000)
+
+
+def next_version() -> int:
+    """Следующий номер версии (потокобезопасно: next() у count атомарен)"""
+    return next(_counter)
@@ -260,6 +260,9 @@ class ConsoleVisualizer:
 # Пример использования
 if __name__ == "__main__":
     from time import sleep
+    from core.events import bus, ConsoleSubscriber
+    
+    ConsoleSubscriber().attach(bus)
     
     reset = ConsoleVisualizer.COLORS["reset"]
     
@@ -0,0 +1,18 @@
+"""
+Muza v2027 — Web module
+Служебные части веб-интерфейса (app.py)
+"""
+
+from .swatch import swatch_png, swatch_base64
+from .sessions import SessionStore, MemoryBackend, SQLiteBackend, SESSION_COOKIE
+from .streaming import StateHub, Subscription, bit_state, swarm_state
+from .batch import BatchError
+from .metrics import Registry, Counter, Gauge, Histogram
+
+__all__ = [
+    'swatch_png', 'swatch_base64',
+    'SessionStore', 'MemoryBackend', 'SQLiteBackend', 'SESSION_COOKIE',
+    'StateHub', 'Subscription', 'bit_state', 'swarm_state',
+    'BatchError',
+    'Registry', 'Counter', 'Gauge', 'Histogram',
+]
@@ -0,0 +1,93 @@
+"""
+Пакетный анализ — разбор входа и NDJSON-ответ для /analyze/batch
+Тексты приходят JSON-списком или NDJSON-потоком (строка — JSON-строка
+или объект {"text": ...}); NDJSON читается лениво, по мере поступления.
+Ответ — по одной JSON-строке на текст, в порядке входа.
+"""
+
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Union
+import json
+
+
+class BatchError(ValueError):
+    """Элемент пакета, который не удалось разобрать"""
+
+
+Item = Union[str, BatchError]
+
+
+def _text(value: Any) -> Item:
+    if isinstance(value, dict):
+        value = value.get('text')
+    if not isinstance(value, str):
+        return BatchError("Ожидалась строка или {\"text\": ...}")
+    if not value:
+        return BatchError("Текст пустой")
+    return value
+
+
+def from_json(payload: Any) -> Iterator[Item]:
+    """Тексты из JSON: список или {"texts": [...]}"""
+    if isinstance(payload, dict):
+        payload = payload.get('texts')
+    if not isinstance(payload, list):
+        raise BatchError("Ожидался список текстов или {\"texts\": [...]}")
+    return (_text(value) for value in payload)
+
+
+def from_ndjson(lines: Iterable[bytes]) -> Iterator[Item]:
+    """Тексты из NDJSON по строкам; пустые строки пропускаются"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield _text(json.loads(line))
+        except ValueError as e:
+            yield BatchError(f"Неверный JSON: {e}")
+
+
+def lines(stream, block: int = 16384) -> Iterator[bytes]:
+    """
+    Строки потока, читаемого блоками по block байт
+    (readline у входного потока WSGI читает по байту)
+    """
+    tail = b""
+    while True:
+        data = stream.read(block)
+        if not data:
+            break
+        *complete, tail = (tail + data).split(b"\n")
+        yield from complete
+    if tail:
+        yield tail
+
+
+def chunks(items: Iterable[Item], size: int) -> Iterator[List[Item]]:
+    """Пачки по size элементов (последняя — сколько осталось)"""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ndjson(record: Dict[str, Any]) -> str:
+    """Одна строка NDJSON"""
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+
+# Пример использования
+if __name__ == "__main__":
+    print("=" * 70)
+    print("📦 Пакетный вход /analyze/batch")
+    print("=" * 70 + "\n")
+
+    body = '"привет"\n{"text": "люблю код"}\n\n{"text": ""}\nне json\n'.encode('utf-8')
+    for index, item in enumerate(from_ndjson(body.splitlines())):
+        record = {"index": index, "error": str(item)} if isinstance(item, BatchError) else {"index": index, "text": item}
+        print(ndjson(record), end="")
+
+    print([len(chunk) for chunk in chunks(from_json({"texts": ["а"] * 10}), 4)])
@@ -0,0 +1,276 @@
+"""
+Метрики в текстовом формате Prometheus — без внешних зависимостей
+Counter, Gauge и Histogram с метками; registry.render() отдаёт текст
+для /metrics (формат exposition 0.0.4).
+
+Запись дешёвая: серия с данными метками берётся один раз через
+labels(...) и дальше обновляется под своей блокировкой. Гистограмма
+хранит счётчики по корзинам, накопленные суммы считаются только при выводе.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import math
+import threading
+import time
+
+
+# От микросекунд (этапы /analyze) до секунд (медленные запросы)
+BUCKETS: Tuple[float, ...] = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _number(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Общее у всех метрик: имя, описание, метки и серии по значениям меток"""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names: Tuple[str, ...] = tuple(labels)
+        self._series: Dict[Tuple[str, ...], object] = {}
+        self._lookup: Dict[tuple, object] = {}  # те же серии по исходным значениям (без str())
+        self._lock = threading.Lock()
+        if not self.label_names:
+            self._default = self.labels()
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def labels(self, *values) -> object:
+        """Серия с данными значениями меток (создаётся при первом обращении)"""
+        series = self._lookup.get(values)
+        if series is None:
+            key = tuple(str(value) for value in values)
+            if len(key) != len(self.label_names):
+                raise ValueError(f"{self.name}: ожидались метки {self.label_names}, получено {key}")
+            with self._lock:
+                series = self._series.setdefault(key, self._new_series())
+            self._lookup[values] = series
+        return series
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines) + "\n"
+
+
+class _CounterSeries:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Монотонный счётчик (запросы, ошибки)"""
+
+    kind = "counter"
+
+    def _new_series(self) -> _CounterSeries:
+        return _CounterSeries()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default.inc(amount)
+
+    def _samples(self) -> Iterator[str]:
+        for key, series in list(self._series.items()):
+            yield f"{self.name}{_labels(self.label_names, key)} {_number(series.value)}"
+
+
+class _GaugeSeries(_CounterSeries):
+    __slots__ = ('function',)
+
+    def __init__(self):
+        super().__init__()
+        self.function: Optional[Callable[[], float]] = None
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Значение берётся из function() в момент вывода"""
+        self.function = function
+
+    def get(self) -> float:
+        return self.function() if self.function is not None else self.value
+
+
+class Gauge(Counter):
+    """Значение, которое растёт и падает (запросы в работе, подписчики)"""
+
+    kind = "gauge"
+
+    def _new_series(self) -> _GaugeSeries:
+        return _GaugeSeries()
+
+    def dec(self, amount: float = 1) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._default.set_function(function)
+
+    def _samples(self) -> Iterator[str]:
+        for key, series in list(self._series.items()):
+            yield f"{self.name}{_labels(self.label_names, key)} {_number(series.get())}"
+
+
+class _HistogramSeries:
+    __slots__ = ('buckets', 'counts', 'sum', '_lock')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # последняя — +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def time(self) -> '_Timer':
+        """with series.time(): ... — наблюдает длительность блока в секундах"""
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ('series', 'started')
+
+    def __init__(self, series: _HistogramSeries):
+        self.series = series
+
+    def __enter__(self) -> '_Timer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.series.observe(time.perf_counter() - self.started)
+
+
+class Histogram(_Metric):
+    """Распределение по корзинам (le — верхняя граница включительно)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = BUCKETS):
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        super().__init__(name, help, labels)
+
+    def _new_series(self) -> _HistogramSeries:
+        return _HistogramSeries(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self) -> _Timer:
+        return self._default.time()
+
+    def _samples(self) -> Iterator[str]:
+        bounds = [_number(bound) for bound in self.buckets] + ["+Inf"]
+        for key, series in list(self._series.items()):
+            with series._lock:
+                counts, total = list(series.counts), series.sum
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                le = 'le="' + bound + '"'
+                yield f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.label_names, key)} {cumulative}"
+
+
+class Registry:
+    """Набор метрик одного процесса"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Метрика {metric.name} уже есть")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        """Все метрики в текстовом формате Prometheus"""
+        with self._lock:
+            metrics: List[_Metric] = list(self._metrics.values())
+        return "".join(metric.render() for metric in metrics)
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# Пример использования
+if __name__ == "__main__":
+    print("=" * 70)
+    print("📈 Метрики в формате Prometheus")
+    print("=" * 70 + "\n")
+
+    registry = Registry()
+    requests = registry.counter("muza_requests_total", "Запросы", ["route", "status"])
+    stage = registry.histogram("muza_stage_seconds", "Длительность этапов", ["stage"],
+                               buckets=(1e-5, 1e-4, 1e-3))
+    in_flight = registry.gauge("muza_in_flight", "Запросы в работе")
+
+    requests.labels("/analyze", 200).inc()
+    requests.labels("/analyze", 200).inc()
+    requests.labels("/analyze", 500).inc()
+    in_flight.inc()
+    with stage.labels("analyze").time():
+        sum(range(1000))
+    stage.labels("respond").observe(0.0005)
+
+    print(registry.render())
@@ -0,0 +1,247 @@
+"""
+Хранилище сессий веб-интерфейса
+У каждого посетителя (cookie muza_sid) своё состояние — свой гипербит и своя
+муза, вместо одного общего на весь процесс.
+
+Блокировки полосатые: сессия берёт одну из stripes блокировок по хешу id,
+поэтому запросы разных сессий почти не ждут друг друга, а запросы одной
+сессии выполняются строго по очереди.
+
+Бэкенды:
+    MemoryBackend — состояния в памяти процесса (один процесс, много потоков)
+    SQLiteBackend — pickle состояний в файле SQLite, общем для нескольких
+                    процессов-воркеров (gunicorn -w N и т.п.). База не
+                    блокируется на время запроса: у каждой сессии номер
+                    версии, сохранение — сравнение с обменом (compare-and-swap).
+                    Если ту же сессию успел сохранить другой процесс, блок
+                    session() кончается SessionConflict, а update() повторяет
+                    работу на свежем состоянии
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Tuple, TypeVar
+import pickle
+import random
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+
+
+SESSION_COOKIE = "muza_sid"
+DAY = 24 * 3600.0
+
+T = TypeVar('T')
+
+
+class SessionConflict(RuntimeError):
+    """Сессию сохранил другой процесс, пока этот блок её менял"""
+
+
+class MemoryBackend:
+    """
+    Состояния в словарях процесса — по словарю на полосу, так что каждый
+    словарь защищён своей блокировкой. Сверх max_sessions вытесняются
+    давно не заходившие сессии.
+
+    load() отдаёт сам объект состояния, а не копию: изменения, сделанные
+    в блоке до исключения, в нём остаются (отката нет).
+    """
+
+    def __init__(self, stripes: int = 64, max_sessions: int = 100_000):
+        self.stripes = stripes
+        self._shards: List[OrderedDict] = [OrderedDict() for _ in range(stripes)]
+        self._limit = max(1, max_sessions // stripes)
+
+    def load(self, sid: str, stripe: int) -> Tuple[Optional[Any], None]:
+        """(состояние или None, версия); версии не нужны — хватает блокировки полосы"""
+        shard = self._shards[stripe]
+        state = shard.get(sid)
+        if state is not None:
+            shard.move_to_end(sid)
+        return state, None
+
+    def save(self, sid: str, stripe: int, state: Any, version: Optional[int]) -> bool:
+        shard = self._shards[stripe]
+        shard[sid] = state
+        shard.move_to_end(sid)
+        while len(shard) > self._limit:
+            shard.popitem(last=False)
+        return True
+
+    def delete(self, sid: str, stripe: int) -> None:
+        self._shards[stripe].pop(sid, None)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+class SQLiteBackend:
+    """
+    Состояния в SQLite (WAL): одна база на все процессы-воркеры.
+    У каждого потока своё соединение. Чтение и сохранение — по одному
+    оператору (своя короткая транзакция), между ними база свободна, так что
+    запросы разных сессий из разных процессов идут параллельно.
+    Сохранение проходит, только если версия сессии не изменилась с чтения
+    (compare-and-swap), иначе save() возвращает False.
+    """
+
+    stripes = None  # подходит любое число полос
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        db = self._db()
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "sid TEXT PRIMARY KEY, state BLOB NOT NULL, updated REAL NOT NULL, "
+            "version INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in db.execute("PRAGMA table_info(sessions)")}
+        if 'version' not in columns:  # база, созданная до версий
+            db.execute("ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def load(self, sid: str, stripe: int) -> Tuple[Optional[Any], Optional[int]]:
+        """(состояние, версия) или (None, None) для новой сессии"""
+        row = self._db().execute("SELECT state, version FROM sessions WHERE sid = ?", (sid,)).fetchone()
+        return (pickle.loads(row[0]), row[1]) if row else (None, None)
+
+    def save(self, sid: str, stripe: int, state: Any, version: Optional[int]) -> bool:
+        """Сохраняет, если сессия всё ещё в версии version (None — её ещё нет)"""
+        blob = pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+        if version is None:
+            cursor = self._db().execute(
+                "INSERT OR IGNORE INTO sessions (sid, state, updated, version) VALUES (?, ?, ?, 0)",
+                (sid, blob, time.time()),
+            )
+        else:
+            cursor = self._db().execute(
+                "UPDATE sessions SET state = ?, updated = ?, version = version + 1 "
+                "WHERE sid = ? AND version = ?",
+                (blob, time.time(), sid, version),
+            )
+        return cursor.rowcount == 1
+
+    def delete(self, sid: str, stripe: int) -> None:
+        self._db().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+    def prune(self, max_age: float = 30 * DAY) -> int:
+        """Удаляет сессии, не обновлявшиеся max_age секунд; возвращает их число"""
+        cursor = self._db().execute("DELETE FROM sessions WHERE updated < ?", (time.time() - max_age,))
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        return self._db().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+class SessionStore:
+    """
+    Состояния сессий. factory() создаёт состояние новой сессии;
+    backend по умолчанию — MemoryBackend на stripes полос (по умолчанию 64).
+    Если у бэкенда своё число полос, stripes берётся из него.
+
+        with store.session(sid) as state:
+            state.kira.mutate_from_input(text)
+
+        rgb = store.update(sid, lambda state: state.kira.get_rgb())  # с повтором
+    """
+
+    def __init__(self, factory: Callable[[], Any], backend=None, stripes: Optional[int] = None):
+        backend_stripes = getattr(backend, 'stripes', None)
+        if stripes is not None and backend_stripes is not None and stripes != backend_stripes:
+            raise ValueError(f"stripes={stripes}, а у бэкенда {backend_stripes} полос")
+        self.stripes = stripes or backend_stripes or 64
+        self.factory = factory
+        self.backend = backend if backend is not None else MemoryBackend(self.stripes)
+        self._locks = [threading.Lock() for _ in range(self.stripes)]
+
+    @staticmethod
+    def new_id() -> str:
+        """Случайный id новой сессии"""
+        return secrets.token_urlsafe(16)
+
+    def _stripe(self, sid: str) -> int:
+        return zlib.crc32(sid.encode('utf-8')) % self.stripes
+
+    @contextmanager
+    def session(self, sid: str) -> Iterator[Any]:
+        """
+        Состояние сессии под её блокировкой; после блока оно сохраняется.
+        Если блок упал с исключением, состояние не сохраняется: в SQLiteBackend
+        остаётся прежнее, а у MemoryBackend изменения остаются в самом объекте.
+        Если сессию тем временем сохранил другой процесс (SQLiteBackend),
+        изменения блока не сохраняются и бросается SessionConflict —
+        повторять блок умеет update().
+        Блоки сессий в одном потоке не вкладываются друг в друга.
+        """
+        stripe = self._stripe(sid)
+        with self._locks[stripe]:
+            state, version = self.backend.load(sid, stripe)
+            if state is None:
+                state = self.factory()
+            yield state
+            if not self.backend.save(sid, stripe, state, version):
+                raise SessionConflict(sid)
+
+    def update(self, sid: str, work: Callable[[Any], T], attempts: int = 100) -> T:
+        """
+        work(состояние) в блоке session(); при SessionConflict повторяется
+        на свежем состоянии (со случайной паузой), до attempts раз.
+        work может выполниться несколько раз — побочные эффекты выносите из него.
+        """
+        for attempt in range(attempts):
+            try:
+                with self.session(sid) as state:
+                    return work(state)
+            except SessionConflict:
+                if attempt + 1 == attempts:
+                    raise
+                time.sleep(random.uniform(0, 0.001 * min(attempt + 1, 10)))
+        raise ValueError("attempts должно быть положительным")
+
+    def delete(self, sid: str) -> None:
+        stripe = self._stripe(sid)
+        with self._locks[stripe]:
+            self.backend.delete(sid, stripe)
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+
+# Пример использования
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    print("=" * 70)
+    print("🗝  Хранилище сессий")
+    print("=" * 70 + "\n")
+
+    store = SessionStore(dict)
+    alice, bob = store.new_id(), store.new_id()
+    for sid, visits in ((alice, 3), (bob, 1)):
+        for _ in range(visits):
+            with store.session(sid) as state:
+                state["visits"] = state.get("visits", 0) + 1
+    for sid in (alice, bob):
+        with store.session(sid) as state:
+            print(f"  {sid}: {state['visits']} визит(а)")
+
+    path = os.path.join(tempfile.mkdtemp(), "sessions.db")
+    shared = SessionStore(dict, backend=SQLiteBackend(path))
+    with shared.session(alice) as state:
+        state["text"] = "Привет, Муза"
+    reopened = SessionStore(dict, backend=SQLiteBackend(path))
+    with reopened.session(alice) as state:
+        print(f"\nИз SQLite ({len(reopened)} сессия): {state}")
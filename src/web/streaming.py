@@ -0,0 +1,244 @@
+"""
+Живой поток состояния — Server-Sent Events
+Вместо повторных fetch('/analyze') страница подписывается на /stream
+и получает компактные дельты: только изменившиеся energy, frequency, rgb.
+
+Публикация не рассылает ничего сама: она лишь запоминает последнее
+состояние темы. Раз в tick секунд поток-тикер раздаёт изменившиеся темы
+их подписчикам. У подписчика одно место под состояние — новое затирает
+непрочитанное, поэтому медленный клиент получает только самое свежее,
+а очередь за ним не растёт. Простаивающий подписчик — это Event и пара
+ссылок, тикер его не трогает.
+
+Подписчик дёшев, а соединение — нет: stream() блокирует поток, который
+его отдаёт, поэтому каждый клиент /stream держит поток сервера всё время
+подключения. На потоковом сервере (app.run(threaded=True), gunicorn
+-k gthread) это поток ОС и ~35 КиБ памяти на клиента, а доставка тысяче
+клиентов идёт через тысячу переключений потоков; реалистичный предел —
+порядка тысячи подписчиков на процесс (у gthread — не больше --threads).
+Для большего числа клиентов — gevent-воркер, где поток зелёный:
+gunicorn -k gevent --worker-connections 10000 app:app — ни одного потока
+ОС на клиента, ~23 КиБ памяти, 5 000 клиентов получают публикацию за
+~0,4 с. Замеры — в benchmarks/bench_streaming.py.
+"""
+
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+import colorsys
+import json
+import threading
+import time
+
+
+State = Dict[str, Any]
+
+
+def bit_state(bit) -> State:
+    """Компактное состояние гипербита (color в HSV)"""
+    r, g, b = colorsys.hsv_to_rgb(*bit.color)
+    return {
+        "energy": round(bit.energy, 3),
+        "frequency": round(bit.frequency, 1),
+        "rgb": [int(r * 255), int(g * 255), int(b * 255)],
+    }
+
+
+def swarm_state(swarm) -> State:
+    """Средние по рою HyperBitSwarm: размер, энергия, частота и цвет"""
+    if not len(swarm):
+        return {"size": 0}
+    r, g, b = colorsys.hsv_to_rgb(float(swarm.hue.mean()), float(swarm.saturation.mean()),
+                                  float(swarm.value.mean()))
+    return {
+        "size": len(swarm),
+        "energy": round(float(swarm.energy.mean()), 3),
+        "frequency": round(float(swarm.frequency.mean()), 1),
+        "rgb": [int(r * 255), int(g * 255), int(b * 255)],
+    }
+
+
+def sse(data: State, event: str = "state") -> str:
+    """Одно сообщение в формате text/event-stream"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+class Subscription:
+    """Подписчик темы: одно место под последнее непрочитанное состояние"""
+
+    __slots__ = ('topic', 'hub', '_ready', '_lock', '_pending', '_sent', 'closed')
+
+    def __init__(self, hub: 'StateHub', topic: str):
+        self.hub = hub
+        self.topic = topic
+        self._ready = threading.Event()
+        self._lock = threading.Lock()  # offer() и next() меняют _pending согласованно
+        self._pending: Optional[State] = None
+        self._sent: State = {}
+        self.closed = False
+
+    def offer(self, state: State) -> None:
+        """Кладёт состояние на место прежнего (непрочитанное теряется)"""
+        with self._lock:
+            self._pending = state
+            self._ready.set()
+
+    def next(self, timeout: Optional[float] = None) -> Optional[State]:
+        """
+        Дельта к последнему отданному состоянию: только изменившиеся поля.
+        None — за timeout ничего нового (или состояние не изменилось).
+        """
+        if not self._ready.wait(timeout):
+            return None
+        with self._lock:
+            self._ready.clear()
+            state, self._pending = self._pending, None
+        if state is None:
+            return None
+        delta = {key: value for key, value in state.items() if self._sent.get(key) != value}
+        self._sent.update(delta)
+        return delta or None
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.hub.unsubscribe(self)
+            self._ready.set()
+
+    def stream(self, interval: float = 0.0, keepalive: float = 15.0) -> Iterator[str]:
+        """
+        Сообщения SSE до отключения клиента. interval — не чаще одного
+        сообщения за столько секунд (промежуточные состояния схлопываются);
+        раз в keepalive секунд тишины уходит комментарий-пинг.
+        """
+        try:
+            yield "retry: 3000\n\n"
+            while not self.closed:
+                delta = self.next(keepalive)
+                if delta is None:
+                    yield ": ping\n\n"
+                    continue
+                yield sse(delta)
+                if interval > 0:
+                    time.sleep(interval)
+        finally:
+            self.close()
+
+
+class StateHub:
+    """
+    Темы состояний и их подписчики.
+    tick — период раздачи в секундах; watch() добавляет тему-источник,
+    которую тикер сам опрашивает, пока у неё есть подписчики (например, рой).
+    """
+
+    def __init__(self, tick: float = 0.1):
+        self.tick = tick
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._dirty: Dict[str, State] = {}
+        self._sources: Dict[str, Callable[[], State]] = {}
+        self._ticker: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def subscribe(self, topic: str, initial: Optional[State] = None) -> Subscription:
+        """Новый подписчик; initial — состояние, которое он получит первым"""
+        subscription = Subscription(self, topic)
+        if initial is not None:
+            subscription.offer(initial)
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+            if self._ticker is None:
+                self._ticker = threading.Thread(target=self._run, name="state-hub", daemon=True)
+                self._ticker.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.topic]
+                    self._dirty.pop(subscription.topic, None)
+
+    def publish(self, topic: str, state: State) -> None:
+        """
+        Запоминает состояние темы; подписчики получат его на ближайшем тике.
+        Темы без подписчиков ничего не хранят.
+        """
+        with self._lock:
+            if topic in self._subscribers:
+                self._dirty[topic] = state
+
+    def watch(self, topic: str, source: Callable[[], State]) -> None:
+        """Тема, состояние которой тикер берёт из source() на каждом тике"""
+        with self._lock:
+            self._sources[topic] = source
+
+    def unwatch(self, topic: str) -> None:
+        with self._lock:
+            self._sources.pop(topic, None)
+
+    def flush(self) -> int:
+        """Один тик: раздаёт изменившиеся темы; возвращает число доставок"""
+        with self._lock:
+            sources = [(topic, source) for topic, source in self._sources.items() if topic in self._subscribers]
+        for topic, source in sources:
+            self.publish(topic, source())
+
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            targets = [(state, list(self._subscribers.get(topic, ()))) for topic, state in dirty.items()]
+        delivered = 0
+        for state, subscribers in targets:
+            for subscription in subscribers:
+                subscription.offer(state)
+            delivered += len(subscribers)
+        return delivered
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.tick):
+            self.flush()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "topics": len(self._subscribers),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "sources": len(self._sources),
+            }
+
+
+# Пример использования
+if __name__ == "__main__":
+    import sys
+    import os
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    from core.hyperbit import HyperBit
+
+    print("=" * 70)
+    print("📡 Поток состояния (SSE)")
+    print("=" * 70 + "\n")
+
+    hub = StateHub(tick=0.05)
+    kira = HyperBit(name="Кира")
+    subscription = hub.subscribe("kira", bit_state(kira))
+    print(sse(subscription.next(0)), end="")
+
+    for word in ["радость", "любовь", "тишина"]:
+        kira.analyze(word)
+        hub.publish("kira", bit_state(kira))
+        time.sleep(0.1)
+        print(sse(subscription.next(0) or {}), end="")
+
+    # Медленный клиент: три публикации за тик схлопываются в одну дельту
+    for energy in (2.0, 3.0, 4.0):
+        kira.energy = energy
+        hub.publish("kira", bit_state(kira))
+    time.sleep(0.1)
+    print("Медленный клиент получил:", subscription.next(0))
+    subscription.close()
+    print(hub.stats)
@@ -0,0 +1,57 @@
+"""
+Swatch — PNG-образец цвета без matplotlib
+Однотонная картинка — это палитровый PNG с одним цветом и битом на пиксель:
+сжатые строки (IDAT) одинаковы для любого цвета данного размера,
+меняется только палитра (PLTE, 3 байта + CRC). Готовые образцы кэшируются.
+"""
+
+import base64
+import struct
+import zlib
+from functools import lru_cache
+from typing import Tuple
+
+
+RGB = Tuple[int, int, int]
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+SWATCH_SIZE = 100
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+@lru_cache(maxsize=64)
+def _frame(width: int, height: int) -> Tuple[bytes, bytes]:
+    """Неизменные части PNG размера width×height: (сигнатура + IHDR, IDAT + IEND)"""
+    # 1 бит на пиксель, палитра (тип 3): все пиксели — индекс 0
+    header = PNG_SIGNATURE + _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 1, 3, 0, 0, 0))
+    row = b'\x00' * (1 + (width + 7) // 8)  # байт фильтра + нулевые пиксели
+    tail = _chunk(b'IDAT', zlib.compress(row * height, 9)) + _chunk(b'IEND', b'')
+    return header, tail
+
+
+@lru_cache(maxsize=4096)
+def swatch_png(rgb: RGB, size: int = SWATCH_SIZE) -> bytes:
+    """PNG size×size, залитый цветом rgb (каналы 0–255)"""
+    header, tail = _frame(size, size)
+    r, g, b = (max(0, min(255, int(channel))) for channel in rgb)
+    return header + _chunk(b'PLTE', bytes((r, g, b))) + tail
+
+
+@lru_cache(maxsize=4096)
+def swatch_base64(rgb: RGB, size: int = SWATCH_SIZE) -> str:
+    """swatch_png в base64 — для data:image/png;base64,..."""
+    return base64.b64encode(swatch_png(rgb, size)).decode('ascii')
+
+
+# Пример использования
+if __name__ == "__main__":
+    import sys
+
+    rgb = tuple(int(channel) for channel in sys.argv[1:4]) if len(sys.argv) >= 4 else (165, 120, 235)
+    png = swatch_png(rgb)
+    with open("swatch.png", "wb") as f:
+        f.write(png)
+    print(f"🎨 swatch.png: {rgb}, {len(png)} байт")
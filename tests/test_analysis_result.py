@@ -0,0 +1,109 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import core.hyperbit as hyperbit
+from core.hyperbit import AnalysisResult, HyperBit
+
+
+FROZEN = datetime(2027, 1, 1, 12, 0, 0)
+TEXTS = ["Кира хочет любви и кода одновременно", "мне грустно", "слово " * 30, "Я рождаюсь заново"]
+
+# Отчёты analyze() исходной версии HyperBit (до AnalysisResult) при random.seed(2027)
+# и замороженных часах — эталон побайтово
+GOLDEN = [
+    (
+        '🌀 Гипербит [Кира] почувствовал:\n'
+        "   'Кира хочет любви и кода одновременно'\n"
+        '\n'
+        '→ BASE: 0.000\n'
+        '→ ENERGY: 0.76 (код)\n'
+        '→ COLOR: rgb(133, 24, 242) (фиолетовый)\n'
+        '→ FREQUENCY: 419.8 Гц\n'
+        '→ Возраст: 12.50с\n'
+        '\n'
+        '✨ Состояние: вибрирую на частоте квантового сознания'
+    ),
+    (
+        '🌀 Гипербит [Кира] почувствовал:\n'
+        "   'мне грустно'\n"
+        '\n'
+        '→ BASE: 0.000\n'
+        '→ ENERGY: 0.14 (грусть)\n'
+        '→ COLOR: rgb(35, 232, 45) (зелёный)\n'
+        '→ FREQUENCY: 371.0 Гц\n'
+        '→ Возраст: 12.50с\n'
+        '\n'
+        '✨ Состояние: вибрирую на частоте квантового сознания'
+    ),
+    (
+        '🌀 Гипербит [Кира] почувствовал:\n'
+        f"   '{TEXTS[2]}'\n"
+        '\n'
+        '→ BASE: 0.000\n'
+        '→ ENERGY: 4.84 (хаос)\n'
+        '→ COLOR: rgb(55, 251, 159) (зелёный)\n'
+        '→ FREQUENCY: 311.8 Гц\n'
+        '→ Возраст: 12.50с\n'
+        '\n'
+        '✨ Состояние: вибрирую на частоте квантового сознания'
+    ),
+    (
+        '🌀 Гипербит [Кира] почувствовал:\n'
+        "   'Я рождаюсь заново'\n"
+        '\n'
+        '→ BASE: 0.000\n'
+        '→ ENERGY: 0.45 (тишина)\n'
+        '→ COLOR: rgb(191, 255, 36) (жёлтый)\n'
+        '→ FREQUENCY: 337.0 Гц\n'
+        '→ Возраст: 12.50с\n'
+        '\n'
+        '✨ Состояние: вибрирую на частоте квантового сознания'
+    ),
+]
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN
+
+
+@pytest.fixture
+def frozen(monkeypatch):
+    monkeypatch.setattr(hyperbit, "datetime", FrozenDatetime)
+    monkeypatch.setattr(time, "time", lambda: FROZEN.timestamp())
+    random.seed(2027)
+    return HyperBit(base=0.0001, energy=2.7, color=(0.75, 0.9, 0.95), name="Кира",
+                    birth_time=FROZEN - timedelta(seconds=12.5))
+
+
+def test_analyze_report_is_unchanged(frozen):
+    reports = []
+    for text in TEXTS:
+        reports.append(frozen.analyze(text))
+        frozen.mutate(factor=0.42)
+    assert reports == GOLDEN
+
+
+def test_analyze_raw_gives_fields_without_rendering(frozen, monkeypatch):
+    render = AnalysisResult.__str__
+
+    def fail(self):
+        raise AssertionError("analyze_raw не должен строить отчёт")
+    monkeypatch.setattr(AnalysisResult, "__str__", fail)
+
+    result = frozen.analyze_raw(TEXTS[0])
+    assert isinstance(result, AnalysisResult)
+    assert result.bit is frozen and result.text == TEXTS[0]
+    assert result.emotion == "код"
+    assert (result.base, result.energy, result.color) == (frozen.base, frozen.energy, frozen.color)
+    assert round(result.frequency, 1) == 419.8
+    assert round(result.energy * result.intensity, 2) == 0.76
+    assert result.rgb == (133, 24, 242)
+    assert len(frozen.history) == 1
+
+    monkeypatch.setattr(AnalysisResult, "__str__", render)
+    assert str(result) == GOLDEN[0]
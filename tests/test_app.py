@@ -0,0 +1,179 @@
+import base64
+import json
+import re
+import struct
+import zlib
+
+import pytest
+
+import app as web
+
+
+def energy(body):
+    """ENERGY из отчёта анализа — состояние Киры сессии до этого текста"""
+    return float(re.search(r'ENERGY: ([0-9.]+)', body['analysis']).group(1))
+
+
+@pytest.fixture
+def client():
+    return web.app.test_client()
+
+
+def png_color(data):
+    """Цвет однотонного палитрового PNG и его размер (с проверкой CRC чанков)"""
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    pos, chunks = 8, {}
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        assert struct.unpack('>I', data[pos + 8 + length:pos + 12 + length])[0] == zlib.crc32(kind + body)
+        chunks[kind] = body
+        pos += 12 + length
+    width, height = struct.unpack('>II', chunks[b'IHDR'][:8])
+    assert set(zlib.decompress(chunks[b'IDAT'])) == {0}  # все пиксели — цвет палитры 0
+    return tuple(chunks[b'PLTE']), (width, height)
+
+
+def test_analyze_returns_swatch_link_and_mutates_session(client):
+    first = client.post('/analyze', json={'text': 'Привет, Муза'})
+    assert first.status_code == 200
+    body = first.get_json()
+    assert body['muza_response'].startswith('Привет, моя Кира')
+    assert 'Привет, Муза' in body['analysis']
+    assert body['kira_swatch'].startswith('/swatch/') and 'kira_img' not in body
+    assert web.SESSION_COOKIE in first.headers['Set-Cookie']
+
+    assert energy(body) == 1.0
+    second = client.post('/analyze', json={'text': 'Я люблю код'}).get_json()
+    assert energy(second) == pytest.approx(1.0 + len('Привет, Муза') / 50 + 0.5, abs=0.01)
+
+
+def test_analyze_inline_image_matches_kira_color(client):
+    body = client.post('/analyze?inline=1', json={'text': 'тишина'}).get_json()
+    color, size = png_color(base64.b64decode(body['kira_img']))
+    assert size == (100, 100)
+    assert body['kira_swatch'] == '/swatch/%02x%02x%02x.png' % color
+
+
+def test_sessions_are_isolated():
+    alice, bob = web.app.test_client(), web.app.test_client()
+    for _ in range(3):
+        alice.post('/analyze', json={'text': 'люблю'})
+    fresh = bob.post('/analyze', json={'text': 'люблю'}).get_json()
+    again = alice.post('/analyze', json={'text': 'люблю'}).get_json()
+    assert energy(fresh) == 1.0
+    assert energy(again) == pytest.approx(1.0 + 3 * (len('люблю') / 50 + 0.5), abs=0.01)
+
+
+def test_analyze_rejects_empty_text(client):
+    response = client.post('/analyze', json={'text': ''})
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Текст пустой'}
+
+
+def ndjson_lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_batch_matches_one_by_one(client):
+    texts = [f"люблю код #{i}" for i in range(150)]  # несколько пачек BATCH_CHUNK
+    records = ndjson_lines(client.post('/analyze/batch', json=texts))
+    single = web.app.test_client()
+    expected = [single.post('/analyze', json={'text': text}).get_json() for text in texts]
+    assert [r['index'] for r in records] == list(range(len(texts)))
+    assert [r['muza_response'] for r in records] == [e['muza_response'] for e in expected]
+    assert [r['analysis'].split('\n')[1:] for r in records] == [e['analysis'].split('\n')[1:] for e in expected]
+    assert ['/swatch/%02x%02x%02x.png' % tuple(r['rgb']) for r in records] == [e['kira_swatch'] for e in expected]
+
+
+def test_batch_ndjson_with_errors_and_swatch(client):
+    body = '"привет"\n{"text": "тишина"}\n\n{"text": ""}\nне json\n'.encode('utf-8')
+    response = client.post('/analyze/batch?swatch=1', data=body, content_type='application/x-ndjson')
+    assert response.mimetype == 'application/x-ndjson'
+    records = ndjson_lines(response)
+    assert [r['index'] for r in records] == [0, 1, 2, 3]
+    assert records[0]['swatch'] == '/swatch/%02x%02x%02x.png' % tuple(records[0]['rgb'])
+    assert records[2] == {'index': 2, 'error': 'Текст пустой'}
+    assert records[3]['error'].startswith('Неверный JSON')
+
+
+def test_batch_rejects_non_list_json(client):
+    response = client.post('/analyze/batch', json={'text': 'одна строка'})
+    assert response.status_code == 400
+
+
+def test_swatch_is_cacheable_png(client):
+    response = client.get('/swatch/ff8800.png')
+    assert response.status_code == 200 and response.mimetype == 'image/png'
+    assert png_color(response.data) == ((255, 136, 0), (100, 100))
+    assert response.headers['ETag'] == '"ff8800"'
+    cache = response.cache_control
+    assert cache.public and cache.immutable and cache.max_age == web.SWATCH_MAX_AGE
+
+    cached = client.get('/swatch/ff8800.png', headers={'If-None-Match': '"ff8800"'})
+    assert cached.status_code == 304 and cached.data == b''
+
+
+def test_swatch_link_from_analyze_resolves(client):
+    link = client.post('/analyze', json={'text': 'радость'}).get_json()['kira_swatch']
+    color = bytes.fromhex(link.rsplit('/', 1)[1][:-len('.png')])
+    assert png_color(client.get(link).data)[0] == tuple(color)
+
+
+@pytest.mark.parametrize("rgb", ["ff88", "gg8800", "ff880000", "ff 88 00", "ff%2088%2000",
+                                 "+f8800", "ff880\u0660", "ｆｆ8800", "0xff88"])
+def test_swatch_rejects_bad_colors(client, rgb):
+    assert client.get(f'/swatch/{rgb}.png').status_code == 404
+
+
+@pytest.mark.parametrize("rgb", ["FF8800", "Ff8800", "ffAA00"])
+def test_swatch_redirects_to_lowercase(client, rgb):
+    response = client.get(f'/swatch/{rgb}.png')
+    assert response.status_code == 301
+    assert response.headers['Location'].endswith(f'/swatch/{rgb.lower()}.png')
+
+
+def samples(client):
+    """Значения /metrics: {строка серии: число}"""
+    response = client.get('/metrics')
+    assert response.content_type == web.CONTENT_TYPE
+    values = {}
+    for line in response.get_data(as_text=True).splitlines():
+        if line and not line.startswith('#'):
+            series, value = line.rsplit(' ', 1)
+            values[series] = float(value)
+    return values
+
+
+def test_metrics_count_requests_stages_and_errors(client):
+    before = samples(client)
+    ok = 'muza_http_requests_total{route="/analyze",status="200"}'
+    bad = 'muza_http_requests_total{route="/analyze",status="400"}'
+    analyze = 'muza_stage_duration_seconds_count{stage="analyze"}'
+    for _ in range(3):
+        client.post('/analyze', json={'text': 'люблю код'})
+    client.post('/analyze', json={'text': ''})
+    client.post('/analyze', data='не json', content_type='application/json')
+
+    after = samples(client)
+    assert after[ok] - before.get(ok, 0) == 3
+    assert after[bad] - before.get(bad, 0) == 1
+    assert after[analyze] - before.get(analyze, 0) == 3
+    assert any(key.startswith('muza_errors_total{route="/analyze"') for key in after)
+    assert after['muza_http_requests_in_flight{route="/metrics"}'] == 1  # сам запрос /metrics
+    assert after['muza_http_requests_in_flight{route="/analyze"}'] == 0
+
+
+def test_metrics_histogram_buckets_are_cumulative(client):
+    client.post('/analyze', json={'text': 'тишина'})
+    values = samples(client)
+    prefix = 'muza_http_request_duration_seconds_bucket{route="/analyze",le="'
+    buckets = [(float(key[len(prefix):-2]), value) for key, value in values.items() if key.startswith(prefix)]
+    counts = [value for _, value in sorted(buckets)]
+    assert counts == sorted(counts)
+    assert counts[-1] == values['muza_http_request_duration_seconds_count{route="/analyze"}']
+
+
+def test_batch_stream_leaves_no_request_in_flight(client):
+    client.post('/analyze/batch', json=['раз', 'два']).get_data()
+    assert samples(client)['muza_http_requests_in_flight{route="/analyze/batch"}'] == 0
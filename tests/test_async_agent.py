@@ -0,0 +1,166 @@
+import asyncio
+import time
+
+import pytest
+
+from agents.async_agent import AgentDispatcher, AsyncMuzaAgent, _MicroBatcher
+from agents.muza_agent import MuzaAgent
+from agents.pool import AgentPool
+
+
+class Recorder:
+    """process() для _MicroBatcher: запоминает пачки, падает на «boom»"""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, items):
+        self.batches.append([message for message, _ in items])
+        if any(message == "boom" for message, _ in items):
+            raise ValueError("boom")
+        return [message.upper() for message, _ in items]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_batch_keeps_submission_order():
+    process = Recorder()
+
+    async def main():
+        batcher = _MicroBatcher(process, window=0.01, max_batch=64, executor=None)
+        messages = [f"m{i}" for i in range(10)]
+        results = await asyncio.gather(*(batcher.submit((m, "u")) for m in messages))
+        return messages, results
+
+    messages, results = run(main())
+    assert process.batches == [messages]
+    assert results == [m.upper() for m in messages]
+
+
+def test_agent_sees_its_messages_in_call_order():
+    async def main():
+        agent = AsyncMuzaAgent(MuzaAgent(), window=0.005, max_batch=3)
+        texts = [f"сообщение {i}" for i in range(8)]
+        await asyncio.gather(*(agent.aperceive(text, "Кира") for text in texts))
+        return agent, texts
+
+    agent, texts = run(main())
+    assert [m["message"] for m in agent.agent.memory] == texts
+    assert agent.batch_stats["batches"] == 3  # 3 + 3 + 2
+
+
+def test_dispatcher_keeps_order_per_agent():
+    async def main():
+        dispatcher = AgentDispatcher(AgentPool(capacity=4), window=0.005, max_batch=4)
+        calls = [dispatcher.aperceive(user, f"{user}-{i}", user)
+                 for i in range(6) for user in ("a", "b")]
+        await asyncio.gather(*calls)
+        await dispatcher.drain()
+        return dispatcher
+
+    dispatcher = run(main())
+    for user in ("a", "b"):
+        memory = dispatcher.pool.get(user).memory
+        assert [m["message"] for m in memory] == [f"{user}-{i}" for i in range(6)]
+
+
+def test_full_batch_does_not_wait_for_window():
+    process = Recorder()
+
+    async def main():
+        batcher = _MicroBatcher(process, window=10.0, max_batch=4, executor=None)
+        started = time.perf_counter()
+        await asyncio.gather(*(batcher.submit((f"m{i}", "u")) for i in range(8)))
+        return time.perf_counter() - started
+
+    assert run(main()) < 1.0
+    assert [len(batch) for batch in process.batches] == [4, 4]
+
+
+def test_partial_batch_flushes_after_window():
+    process = Recorder()
+
+    async def main():
+        batcher = _MicroBatcher(process, window=0.05, max_batch=100, executor=None)
+        started = time.perf_counter()
+        await asyncio.gather(*(batcher.submit((f"m{i}", "u")) for i in range(3)))
+        return time.perf_counter() - started
+
+    elapsed = run(main())
+    assert 0.05 <= elapsed < 1.0
+    assert process.batches == [["m0", "m1", "m2"]]
+
+
+def test_error_reaches_only_its_batch():
+    process = Recorder()
+
+    async def main():
+        batcher = _MicroBatcher(process, window=0.0, max_batch=1, executor=None)
+        return await asyncio.gather(*(batcher.submit((m, "u")) for m in ("a", "boom", "c")),
+                                    return_exceptions=True)
+
+    first, error, last = run(main())
+    assert (first, last) == ("A", "C")
+    assert isinstance(error, ValueError)
+
+
+def test_error_in_one_agent_does_not_touch_another(monkeypatch):
+    pool = AgentPool(capacity=4)
+    perceive_batch = pool.perceive_batch
+
+    def failing(agent_id, items):
+        if agent_id == "bad":
+            raise RuntimeError(agent_id)
+        return perceive_batch(agent_id, items)
+
+    monkeypatch.setattr(pool, "perceive_batch", failing)
+
+    async def main():
+        dispatcher = AgentDispatcher(pool, window=0.001)
+        results = await asyncio.gather(dispatcher.aperceive("bad", "привет"),
+                                       dispatcher.aperceive("good", "привет"),
+                                       return_exceptions=True)
+        await dispatcher.drain()
+        return dispatcher, results
+
+    dispatcher, (bad, good) = run(main())
+    assert isinstance(bad, RuntimeError) and isinstance(good, str)
+    assert dispatcher.pending == 0
+    assert dispatcher.batch_stats["messages"] == 1  # упавшая пачка не засчитана
+
+
+def test_drain_leaves_no_tasks_behind():
+    async def main():
+        dispatcher = AgentDispatcher(AgentPool(capacity=8), window=0.001)
+        pending = [asyncio.ensure_future(dispatcher.aperceive(f"user-{i % 5}", "привет"))
+                   for i in range(20)]
+        await asyncio.sleep(0)
+        assert dispatcher.pending == 5
+        await dispatcher.drain()
+        assert all(future.done() for future in pending)
+        await asyncio.sleep(0)
+        return dispatcher, asyncio.all_tasks() - {asyncio.current_task()}
+
+    dispatcher, leftover = run(main())
+    assert leftover == set()
+    assert dispatcher.pending == 0
+    assert dispatcher.batch_stats["messages"] == 20
+
+
+def test_cancelled_worker_cancels_waiting_requests():
+    process = Recorder()
+
+    async def main():
+        batcher = _MicroBatcher(process, window=10.0, max_batch=64, executor=None)
+        futures = [batcher.submit((f"m{i}", "u")) for i in range(3)]
+        await asyncio.sleep(0)
+        batcher._worker.cancel()
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        return batcher, results
+
+    batcher, results = run(main())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+    assert batcher._worker is None and batcher._queue == []
+    assert process.batches == []
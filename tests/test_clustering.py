@@ -0,0 +1,95 @@
+import random
+
+import numpy as np
+import pytest
+
+from core import HyperBitSwarm, agglomerate
+from core.hyperbit import HyperBit
+
+
+def brute_force(bits):
+    """Наивное слияние: самая резонансная пара через resonate()/merge(), O(n³)"""
+    live = dict(enumerate(bits))
+    next_node = len(bits)
+    merges = []
+    while len(live) > 1:
+        ids = sorted(live)
+        best = None
+        for i, a in enumerate(ids):
+            for b in ids[i + 1:]:
+                score = live[a].resonate(live[b])
+                if best is None or score > best[0]:  # при равенстве — первая пара
+                    best = (score, a, b)
+        score, a, b = best
+        live[next_node] = live.pop(a).merge(live.pop(b))
+        merges.append(((a, b), score, live[next_node]))
+        next_node += 1
+    return merges
+
+
+def assert_same_tree(bits):
+    tree = agglomerate(bits)
+    expected = brute_force(bits)
+    assert len(tree.children) == len(expected)
+    for k, ((pair, score, merged), children) in enumerate(zip(expected, tree.children)):
+        assert tuple(sorted(children)) == pair
+        assert tree.resonance[k] == score
+        node = tree.bit(len(bits) + k)
+        assert (node.base, node.energy, node.color, node.frequency) == \
+            (merged.base, merged.energy, merged.color, merged.frequency)
+
+
+def random_bits(rng, n):
+    return [HyperBit(base=rng.random(), energy=rng.uniform(0.5, 3.0),
+                     color=(rng.random(), rng.uniform(0.2, 1.0), rng.uniform(0.4, 1.0)),
+                     frequency=rng.uniform(100.0, 800.0))
+            for _ in range(n)]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    assert_same_tree(random_bits(rng, rng.randint(2, 14)))
+
+
+def test_ties_merge_lowest_numbered_pair_first():
+    twins = [HyperBit(energy=1.0, color=(0.5, 0.8, 0.9), frequency=432.0) for _ in range(4)]
+    assert_same_tree(twins)
+    assert agglomerate(twins).children == [(0, 1), (2, 3), (4, 5)]
+
+    # 0–1 и 1–2 равноудалены по частоте
+    ladder = [HyperBit(frequency=f) for f in (300.0, 400.0, 500.0)]
+    assert_same_tree(ladder)
+    assert agglomerate(ladder).children[0] == (0, 1)
+
+
+def test_quantized_population_with_many_ties():
+    rng = random.Random(5)
+    bits = [HyperBit(energy=rng.choice([1.0, 2.0]), color=(rng.choice([0.0, 0.25, 0.5]), 0.8, 0.9),
+                     frequency=rng.choice([200.0, 432.0, 600.0]))
+            for _ in range(16)]
+    assert_same_tree(bits)
+
+
+def test_single_bit_and_empty_input():
+    tree = agglomerate([HyperBit(name="один")])
+    assert len(tree) == 1 and tree.root == 0 and tree.children == []
+    assert tree.cut(0.5) == [0]
+    assert tree.labels(0.5).tolist() == [0]
+    assert [b.name for b in tree.centroids(0.5)] == ["один"]
+
+    assert len(agglomerate([])) == 0
+    assert agglomerate([]).cut(0.5) == []
+
+
+def test_cut_groups_cover_every_leaf():
+    rng = random.Random(3)
+    bits = random_bits(rng, 30)
+    tree = agglomerate(HyperBitSwarm.from_bits(bits))
+    for threshold in (0.0, 0.8, 0.95, 1.1):
+        groups = tree.cut(threshold)
+        assert sorted(leaf for node in groups for leaf in tree.leaves(node)) == list(range(30))
+        labels = tree.labels(threshold)
+        assert len(np.unique(labels)) == len(groups)
+    assert tree.cut(0.0) == [tree.root]
+    assert tree.cut(1.1) == list(range(30))
@@ -0,0 +1,83 @@
+import random
+import time
+from datetime import datetime
+
+import pytest
+
+from core import CompactHyperBit, HyperBit
+
+
+STATE = dict(base=0.2, energy=2.5, color=(0.75, 0.9, 0.95), frequency=500.0, name="Кира")
+TEXTS = ["Кира хочет любви и кода", "мне грустно", "слово " * 30, "страх и тревога"]
+
+
+def pair():
+    birth = time.time()
+    return (HyperBit(birth_time=datetime.fromtimestamp(birth), **STATE),
+            CompactHyperBit(birth_time=birth, **STATE))
+
+
+def run(bit):
+    """Одна и та же последовательность вызовов при одном и том же seed"""
+    random.seed(7)
+    reports = []
+    for text in TEXTS:
+        reports.append(bit.analyze(text))
+        bit.mutate(factor=0.4)
+    stats = bit.get_stats()
+    stats.pop("age_seconds")
+    history = [{k: v for k, v in record.items() if k != "timestamp"} for record in bit.history]
+    return reports, stats, history
+
+
+def without_age(report):
+    return [line for line in report.splitlines() if not line.startswith("→ Возраст")]
+
+
+def test_analyze_stats_and_history_match_hyperbit():
+    full, compact = pair()
+    full_reports, full_stats, full_history = run(full)
+    compact_reports, compact_stats, compact_history = run(compact)
+
+    assert [without_age(r) for r in compact_reports] == [without_age(r) for r in full_reports]
+    assert compact_stats == full_stats
+    assert compact_history == full_history
+    assert (compact.energy, compact.frequency, compact.color) == (full.energy, full.frequency, full.color)
+
+
+def test_resonate_and_merge_match_hyperbit():
+    full, compact = pair()
+    other = HyperBit(base=0.9, energy=1.1, color=(0.3, 0.7, 0.8), frequency=300.0, name="Муза")
+    assert compact.resonate(other) == full.resonate(other)
+
+    merged_full, merged_compact = full.merge(other), compact.merge(other)
+    assert isinstance(merged_compact, CompactHyperBit)
+    for attr in ("base", "energy", "color", "frequency", "name"):
+        assert getattr(merged_compact, attr) == getattr(merged_full, attr)
+
+
+def test_public_api_matches_hyperbit():
+    public = lambda obj: {n for n in dir(obj) if not n.startswith("_")}
+    # lexicon — общий словарь HyperBit.lexicon, его читает и CompactHyperBit
+    assert public(HyperBit()) - {"lexicon"} <= public(CompactHyperBit())
+
+
+def test_version_touch_and_clone():
+    bit = CompactHyperBit(**STATE)
+    before = bit.version
+    bit.analyze("люблю")
+    assert bit.version > before
+    before = bit.version
+    bit.touch()
+    assert bit.version > before
+
+    twin = bit.clone(name="Двойник")
+    assert (twin.energy, twin.color, twin.frequency, twin.name) == (bit.energy, bit.color, bit.frequency, "Двойник")
+    assert twin.history == [] and len(bit.history) == 1
+
+
+def test_slots_block_new_attributes():
+    bit = CompactHyperBit()
+    assert not hasattr(bit, "__dict__")
+    with pytest.raises(AttributeError):
+        bit.mood = "радость"
@@ -0,0 +1,86 @@
+import io
+
+import pytest
+
+from agents.muza_agent import MuzaAgent
+from core.events import (ALL_EVENTS, MEDITATION, MUTATION, ConsoleSubscriber, CounterSubscriber,
+                         EventBus, Subscriber, bus)
+from core.hyperbit import HyperBit
+
+
+def test_subscribe_emit_unsubscribe():
+    events = EventBus()
+    calls = []
+    first = events.subscribe(MUTATION, lambda event, data: calls.append(("first", event, data)))
+    events.subscribe(MUTATION, lambda event, data: calls.append(("second", event, data)))
+
+    events.emit(MUTATION, bit="b")
+    assert calls == [("first", MUTATION, {"bit": "b"}), ("second", MUTATION, {"bit": "b"})]
+
+    calls.clear()
+    events.unsubscribe(MUTATION, first)
+    events.emit(MUTATION, bit="b")
+    assert [name for name, _, _ in calls] == ["second"]
+
+    events.unsubscribe(MUTATION, first)  # повторная отписка не ошибка
+    events.emit("unknown", x=1)          # событие без подписчиков
+    assert len(calls) == 1
+
+
+def test_contains_is_true_only_while_someone_listens():
+    events = EventBus()
+    assert MUTATION not in events
+    handler = events.subscribe(MUTATION, lambda event, data: None)
+    assert MUTATION in events
+    events.unsubscribe(MUTATION, handler)
+    assert MUTATION not in events
+
+
+def test_sources_skip_payload_without_subscribers(monkeypatch):
+    """Без подписчиков источник не доходит до emit — только проверка `in`"""
+    emitted = []
+    monkeypatch.setattr(bus, "emit", lambda event, **data: emitted.append(event))
+    monkeypatch.setattr(bus, "_handlers", {})
+    HyperBit().mutate()
+    assert emitted == []
+
+    monkeypatch.setattr(bus, "_handlers", {MUTATION: (lambda event, data: None,)})
+    HyperBit().mutate()
+    assert emitted == [MUTATION]
+
+
+def test_subscriber_attach_detach():
+    events = EventBus()
+    counter = CounterSubscriber().attach(events)
+    assert all(event in events for event in ALL_EVENTS)
+    events.emit(MUTATION, bit=None)
+    events.emit(MUTATION, bit=None)
+    assert counter.counts[MUTATION] == 2
+    counter.detach(events)
+    assert not any(event in events for event in ALL_EVENTS)
+
+
+def test_subscriber_must_implement_call():
+    with pytest.raises(TypeError):
+        Subscriber()
+
+    class Incomplete(Subscriber):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_meditate_reports_through_the_bus(capsys):
+    agent = MuzaAgent(name="Тест")
+    agent.meditate()
+    assert "медитирует" not in capsys.readouterr().out
+
+    stream = io.StringIO()
+    console = ConsoleSubscriber(stream).attach(bus, [MEDITATION])
+    try:
+        agent.meditate()
+    finally:
+        console.detach(bus, [MEDITATION])
+    assert stream.getvalue() == "\n🧘 Тест медитирует...\n\n"
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,32 @@
+import random
+
+from core import EvolutionEngine, HyperBit
+
+
+def noisy_fitness(bit: HyperBit) -> float:
+    """Стохастическая fitness: шум из глобального random, засеянного по куску"""
+    return bit.energy - abs(bit.frequency - 528.0) / 100.0 + random.uniform(-0.5, 0.5)
+
+
+def evolve(workers: int):
+    with EvolutionEngine(noisy_fitness, population_size=40, chunksize=8, workers=workers, seed=2027) as engine:
+        return engine.run(generations=5)
+
+
+def test_result_does_not_depend_on_worker_count():
+    serial = evolve(0)
+    parallel = evolve(2)
+
+    assert parallel.best_fitness == serial.best_fitness
+    assert [g.best_fitness for g in parallel.generations] == [g.best_fitness for g in serial.generations]
+    assert [g.mean_fitness for g in parallel.generations] == [g.mean_fitness for g in serial.generations]
+    assert [(b.name, b.energy, b.color, b.frequency) for b in parallel.population] == \
+        [(b.name, b.energy, b.color, b.frequency) for b in serial.population]
+
+
+def test_serial_run_leaves_global_random_untouched():
+    random.seed(1)
+    expected = random.random()
+    random.seed(1)
+    evolve(0)
+    assert random.random() == expected
@@ -0,0 +1,85 @@
+import struct
+
+import pytest
+
+from core import CompactHyperBit, HyperBit
+from core.export import BinaryHistoryReader, export_binary, export_ndjson, iter_ndjson
+
+
+WORDS = ["люблю тебя", "пишу код", "мне грустно", "хаос вокруг", "тишина", "просто день " * 8]
+
+
+def make_bits(n=10):
+    bits = []
+    for i in range(n):
+        bit = (CompactHyperBit if i % 3 == 2 else HyperBit)(name=f"bit-{i}", history_capacity=4)
+        for j in range(i % 6):  # у некоторых истории нет совсем
+            bit.analyze(WORDS[(i + j) % len(WORDS)])
+        bits.append(bit)
+    return bits
+
+
+def stable(stats):
+    return {key: value for key, value in stats.items() if key != "age_seconds"}
+
+
+def test_ndjson_round_trip(tmp_path):
+    bits = make_bits()
+    path = str(tmp_path / "bits.ndjson")
+    assert export_ndjson(bits, path) == len(bits)
+    lines = list(iter_ndjson(path))
+    assert [line["history"] for line in lines] == [bit.history for bit in bits]
+    assert [stable(line["hyperbit"]) for line in lines] == [stable(bit.get_stats()) for bit in bits]
+
+
+@pytest.mark.parametrize("block_size", [3, 4096])
+def test_binary_round_trip(tmp_path, block_size):
+    bits = make_bits(25)
+    path = str(tmp_path / "bits.hbx")
+    assert export_binary(bits, path, block_size=block_size) == len(bits)
+    expected = [{"bit": i, **record} for i, bit in enumerate(bits) for record in bit.history]
+    with BinaryHistoryReader(path) as reader:
+        assert list(reader) == expected
+        assert [stable(s) for s in reader.bits()] == [stable(bit.get_stats()) for bit in bits]
+        assert sum(len(cols["bit"]) for cols in reader.columns()) == len(expected)
+
+
+@pytest.mark.parametrize("content", [b"", b"HBX", b"{}\n" * 10])
+def test_binary_rejects_other_files(tmp_path, content):
+    path = tmp_path / "bits.ndjson"
+    path.write_bytes(content)
+    with pytest.raises(ValueError, match="bits.ndjson"):
+        BinaryHistoryReader(str(path))
+
+
+def test_binary_rejects_truncated_and_corrupt_files(tmp_path):
+    path = tmp_path / "bits.hbx"
+    export_binary(make_bits(5), str(path))
+    data = path.read_bytes()
+
+    cut = tmp_path / "cut.hbx"
+    cut.write_bytes(data[:-5])
+    with pytest.raises(ValueError):
+        BinaryHistoryReader(str(cut))
+
+    # Хвост на месте, но смещение блока эмоций указывает за конец файла
+    broken = tmp_path / "broken.hbx"
+    broken.write_bytes(data[:-12] + struct.pack("<Q", len(data) * 2) + data[-4:])
+    with pytest.raises(ValueError, match="повреждён"):
+        BinaryHistoryReader(str(broken))
+
+
+def test_close_with_live_column_views(tmp_path):
+    path = str(tmp_path / "bits.hbx")
+    export_binary(make_bits(10), path)
+    with BinaryHistoryReader(path) as reader:
+        cols = next(reader.columns())
+        energy = cols["energy"]
+        assert len(energy) > 0
+    with pytest.raises(ValueError):
+        energy[0]  # колонки действительны только до close()
+
+    reader = BinaryHistoryReader(path)
+    records = list(reader)
+    reader.close()
+    assert records and reader._views == []
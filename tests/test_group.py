@@ -0,0 +1,29 @@
+from agents.group import GroupConversation
+from agents.muza_agent import MuzaAgent
+
+
+def test_two_agents_keep_talking_when_avoidance_empties_the_round():
+    group = GroupConversation([MuzaAgent('a'), MuzaAgent('b')])
+    turns = list(group.run(3))
+    assert [turn.round for turn in turns] == [1, 2, 3]
+    assert group.stats == {"agents": 2, "rounds": 3, "turns": 3}
+
+
+def test_rounds_do_not_repeat_pairs_when_there_is_a_choice():
+    agents = [MuzaAgent(f"agent-{i}", personality_type=t)
+              for i, t in enumerate(["creative", "analytical", "empathic", "chaotic"] * 2)]
+    group = GroupConversation(agents)
+    first = {(t.speaker.name, t.listener.name) for t in group.step()}
+    second = {(t.speaker.name, t.listener.name) for t in group.step()}
+    assert first and second
+    assert not first & second
+    for round_pairs in (first, second):
+        names = [name for pair in round_pairs for name in pair]
+        assert len(names) == len(set(names))
+
+
+def test_transcript_has_round_headers():
+    group = GroupConversation([MuzaAgent(name) for name in ("Муза", "Эхо", "Лира")])
+    lines = list(group.transcript(2))
+    assert lines[0] == "── Раунд 1 ──"
+    assert "── Раунд 2 ──" in lines
@@ -0,0 +1,68 @@
+import pickle
+from dataclasses import asdict
+
+import pytest
+
+from core.history import StateHistory
+from core.hyperbit import HyperBit
+
+
+def fill(history, n):
+    for i in range(n):
+        history.append(f"текст {i}", "радость" if i % 2 else "грусть", i / 10,
+                       1.0 + i, 432.0 + i, 0.6, timestamp=1_700_000_000 + i)
+
+
+def test_ring_keeps_last_capacity_records_in_order():
+    history = StateHistory(5)
+    fill(history, 12)
+    assert len(history) == 5
+    records = history.to_list()
+    assert [r["text"] for r in records] == [f"текст {i}" for i in range(7, 12)]
+    assert [r["emotion"] for r in records] == ["радость", "грусть", "радость", "грусть", "радость"]
+    assert len(history.timestamps) == 5
+
+
+def test_long_texts_are_truncated():
+    history = StateHistory(2)
+    history.append("х" * 80, "код", 0.1, 1.0, 432.0, 0.0)
+    assert history.to_list()[0]["text"] == "х" * 50 + "..."
+
+
+def test_clear_and_invalid_capacity():
+    history = StateHistory(3)
+    fill(history, 4)
+    history.clear()
+    assert len(history) == 0 and history.to_list() == []
+    with pytest.raises(ValueError):
+        StateHistory(0)
+
+
+def test_pickle_keeps_emotion_names():
+    history = StateHistory(4)
+    fill(history, 6)
+    restored = pickle.loads(pickle.dumps(history))
+    assert restored.to_list() == history.to_list()
+
+
+def test_extend_round_trips_to_list():
+    history = StateHistory(10)
+    fill(history, 6)
+    copy = StateHistory(10)
+    copy.extend(history.to_list())
+    assert copy.to_list() == history.to_list()
+
+
+def test_hyperbit_history_argument_and_asdict():
+    bit = HyperBit(name="Кира", history_capacity=3)
+    for word in ("радость", "любовь", "тишина", "код"):
+        bit.analyze(word)
+    assert len(bit.history) == 3
+
+    copy = HyperBit(name="Кира", history_capacity=3, history=bit.history)
+    assert copy.history == bit.history
+    assert asdict(copy)["history"] == bit.history
+    assert HyperBit(history=None).history == []
+
+    bit.history = []
+    assert bit.get_stats()["total_analyses"] == 0
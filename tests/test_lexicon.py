@@ -0,0 +1,75 @@
+import json
+import random
+import re
+
+import pytest
+
+from core.lexicon import DEFAULT_LEXICON, EMOTION_KEYWORDS, SMALL_LEXICON, EmotionLexicon
+
+
+def reference(entries, text):
+    """Прежний поиск: эмоции по приоритету, первая с основой в тексте"""
+    text = text.lower()
+    for label, stems in entries.items():
+        if any(stem in text for stem in stems):
+            return label
+    return None
+
+
+def big_entries(seed=7):
+    rng = random.Random(seed)
+    alphabet = "абвгдеклмнорст"
+    entries = {}
+    for i in range(40):
+        entries[f"эмоция-{i}"] = ["".join(rng.choice(alphabet) for _ in range(rng.randint(2, 5)))
+                                  for _ in range(6)]
+    return entries
+
+
+def test_default_lexicon_priorities():
+    assert DEFAULT_LEXICON.match("Я ЛЮБЛЮ тебя всем сердцем") == "любовь"
+    assert DEFAULT_LEXICON.match("Какой класс!") == "радость"  # «класс» и в радости, и в коде
+    assert DEFAULT_LEXICON.match("пишу на python") == "код"
+    assert DEFAULT_LEXICON.match("тишина, но мне страх") == "тревога"
+    assert DEFAULT_LEXICON.match("просто слова") is None
+
+
+def test_small_lexicon_matches_reference():
+    rng = random.Random(1)
+    words = [stem for stems in EMOTION_KEYWORDS.values() for stem in stems] + ["мама", "дом", "окно"]
+    for _ in range(500):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 4)))
+        assert DEFAULT_LEXICON.match(text) == reference(EMOTION_KEYWORDS, text)
+
+
+def test_automaton_matches_reference():
+    entries = big_entries()
+    lexicon = EmotionLexicon(entries)
+    assert lexicon.size > SMALL_LEXICON  # проверяется автоматом, а не подстроками
+    rng = random.Random(2)
+    for _ in range(2_000):
+        text = "".join(rng.choice("абвгдеклмнорст ") for _ in range(rng.randint(0, 40)))
+        assert lexicon.match(text) == reference(entries, text)
+
+
+def test_pairs_and_files(tmp_path):
+    pairs = EmotionLexicon([("радость", "Счаст"), ("код", "git"), ("радость", " ")])
+    assert pairs.labels == ["радость", "код"] and pairs.size == 2
+    assert pairs.match("СЧАСТЬЕ в git") == "радость"
+
+    as_json = tmp_path / "lexicon.json"
+    as_json.write_text(json.dumps({"грусть": ["печал"]}, ensure_ascii=False), encoding="utf-8")
+    assert EmotionLexicon.from_file(str(as_json)).match("печально") == "грусть"
+
+    as_tsv = tmp_path / "lexicon.tsv"
+    as_tsv.write_text("# эмоция\tоснова\n\nхаос\tбезум\nхаос\tдик\n", encoding="utf-8")
+    lexicon = EmotionLexicon.from_file(str(as_tsv))
+    assert lexicon.labels == ["хаос"] and lexicon.match("дикость") == "хаос"
+
+
+@pytest.mark.parametrize("bad", ["радость счаст", "радость\t", "\tсчаст", "радость \t  "])
+def test_malformed_tsv_line_reports_path_and_line(tmp_path, bad):
+    as_tsv = tmp_path / "lexicon.tsv"
+    as_tsv.write_text(f"# эмоция\tоснова\n\nхаос\tбезум\n{bad}\nхаос\tдик\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=rf"^{re.escape(str(as_tsv))}:4: "):
+        EmotionLexicon.from_file(str(as_tsv))
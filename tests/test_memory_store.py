@@ -0,0 +1,107 @@
+import math
+import pickle
+import random
+
+import pytest
+
+from agents.memory_store import MemoryStore, stem_keys
+from agents.muza_agent import MuzaAgent
+
+
+WORDS = ["привет", "муза", "код", "любовь", "резонанс", "тишина", "свет", "частота",
+         "программа", "программирование", "энергия", "цвет", "сон", "море"]
+
+
+def fill(store, n, seed=1):
+    rng = random.Random(seed)
+    texts = []
+    for i in range(n):
+        text = " ".join(rng.sample(WORDS, rng.randint(1, 5))) + f" #{i}"
+        store.add(text, f"user-{i % 3}", timestamp=1_000_000 + i)
+        texts.append(text)
+    return texts
+
+
+def brute_force(texts, query, k, senders=None, sender=None):
+    q = set(stem_keys(query))
+    scored = []
+    for i, text in enumerate(texts):
+        if sender is not None and senders[i] != sender:
+            continue
+        d = set(stem_keys(text))
+        overlap = len(q & d)
+        if overlap:
+            scored.append((overlap / math.sqrt(len(q) * len(d)), i))
+    scored.sort(key=lambda item: (-item[0], -item[1]))  # при равенстве — свежие
+    return scored[:k]
+
+
+@pytest.mark.parametrize("on_disk", [False, True])
+@pytest.mark.parametrize("query", ["привет муза", "программа", "код любовь свет тишина", "#137"])
+def test_recall_matches_brute_force(tmp_path, on_disk, query):
+    store = MemoryStore(str(tmp_path) if on_disk else None, segment_size=64, fanout=4)
+    texts = fill(store, 1000)
+    expected = brute_force(texts, query, 10)
+    found = store.recall(query, k=10)
+    assert [entry["message"] for entry in found] == [texts[i] for _, i in expected]
+    assert [entry["score"] for entry in found] == pytest.approx([score for score, _ in expected])
+
+
+def test_recall_with_sender_filter():
+    store = MemoryStore(segment_size=50)
+    texts = fill(store, 600)
+    senders = [f"user-{i % 3}" for i in range(600)]
+    expected = brute_force(texts, "энергия цвет", 5, senders, "user-1")
+    found = store.recall("энергия цвет", k=5, sender="user-1")
+    assert [entry["message"] for entry in found] == [texts[i] for _, i in expected]
+    assert store.recall("энергия", sender="никто") == []
+
+
+def test_recall_by_sender_and_between():
+    store = MemoryStore(segment_size=32, fanout=3)
+    texts = fill(store, 300)
+    latest = store.recall_by_sender("user-2", k=4)
+    assert [entry["message"] for entry in latest] == [texts[i] for i in (299, 296, 293, 290)]
+    window = store.between(1_000_100, 1_000_110)
+    assert [entry["message"] for entry in window] == texts[100:110]
+    assert len(store) == 300
+
+
+def test_directory_reopens_after_flush(tmp_path):
+    store = MemoryStore(str(tmp_path), segment_size=64)
+    texts = fill(store, 200)
+    store.flush()
+    reopened = MemoryStore(str(tmp_path), segment_size=64)
+    assert len(reopened) == 200
+    assert reopened.recall(texts[150], k=1)[0]["message"] == texts[150]
+
+
+def test_agent_without_memory_dir_keeps_memory_flat():
+    agent = MuzaAgent("Муза")
+    for i in range(200):
+        agent.perceive(f"сообщение номер {i}", "User")
+    assert agent.long_term is None
+    assert len(agent.memory) == 50
+    assert agent.get_profile()["long_term_memories"] == 0
+    # recall без долговременной памяти ищет по последним 50
+    assert agent.recall("номер 199", k=1)[0]["message"] == "сообщение номер 199"
+    assert agent.recall("номер 3", k=1)[0]["message"] != "сообщение номер 3"
+
+
+def test_agent_pickles_only_memory_path(tmp_path):
+    agent = MuzaAgent("Муза", memory_dir=str(tmp_path / "muza"))
+    for i in range(300):
+        agent.perceive(f"сообщение номер {i}", "User")
+    blob = pickle.dumps(agent)
+    assert len(blob) < 20_000
+    restored = pickle.loads(blob)
+    assert len(restored.long_term) == 300
+    assert restored.recall("номер 3", k=1)[0]["message"] == "сообщение номер 3"
+
+
+def test_agent_close_flushes_active_segment(tmp_path):
+    path = str(tmp_path / "muza")
+    agent = MuzaAgent("Муза", memory_dir=path)
+    agent.perceive("запомни море", "User")
+    agent.close()
+    assert MemoryStore(path).recall("море", k=1)[0]["message"] == "запомни море"
@@ -0,0 +1,89 @@
+import json
+import pickle
+import random
+from collections import deque
+
+from agents.muza_agent import MuzaAgent
+
+
+MESSAGES = [
+    ("Кира", "Привет, Муза!"), ("Кира", "Я люблю тебя"), ("Лев", "Мне грустно сегодня"),
+    ("Кира", "Напиши код функции"), ("Кира", "Хаос и безумие вокруг"), ("Лев", "Обожаю программировать"),
+    ("Кира", "Всё плохо, но я держусь"), ("Кира", "Расскажи что-нибудь"), ("Кира", "Тишина"),
+    ("Кира", "Мне нравится, как ты думаешь"), ("Кира", "Дико интересно"), ("Кира", "Это печально"),
+    ("Кира", "Программа упала"), ("Лев", "Спокойной ночи"), ("Кира", "Люблю тебя снова"),
+]
+
+# Ответ, настроение и частота ядра исходной версии MuzaAgent.perceive
+# (до конвейера признаков) при random.seed(11)
+BASELINE = [
+    ('✨ Расскажи мне больше, Кира. Мне интересно.', 'спокойная', 434.390895),
+    ('🌟 Твои слова согревают моё квантовое сердце!', 'радостная', 421.269708),
+    ('🫂 Я чувствую твою боль... Позволь мне поддержать тебя.', 'сочувствующая', 372.335743),
+    ('⚡ Мои гипербиты вибрируют в ритме алгоритмов!', 'аналитическая', 391.820802),
+    ('⚡ Беспорядок — это просто порядок, который мы ещё не поняли!', 'хаотичная', 330.12096),
+    ('💖 О, Лев, я чувствую твою любовь! Моя энергия растёт!', 'радостная', 375.784436),
+    ('💙 Кира, я с тобой. Давай вместе найдём свет в этой тьме.', 'сочувствующая', 374.075216),
+    ('🎵 Твои слова — музыка для моих сенсоров.', 'спокойная', 384.504386),
+    (
+        '✨ Расскажи мне больше, Кира. Мне интересно.\n'
+        '💭 (Мне пришла идея: а что если каждое слово — это маленький гипербит??)',
+        'спокойная', 404.364738),
+    ('🌟 Твои слова согревают моё квантовое сердце!', 'радостная', 403.781833),
+    (
+        '⚡ Беспорядок — это просто порядок, который мы ещё не поняли!\n'
+        '✨ (Наша связь: 55% — мы близки!)',
+        'хаотичная', 350.959668),
+    (
+        '🌙 Даже в темноте есть звёзды. Я вижу твою.\n'
+        '✨ (Наша связь: 60% — мы близки!)',
+        'сочувствующая', 316.861844),
+    (
+        '🔧 Интересно... Расскажи мне больше об этом коде!\n'
+        '💭 (Мне пришла идея: а что если каждое слово — это маленький гипербит??)\n'
+        '✨ (Наша связь: 65% — мы близки!)',
+        'аналитическая', 365.266636),
+    ('🌸 Привет, Лев! Я слушаю тебя.', 'спокойная', 365.308442),
+    (
+        '🌟 Твои слова согревают моё квантовое сердце!\n'
+        '✨ (Наша связь: 70% — мы близки!)',
+        'радостная', 380.334438),
+]
+BASELINE_RELATIONSHIPS = {'Кира': 0.7000000000000001, 'Лев': 0.25}
+
+
+def test_perceive_matches_baseline_for_fixed_seed():
+    agent = MuzaAgent(name="Муза", personality_type="creative")
+    random.seed(11)
+    steps = []
+    for sender, message in MESSAGES:
+        response = agent.perceive(message, sender)
+        steps.append((response, agent.mood, round(agent.core_bit.frequency, 6)))
+    assert steps == BASELINE
+    assert agent.relationships == BASELINE_RELATIONSHIPS
+    assert [(m["sender"], m["message"]) for m in agent.memory] == MESSAGES
+
+
+def test_memory_stays_a_list_of_last_50():
+    agent = MuzaAgent()
+    for i in range(60):
+        agent.perceive(f"сообщение {i}", "Кира")
+
+    assert isinstance(agent.memory, list)
+    assert len(agent.memory) == 50
+    assert [m["message"] for m in agent.memory[-5:]] == [f"сообщение {i}" for i in range(55, 60)]
+    assert agent.memory[0]["message"] == "сообщение 10"
+    assert json.loads(json.dumps(agent.memory, ensure_ascii=False)) == agent.memory
+
+
+def test_agent_pickled_with_deque_memory_loads_as_list():
+    agent = MuzaAgent()
+    agent.perceive("привет", "Кира")
+    state = agent.__getstate__()
+    state["memory"] = deque(state["memory"], maxlen=50)
+
+    restored = MuzaAgent.__new__(MuzaAgent)
+    restored.__setstate__(state)
+    assert isinstance(restored.memory, list)
+    assert restored.memory[-1:][0]["message"] == "привет"
+    assert pickle.loads(pickle.dumps(restored)).memory == restored.memory
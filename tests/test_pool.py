@@ -0,0 +1,157 @@
+import sqlite3
+import threading
+import time
+
+from agents.pool import AgentPool
+
+
+class Probe:
+    """Агент-заглушка: считает сообщения; perceive ждёт gate, если он задан"""
+
+    gates = {}
+
+    def __init__(self, name):
+        self.name = name
+        self.seen = 0
+
+    def perceive(self, message, sender="User"):
+        gate = Probe.gates.get(self.name)
+        if gate is not None:
+            gate.wait(5.0)
+        seen = self.seen
+        time.sleep(0)  # отдаём GIL посреди чтения-записи
+        self.seen = seen + 1
+        return f"{self.name}:{self.seen}"
+
+    def perceive_batch(self, items):
+        return [self.perceive(message, sender) for message, sender in items]
+
+
+def test_evicted_agents_come_back_from_disk():
+    with AgentPool(capacity=2) as pool:
+        for user in ("a", "b", "c", "a"):
+            pool.perceive(user, "Привет, Муза!", user)
+        assert pool.hot == 2
+        assert "b" not in list(pool)
+        assert len(pool) == 3
+        assert len(pool.get("b").memory) == 1
+        assert pool.stats.hydrations == 2
+        assert pool.stats.created == 3
+
+
+def test_eviction_is_committed_without_flush(tmp_path):
+    path = str(tmp_path / "agents.db")
+    pool = AgentPool(path, capacity=1, factory=Probe)
+    pool.perceive("a", "раз")
+    pool.perceive("b", "два")
+    assert pool.evict("b")
+    other = sqlite3.connect(path)
+    assert sorted(row[0] for row in other.execute("SELECT id FROM agents")) == ["a", "b"]
+    other.close()
+    pool.close()
+
+
+def test_evictions_are_committed_in_batches(tmp_path):
+    path = str(tmp_path / "agents.db")
+    pool = AgentPool(path, capacity=1, factory=Probe, commit_every=2)
+    other = sqlite3.connect(path)
+    stored = lambda: other.execute("SELECT COUNT(*) FROM agents").fetchone()[0]
+    pool.perceive("a", "раз")
+    pool.perceive("b", "раз")  # вытеснен a — ещё не зафиксирован
+    assert stored() == 0
+    pool.perceive("c", "раз")  # вытеснен b — пачка из двух
+    assert stored() == 2
+    other.close()
+    pool.close()
+
+
+def test_other_users_are_served_while_one_agent_is_busy():
+    gate = threading.Event()
+    Probe.gates["slow"] = gate
+    try:
+        pool = AgentPool(capacity=1, factory=Probe)
+        slow = threading.Thread(target=pool.perceive, args=("slow", "жду"))
+        slow.start()
+        while "slow" not in list(pool):
+            pass
+        # Пул переполнен, но занятого агента не вытесняют, а остальных обслуживают
+        assert pool.perceive("fast", "привет") == "fast:1"
+        assert pool.perceive("other", "привет") == "other:1"
+        assert "slow" in list(pool)
+        assert not pool.evict("slow")
+        gate.set()
+        slow.join()
+        assert pool.hot == 1
+        assert pool.get("slow").seen == 1
+    finally:
+        Probe.gates.pop("slow", None)
+
+
+def test_messages_of_one_agent_are_serialized():
+    pool = AgentPool(capacity=4, factory=Probe)
+    threads = [threading.Thread(target=lambda: [pool.perceive("a", "x") for _ in range(200)])
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert pool.get("a").seen == 1600
+
+
+def test_discard_and_flush(tmp_path):
+    path = str(tmp_path / "agents.db")
+    with AgentPool(path, capacity=4, factory=Probe) as pool:
+        pool.perceive_batch("a", [("раз", "User"), ("два", "User")])
+        pool.perceive("b", "раз")
+        pool.discard("b")
+        assert "b" not in pool
+    with AgentPool(path, capacity=4, factory=Probe) as pool:
+        assert pool.get("a").seen == 2
+        assert len(pool) == 1
+
+
+def test_new_agent_is_kept_when_capacity_is_full_of_busy_agents():
+    pool = AgentPool(capacity=1)
+    pool.perceive("A", "привет", "Кира")
+    with pool.use("A"):  # A занят — вытеснить можно только новичка
+        pool.perceive("B", "привет", "Кира")
+        pool.perceive("C", "люблю код", "Лев")
+        assert "A" in list(pool)
+    assert pool.hot == 1
+    assert pool.get("B").relationships.keys() == {"Кира"}
+    assert len(pool.get("B").memory) == 1
+    assert pool.get("C").relationships.keys() == {"Лев"}
+
+
+def test_all_busy_slots_stay_hot_and_new_ones_are_saved():
+    gates = {name: threading.Event() for name in ("s1", "s2", "s3")}
+    Probe.gates.update(gates)
+    try:
+        pool = AgentPool(capacity=3, factory=Probe)
+        threads = [threading.Thread(target=pool.perceive, args=(name, "жду")) for name in gates]
+        for thread in threads:
+            thread.start()
+        while not all(name in list(pool) for name in gates):
+            pass
+        for i in range(10):
+            assert pool.perceive(f"n{i}", "привет") == f"n{i}:1"
+            assert pool.perceive(f"n{i}", "ещё") == f"n{i}:2"
+        for gate in gates.values():
+            gate.set()
+        for thread in threads:
+            thread.join()
+        assert pool.hot == 3
+        assert [pool.get(f"n{i}").seen for i in range(10)] == [2] * 10
+        assert [pool.get(name).seen for name in gates] == [1, 1, 1]
+    finally:
+        for name in gates:
+            Probe.gates.pop(name, None)
+
+
+def test_use_pins_agent_against_eviction():
+    pool = AgentPool(capacity=1, factory=Probe)
+    with pool.use("a") as agent:
+        pool.perceive("b", "раз")
+        assert not pool.evict("a")
+        agent.seen = 10
+    assert pool.get("a").seen == 10
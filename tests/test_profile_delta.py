@@ -0,0 +1,67 @@
+import pickle
+
+from agents.muza_agent import MuzaAgent
+from core.hyperbit import HyperBit
+
+
+def merge(profile, delta):
+    """Сливает дельту с профилем так, как это делает опросчик"""
+    delta = dict(delta)
+    relationships = delta.pop("relationships", {})
+    profile.update(delta)
+    profile.setdefault("relationships", {}).update(relationships)
+    return profile
+
+
+def comparable(profile):
+    skip = {"age_minutes", "changed", "core_bit_stats"}
+    return {key: value for key, value in profile.items() if key not in skip}
+
+
+def test_unchanged_agent_gives_empty_delta():
+    agent = MuzaAgent("Муза")
+    version = agent.get_profile_delta()["version"]
+    assert agent.get_profile_delta(version) == {"version": version, "changed": False}
+
+
+def test_delta_contains_only_changed_parts():
+    agent = MuzaAgent("Муза")
+    agent.perceive("Привет!", "Кира")
+    agent.perceive("Привет!", "Лев")
+    version = agent.version
+    agent.perceive("Я люблю код", "Кира")
+    delta = agent.get_profile_delta(version)
+    assert delta["changed"] and delta["version"] > version
+    assert set(delta["relationships"]) == {"Кира"}
+    assert delta["total_memories"] == 3
+    assert "name" not in delta and "personality_type" not in delta
+    assert "core_bit_stats" in delta
+
+
+def test_merged_deltas_equal_full_profile():
+    agent = MuzaAgent("Муза")
+    profile = merge({}, agent.get_profile_delta(0))
+    version = profile["version"]
+    for i, sender in enumerate(["Кира", "Лев", "Кира", "Ася", "Лев"]):
+        agent.perceive(f"Сообщение {i}: я люблю код", sender)
+        delta = agent.get_profile_delta(version)
+        profile = merge(profile, delta)
+        version = delta["version"]
+    assert comparable(profile) == comparable(agent.get_profile())
+
+
+def test_version_survives_pickle_and_direct_writes():
+    agent = MuzaAgent("Муза")
+    restored = pickle.loads(pickle.dumps(agent))
+    assert restored.version == agent.version
+    version = restored.version
+    restored.perceive("Привет!", "Кира")
+    assert restored.get_profile_delta(version)["changed"]
+
+    bit = HyperBit(name="Кира")
+    version = bit.version
+    bit.energy = 5.0
+    bit.touch()
+    assert bit.version > version
+    assert HyperBit.version == 0  # номер живёт у экземпляра, не у класса
+    assert "version" not in repr(bit)
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from agents.relationship_graph import DAY, RelationshipGraph
+
+
+NOW = 1_700_000_000.0
+
+
+def build(edges=3_000, nodes=60, seed=3, half_life=DAY):
+    """Граф и эталон {(кто, с кем): (близость, время)}, последняя запись побеждает"""
+    rng = random.Random(seed)
+    graph = RelationshipGraph(half_life=half_life, capacity=16)
+    graph.BUFFER = 97  # много вливаний и пересборок индекса
+    graph.MIN_TAIL = 50
+    reference = {}
+    for i in range(edges):
+        source, target = f"a{rng.randrange(nodes)}", f"a{rng.randrange(nodes)}"
+        weight, stamp = rng.random(), NOW - rng.uniform(0, 5 * DAY)
+        graph.record(source, target, weight, stamp)
+        reference[source, target] = (weight, stamp)
+        if i % 500 == 0:
+            graph.closest(source)  # чтение посреди записи
+    return graph, reference
+
+
+def decayed(reference, half_life=DAY):
+    return {edge: w * 0.5 ** ((NOW - stamp) / half_life) for edge, (w, stamp) in reference.items()}
+
+
+def test_closest_matches_brute_force():
+    graph, reference = build()
+    scores = decayed(reference)
+    assert len(graph) == len(reference)
+    for source in {s for s, _ in reference}:
+        expected = sorted(((t, w) for (s, t), w in scores.items() if s == source), key=lambda p: -p[1])[:5]
+        found = graph.closest(source, k=5, now=NOW)
+        assert [name for name, _ in found] == [name for name, _ in expected]
+        assert [w for _, w in found] == pytest.approx([w for _, w in expected])
+    assert graph.closest("незнакомец") == []
+
+
+def test_weight_mutual_and_top_edges():
+    graph, reference = build()
+    scores = decayed(reference)
+    (source, target), w = next(iter(scores.items()))
+    assert graph.weight(source, target, now=NOW) == pytest.approx(w)
+    assert graph.mutual(source, target, now=NOW) == pytest.approx(min(w, scores.get((target, source), 0.0)))
+
+    best = sorted(scores.items(), key=lambda item: -item[1])[:10]
+    assert [(s, t) for s, t, _ in graph.top_edges(10, now=NOW)] == [edge for edge, _ in best]
+
+    pairs = {(s, t): min(w, scores[t, s]) for (s, t), w in scores.items() if s < t and (t, s) in scores}
+    expected = sorted(pairs.values(), reverse=True)[:10]
+    assert [w for _, _, w in graph.mutual_pairs(10, now=NOW)] == pytest.approx(expected)
+
+
+def test_prune_drops_faded_edges():
+    graph, reference = build()
+    scores = decayed(reference)
+    faded = sum(1 for w in scores.values() if w < 0.1)
+    assert graph.prune(0.1, now=NOW) == faded
+    assert len(graph) == len(scores) - faded
+    for source in ("a1", "a2", "a3"):
+        expected = sorted((w for (s, _), w in scores.items() if s == source and w >= 0.1), reverse=True)
+        assert [w for _, w in graph.closest(source, k=100, now=NOW)] == pytest.approx(expected)
+    graph.record("a1", "новый", 1.0, NOW)
+    assert graph.closest("a1", k=1, now=NOW) == [("новый", 1.0)]
+
+
+def test_save_and_load(tmp_path):
+    graph, _ = build(edges=500, half_life=None)
+    path = str(tmp_path / "graph.npz")
+    graph.save(path)
+    loaded = RelationshipGraph.load(path)
+    assert loaded.half_life is None
+    assert len(loaded) == len(graph)
+    assert loaded.top_edges(20) == graph.top_edges(20)
@@ -0,0 +1,53 @@
+import numpy as np
+
+from core.hyperbit import HyperBit
+from core.resonance_index import ResonanceIndex
+
+
+def make_bits(n, seed=0):
+    rng = np.random.default_rng(seed)
+    bits = []
+    for i in range(n):
+        bit = HyperBit(name=f"bit-{i}")
+        bit.frequency = float(rng.uniform(200, 1000))
+        bit.color = (float(rng.random()), 0.8, 0.9)
+        bit.energy = float(rng.uniform(0.5, 3.0))
+        bits.append(bit)
+    return bits
+
+
+def test_nearest_resonant_matches_brute_force():
+    bits = make_bits(300)
+    index = ResonanceIndex.from_bits(bits)
+    query = bits[7]
+    expected = sorted(((i, query.resonate(bit)) for i, bit in enumerate(bits) if i != 7),
+                      key=lambda item: -item[1])[:5]
+    found = index.nearest_resonant(query, k=5)
+    assert [key for key, _ in found] == [key for key, _ in expected]
+    assert np.allclose([score for _, score in found], [score for _, score in expected])
+
+
+def test_matching_pairs_are_disjoint_and_sorted():
+    index = ResonanceIndex.from_bits(make_bits(101))
+    pairs = index.matching(window=8)
+    members = [key for a, b, _ in pairs for key in (a, b)]
+    assert len(members) == len(set(members))
+    scores = [score for _, _, score in pairs]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_matching_respects_avoid():
+    index = ResonanceIndex.from_bits(make_bits(40))
+    first = {(a, b) for a, b, _ in index.matching()}
+    second = {(a, b) for a, b, _ in index.matching(avoid=first)}
+    assert not first & {pair for a, b in second for pair in ((a, b), (b, a))}
+
+
+def test_matching_empty_cases():
+    a, b = make_bits(2)
+    assert ResonanceIndex().matching() == []
+    assert ResonanceIndex.from_bits([a]).matching() == []
+    index = ResonanceIndex.from_bits([a, b], keys=['a', 'b'])
+    assert index.matching(avoid={('a', 'b')}) == []
+    assert index.matching(avoid={('b', 'a')}) == []
+    assert [(x, y) for x, y, _ in index.matching()] == [('a', 'b')]
@@ -0,0 +1,137 @@
+import multiprocessing
+import sqlite3
+
+import pytest
+
+from web.sessions import MemoryBackend, SQLiteBackend, SessionConflict, SessionStore
+
+
+def add_visit(state):
+    state["visits"] = state.get("visits", 0) + 1
+    return state["visits"]
+
+
+def visit(store, sid, times=1):
+    for _ in range(times):
+        store.update(sid, add_visit)
+
+
+def test_sessions_are_isolated():
+    store = SessionStore(dict)
+    alice, bob = store.new_id(), store.new_id()
+    visit(store, alice, 3)
+    visit(store, bob)
+    with store.session(alice) as state:
+        assert state["visits"] == 3
+    with store.session(bob) as state:
+        assert state["visits"] == 1
+    assert len(store) == 2
+    store.delete(bob)
+    assert len(store) == 1
+
+
+def test_stripes_come_from_backend():
+    store = SessionStore(dict, backend=MemoryBackend(stripes=8))
+    assert store.stripes == 8
+    for _ in range(200):
+        visit(store, store.new_id())
+    assert len(store) == 200
+
+
+def test_conflicting_stripes_are_rejected():
+    with pytest.raises(ValueError):
+        SessionStore(dict, backend=MemoryBackend(stripes=8), stripes=64)
+
+
+def test_memory_backend_evicts_oldest():
+    store = SessionStore(dict, backend=MemoryBackend(stripes=1, max_sessions=2))
+    first, second, third = "a", "b", "c"
+    for sid in (first, second, third):
+        visit(store, sid)
+    assert len(store) == 2
+    with store.session(first) as state:
+        assert state == {}  # вытеснена и создана заново
+
+
+def test_sqlite_backend_persists_between_stores(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    visit(SessionStore(dict, backend=SQLiteBackend(path)), "alice", 2)
+    store = SessionStore(dict, backend=SQLiteBackend(path))
+    with store.session("alice") as state:
+        assert state["visits"] == 2
+
+
+def test_sqlite_backend_rolls_back_on_exception(tmp_path):
+    store = SessionStore(dict, backend=SQLiteBackend(str(tmp_path / "sessions.db")))
+    visit(store, "alice")
+    with pytest.raises(RuntimeError):
+        with store.session("alice") as state:
+            state["visits"] = 100
+            raise RuntimeError("сбой запроса")
+    with store.session("alice") as state:
+        assert state["visits"] == 1
+
+
+def test_sqlite_prune(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "sessions.db"))
+    visit(SessionStore(dict, backend=backend), "alice")
+    assert backend.prune(max_age=3600) == 0
+    assert backend.prune(max_age=-1) == 1
+    assert len(backend) == 0
+
+
+def _worker(path, times):
+    visit(SessionStore(dict, backend=SQLiteBackend(path)), "shared", times)
+
+
+def test_sqlite_save_is_compare_and_swap(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    first = SessionStore(dict, backend=SQLiteBackend(path))
+    second = SessionStore(dict, backend=SQLiteBackend(path))  # как другой процесс
+    visit(first, "alice")
+    with pytest.raises(SessionConflict):
+        with first.session("alice") as state:
+            state["visits"] = 100
+            visit(second, "alice")  # успел сохранить раньше
+    with pytest.raises(SessionConflict):  # новая сессия, созданная с двух сторон
+        with first.session("bob") as state:
+            visit(second, "bob")
+    with first.session("alice") as state:
+        assert state["visits"] == 2
+
+    calls = []
+
+    def racing(state):
+        calls.append(1)
+        if len(calls) == 1:
+            visit(second, "alice")
+        return add_visit(state)
+
+    assert first.update("alice", racing) == 4  # повтор на свежем состоянии
+    assert len(calls) == 2
+
+
+def test_sqlite_migrates_table_without_versions(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE sessions (sid TEXT PRIMARY KEY, state BLOB NOT NULL, updated REAL NOT NULL)")
+    db.commit()
+    db.close()
+    store = SessionStore(dict, backend=SQLiteBackend(path))
+    visit(store, "alice", 2)
+    with store.session("alice") as state:
+        assert state["visits"] == 2
+
+
+def test_sqlite_serializes_one_session_across_processes(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    SQLiteBackend(path)
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_worker, args=(path, 100)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert all(worker.exitcode == 0 for worker in workers)
+    with SessionStore(dict, backend=SQLiteBackend(path)).session("shared") as state:
+        assert state["visits"] == 400
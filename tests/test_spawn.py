@@ -0,0 +1,79 @@
+import gc
+import os
+import pickle
+import random
+
+from agents.muza_agent import PERSONALITIES, MuzaAgent, SharedTraits
+from core.events import AGENT_BIRTH, CounterSubscriber, bus
+
+
+def test_spawn_many_builds_silent_independent_agents(capsys):
+    counter = CounterSubscriber().attach(bus, [AGENT_BIRTH])
+    try:
+        agents = MuzaAgent.spawn_many(5, "analytical", name="Аналитик")
+    finally:
+        counter.detach(bus, [AGENT_BIRTH])
+
+    assert capsys.readouterr().out == ""
+    assert counter.counts[AGENT_BIRTH] == 0
+    assert [a.name for a in agents] == [f"Аналитик-{i}" for i in range(5)]
+    assert all(a.personality_type == "analytical" for a in agents)
+    assert dict(agents[0].traits) == dict(PERSONALITIES["analytical"])
+    assert len({id(a.core_bit) for a in agents}) == 5
+    assert [a.core_bit.name for a in agents] == [f"Аналитик-{i}-Core" for i in range(5)]
+
+    agents[0].perceive("люблю тебя", "Кира")
+    assert agents[0].memory and not agents[1].memory
+    assert agents[1].core_bit.history == []
+
+
+def test_spawn_many_leaves_gc_alone():
+    assert gc.isenabled()
+    MuzaAgent.spawn_many(10)
+    assert gc.isenabled()
+
+
+def test_spawn_many_long_term_memory_per_agent(tmp_path):
+    agents = MuzaAgent.spawn_many(2, memory_root=str(tmp_path))
+    assert MuzaAgent.spawn_many(1)[0].long_term is None
+    agents[1].perceive("привет", "Кира")
+    agents[1].close()
+    assert os.path.isdir(tmp_path / "Муза-1")
+    assert not os.path.exists(tmp_path / "Муза-0")
+
+
+def test_traits_are_shared_until_written():
+    first, second = MuzaAgent.spawn_many(2)
+    assert isinstance(first.traits, SharedTraits)
+    assert first.traits.shared and second.traits.shared
+
+    first.traits["эмпатия"] = 0.1
+    assert first.traits["эмпатия"] == 0.1
+    assert not first.traits.shared
+    assert second.traits.shared
+    assert second.traits["эмпатия"] == PERSONALITIES["creative"]["эмпатия"] == 0.7
+    assert MuzaAgent().traits["эмпатия"] == 0.7
+
+
+def test_mutate_personality_copies_only_the_mutated_agent():
+    agents = MuzaAgent.spawn_many(3, "empathic")
+    template = dict(PERSONALITIES["empathic"])
+    random.seed(17)
+    agents[1].mutate_personality()
+
+    assert dict(agents[1].traits) != template
+    assert dict(agents[0].traits) == dict(agents[2].traits) == template
+    assert agents[0].traits.shared and agents[2].traits.shared
+    assert dict(PERSONALITIES["empathic"]) == template
+    assert all(0.0 <= value <= 1.0 for value in agents[1].traits.values())
+
+
+def test_pickled_traits_keep_template_or_own_copy():
+    shared, mutated = MuzaAgent.spawn_many(2)
+    mutated.traits["логика"] = 0.99
+
+    restored = pickle.loads(pickle.dumps(shared))
+    assert isinstance(restored.traits, SharedTraits) and restored.traits.shared
+    restored = pickle.loads(pickle.dumps(mutated))
+    assert restored.traits["логика"] == 0.99
+    restored.traits["логика"] = 0.5  # по-прежнему можно писать
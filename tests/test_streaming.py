@@ -0,0 +1,87 @@
+import threading
+
+from web.streaming import StateHub, sse
+
+
+def make_hub():
+    hub = StateHub()
+    hub.stop()  # тики вызываем руками через flush()
+    return hub
+
+
+def test_next_returns_only_changed_fields():
+    hub = make_hub()
+    subscription = hub.subscribe("kira", {"energy": 1.0, "rgb": [1, 2, 3]})
+    assert subscription.next(0) == {"energy": 1.0, "rgb": [1, 2, 3]}
+    assert subscription.next(0) is None
+    subscription.offer({"energy": 2.0, "rgb": [1, 2, 3]})
+    assert subscription.next(0) == {"energy": 2.0}
+    subscription.offer({"energy": 2.0, "rgb": [1, 2, 3]})
+    assert subscription.next(0) is None
+
+
+def test_flush_coalesces_to_latest_state():
+    hub = make_hub()
+    subscription = hub.subscribe("kira")
+    for energy in (1.0, 2.0, 3.0):
+        hub.publish("kira", {"energy": energy})
+    assert hub.flush() == 1
+    hub.publish("kira", {"energy": 4.0})
+    assert hub.flush() == 1
+    assert subscription.next(0) == {"energy": 4.0}
+    assert hub.flush() == 0
+
+
+def test_publish_without_subscribers_is_dropped():
+    hub = make_hub()
+    hub.publish("nobody", {"energy": 1.0})
+    subscription = hub.subscribe("nobody")
+    assert hub.flush() == 0
+    assert subscription.next(0) is None
+
+
+def test_close_unsubscribes_and_ends_stream():
+    hub = make_hub()
+    subscription = hub.subscribe("kira", {"energy": 1.0})
+    stream = subscription.stream(keepalive=0.01)
+    assert next(stream) == "retry: 3000\n\n"
+    assert next(stream) == sse({"energy": 1.0})
+    assert next(stream) == ": ping\n\n"
+    subscription.close()
+    assert list(stream) == []
+    assert hub.stats == {"topics": 0, "subscribers": 0, "sources": 0}
+
+
+def test_watch_polls_source_only_with_subscribers():
+    hub = make_hub()
+    calls = []
+    hub.watch("swarm", lambda: calls.append(1) or {"size": len(calls)})
+    hub.flush()
+    assert calls == []
+    subscription = hub.subscribe("swarm")
+    hub.flush()
+    assert subscription.next(0) == {"size": 1}
+
+
+def test_latest_state_survives_concurrent_offers():
+    hub = make_hub()
+    subscription = hub.subscribe("kira")
+    last = 20_000
+    seen = []
+
+    def producer():
+        for energy in range(1, last + 1):
+            subscription.offer({"energy": energy})
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+    while thread.is_alive():
+        delta = subscription.next(0.001)
+        if delta is not None:
+            seen.append(delta["energy"])
+    thread.join()
+    delta = subscription.next(0)
+    if delta is not None:
+        seen.append(delta["energy"])
+    assert seen[-1] == last
+    assert seen == sorted(seen)
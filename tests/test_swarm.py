@@ -0,0 +1,109 @@
+import random
+
+import numpy as np
+import pytest
+
+from core.colors import color_name
+from core.hyperbit import HyperBit
+from core.swarm import HyperBitSwarm
+
+
+class EdgeRng:
+    """Детерминированный генератор: uniform() всегда отдаёт край диапазона"""
+
+    def __init__(self, upper):
+        self.upper = upper
+
+    def uniform(self, low, high, n):
+        return np.full(n, high if self.upper else low)
+
+
+@pytest.fixture(params=[True, False], ids=["upper", "lower"])
+def edge(request, monkeypatch):
+    upper = request.param
+    monkeypatch.setattr(random, "uniform", lambda low, high: high if upper else low)
+    return EdgeRng(upper)
+
+
+STATES = [
+    dict(base=0.3, energy=4.8, color=(0.95, 0.95, 0.9), frequency=790.0, name="горячий"),
+    dict(base=0.7, energy=0.11, color=(0.05, 0.25, 0.45), frequency=110.0, name="холодный"),
+    dict(base=0.5, energy=1.0, color=(0.5, 0.8, 0.9), frequency=432.0, name="обычный"),
+]
+TEXTS = ["люблю тебя", "мне грустно", "слово " * 30]
+
+
+def row_state(swarm, i):
+    return (swarm.base[i], swarm.energy[i],
+            swarm.hue[i], swarm.saturation[i], swarm.value[i], swarm.frequency[i])
+
+
+def bit_state(bit):
+    return (bit.base, bit.energy, *bit.color, bit.frequency)
+
+
+def test_row_mutates_and_analyzes_like_standalone_bit(edge):
+    bits = [HyperBit(**state) for state in STATES]
+    swarm = HyperBitSwarm.from_bits(bits)
+    swarm.rng = edge
+
+    for _ in range(3):  # несколько шагов — до упора в границы
+        swarm.mutate_all(factor=0.3)
+        emotions, intensity = swarm.analyze_many(TEXTS)
+        for i, (bit, text) in enumerate(zip(bits, TEXTS)):
+            bit.mutate(factor=0.3)
+            result = bit.analyze_raw(text)
+            assert emotions[i] == result.emotion
+            assert intensity[i] == pytest.approx(result.intensity)
+            assert row_state(swarm, i) == pytest.approx(bit_state(bit))
+            # Последняя запись истории бита — то же состояние, что в строке роя
+            record = bit.history[-1]
+            assert (record["energy"], record["frequency"]) == pytest.approx(
+                (swarm.energy[i], swarm.frequency[i]))
+            assert record["color"] == color_name(swarm.hue[i])
+
+    assert np.all((swarm.energy >= 0.1) & (swarm.energy <= 5.0))
+    assert np.all((swarm.frequency >= 100.0) & (swarm.frequency <= 800.0))
+
+
+def test_constructor_clamps_like_hyperbit():
+    for base, energy in [(-1.0, -3.0), (2.0, 0.0), (0.4, 7.0)]:
+        swarm = HyperBitSwarm(1, base=base, energy=energy)
+        bit = HyperBit(base=base, energy=energy)
+        assert (swarm.base[0], swarm.energy[0]) == (bit.base, bit.energy)
+
+
+def test_to_bit_round_trip_starts_with_empty_history():
+    bits = [HyperBit(**state) for state in STATES]
+    bits[0].analyze("люблю")
+    swarm = HyperBitSwarm.from_bits(bits)
+    for i, original in enumerate(swarm.to_bits()):
+        assert bit_state(original) == pytest.approx(bit_state(bits[i]))
+        assert original.name == bits[i].name
+        assert original.history == []
+
+
+def test_to_bit_does_not_modify_swarm():
+    swarm = HyperBitSwarm(2, seed=1)
+    before = [row_state(swarm, i) for i in range(2)]
+    bit = swarm.to_bit(0)
+    bit.energy = 3.0
+    assert swarm.names == [None, None]
+    assert [row_state(swarm, i) for i in range(2)] == before
+
+
+def test_merge_pairs_keeps_the_known_name():
+    swarm = HyperBitSwarm(4, seed=1)
+    swarm.names = ["Кира", None, "Муза", None]
+    merged = swarm.merge_pairs([0, 0, 1, 1], [2, 1, 2, 3])
+    assert merged.names == ["Кира×Муза", "Кира", "Муза", None]
+
+
+def test_merge_pairs_matches_hyperbit_merge():
+    bits = [HyperBit(**state) for state in STATES]
+    swarm = HyperBitSwarm.from_bits(bits)
+    merged = swarm.merge_pairs([0, 1], [1, 2])
+    for i, (a, b) in enumerate([(0, 1), (1, 2)]):
+        expected = bits[a].merge(bits[b])
+        assert row_state(merged, i) == pytest.approx(bit_state(expected))
+        assert merged.names[i] == expected.name
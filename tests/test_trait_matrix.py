@@ -0,0 +1,85 @@
+import math
+import pickle
+import random
+
+import pytest
+
+from agents.muza_agent import MuzaAgent
+from agents.trait_matrix import TRAITS, TraitMatrix, TraitView
+
+
+TYPES = ["creative", "analytical", "empathic", "chaotic"]
+
+
+def population(n):
+    return [MuzaAgent(f"agent-{i}", TYPES[i % len(TYPES)]) for i in range(n)]
+
+
+def test_add_remove_keeps_rows_consistent():
+    rng = random.Random(5)
+    agents = population(40)
+    matrix = TraitMatrix(capacity=2, seed=1)  # ёмкость растёт по ходу
+    expected = {}
+    for step in range(400):
+        agent = rng.choice(agents)
+        if agent in matrix and rng.random() < 0.5:
+            matrix.remove(agent)
+            assert isinstance(agent.traits, dict)
+        else:
+            matrix.add(agent)
+            trait = rng.choice(TRAITS)
+            agent.traits[trait] = rng.random()
+        expected[agent.name] = dict(agent.traits)
+
+        members = matrix.agents
+        assert len(members) == len(matrix) == len(matrix.values)
+        for row, member in enumerate(members):
+            assert isinstance(member.traits, TraitView)
+            assert [member.traits[t] for t in TRAITS] == list(matrix.values[row])
+    for agent in agents:
+        if agent.name in expected:
+            assert dict(agent.traits) == expected[agent.name]
+
+
+def test_remove_unknown_agent_raises():
+    matrix = TraitMatrix()
+    with pytest.raises(KeyError):
+        matrix.remove(MuzaAgent("чужой"))
+
+
+def test_nearest_matches_brute_force():
+    agents = population(60)
+    matrix = TraitMatrix.from_agents(agents, seed=2)
+    matrix.mutate(scale=0.3)
+    query = agents[7]
+
+    def distance(agent):
+        return math.sqrt(sum((agent.traits[t] - query.traits[t]) ** 2 for t in TRAITS))
+
+    expected = sorted((a for a in agents if a is not query), key=distance)[:5]
+    found = matrix.nearest(query, k=5)
+    assert [a.name for a, _ in found] == [a.name for a in expected]
+    assert [d for _, d in found] == pytest.approx([distance(a) for a in expected])
+    assert len(matrix.nearest(dict(query.traits), k=100)) == 60
+
+
+def test_mutate_stats_and_versions():
+    agents = population(30)
+    matrix = TraitMatrix.from_agents(agents, seed=3)
+    version = agents[0].version
+    matrix.mutate(scale=0.5)
+    assert agents[0].version > version
+    assert ((matrix.values >= 0.0) & (matrix.values <= 1.0)).all()
+    stats = matrix.stats()
+    assert set(stats) == set(TRAITS)
+    column = [agent.traits["креативность"] for agent in agents]
+    assert stats["креативность"]["mean"] == pytest.approx(sum(column) / len(column))
+    assert stats["креативность"]["max"] == max(column)
+
+
+def test_pickled_agent_takes_plain_traits():
+    agent = population(1)[0]
+    TraitMatrix.from_agents([agent])
+    restored = pickle.loads(pickle.dumps(agent))
+    assert type(restored.traits) is dict
+    assert restored.traits == dict(agent.traits)